@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+
+# MIT License
+#
+# Copyright (c) 2019 Arkadiusz Netczuk <dev.arnet@gmail.com>
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+
+
+##
+## Measures wall time of synchronous and asynchronous rounds on workers of uneven speed.
+##
+## Synchronous rounds wait for slowest worker after each chunk of episodes,
+## asynchronous rounds let faster workers continue with best parameters found so far.
+##
+
+import argparse
+
+parser = argparse.ArgumentParser(description='Benchmark of synchronous and asynchronous experiment rounds')
+parser.add_argument('-w', '--workers', action='store', type=int, default=4, help='Number of workers' )
+parser.add_argument('-e', '--episodes', action='store', type=int, default=20, help='Number of episodes per worker' )
+parser.add_argument('-c', '--chunk', action='store', type=int, default=5, help='Number of episodes between comparisons' )
+parser.add_argument('-d', '--delay', action='store', type=float, default=0.002, help='Duration of episode of fastest worker in seconds' )
+args = parser.parse_args()
+
+
+import time
+import random
+
+from pybraingym.parallelexperiment import MultiExperiment
+from pybraingym.parallelexperimentworker import ProcessExperimentWorker
+
+from benchmarkcommon import BenchmarkTable, BenchmarkAgent, BenchmarkTask, benchmarkIteration
+
+
+## =============================================================================
+
+
+## Synthetic experiment: each episode sleeps random time, so workers finish chunks unevenly.
+
+
+class BenchmarkExperiment:
+
+    def __init__(self, delay, episodeLength=10):
+        self.task = BenchmarkTask()
+        self.agent = BenchmarkAgent( BenchmarkTable(16, 4) )
+        self.stepid = 0
+        self.episodeLength = episodeLength
+        self.delay = delay
+
+    def doEpisode(self):
+        ## episode takes from 1 to 4 times of base delay
+        time.sleep( self.delay * random.uniform( 1.0, 4.0 ) )
+        self.agent.module.params[ self.stepid % 64 ] += 1.0
+        self.stepid += self.episodeLength
+        self.task.cumReward = random.random()
+
+
+class BenchmarkFactory:
+
+    def __init__(self, delay):
+        self.delay = delay
+
+    def __call__(self):
+        return ProcessExperimentWorker( BenchmarkExperiment( self.delay ), benchmarkIteration )
+
+
+def measureSync(experiment, episodes, chunk):
+    startTime = time.time()
+    done = 0
+    while done < episodes:
+        experiment.doExperiment( min( chunk, episodes - done ) )
+        done += chunk
+    return time.time() - startTime
+
+
+def measureAsync(experiment, episodes, chunk):
+    startTime = time.time()
+    experiment.doAsyncExperiment( episodes, chunk )
+    return time.time() - startTime
+
+
+## =============================================================================
+
+
+print("Workers:", args.workers)
+print("Episodes per worker:", args.episodes, "chunk:", args.chunk)
+print("")
+
+for name, measure in [ ("sync", measureSync), ("async", measureAsync) ]:
+    experiment = MultiExperiment( args.workers, BenchmarkFactory( args.delay ) )
+    try:
+        experiment.doExperiment( 1 )                ## warm up
+        duration = measure( experiment, args.episodes, args.chunk )
+        throughput = args.workers * args.episodes / duration
+        print( "%-6s time: %8.3f s throughput: %10.2f episodes/s" % (name, duration, throughput) )
+    finally:
+        experiment.close()
@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+
+# MIT License
+#
+# Copyright (c) 2019 Arkadiusz Netczuk <dev.arnet@gmail.com>
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+
+
+##
+## Synthetic classes shared by benchmarks: minimal replacement of PyBrain's
+## table, agent and task used by experiment workers.
+##
+
+import numpy as np
+
+
+class BenchmarkTable:
+
+    def __init__(self, numRows, numColumns):
+        self.params = np.zeros( numRows * numColumns )
+
+    def _setParameters(self, p, owner=None):
+        self.params = p
+
+
+class BenchmarkAgent:
+
+    def __init__(self, module):
+        self.module = module
+        self.learner = None
+
+
+class BenchmarkTask:
+
+    def __init__(self):
+        self.cumReward = 0
+
+    def getCumulativeReward(self):
+        return self.cumReward
+
+    def close(self):
+        pass
+
+
+def benchmarkIteration(worker, iteration, render_steps=False):
+    worker.exp.doEpisode()
@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+
+# MIT License
+#
+# Copyright (c) 2019 Arkadiusz Netczuk <dev.arnet@gmail.com>
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+
+
+##
+## Measures startup time of workers started by spawn and by WorkerLauncher.
+##
+
+import argparse
+import multiprocessing
+
+from pybraingym.launcher import WorkerLauncher
+from pybraingym.parallelexperiment import MultiExperiment
+from pybraingym.parallelexperimentworker import PipeExperimentWorker
+from testpybraingym.dummyexperiment import createDummyWorker
+
+
+## =============================================================================
+
+
+class SpawnFactory:
+
+    def __call__(self, createExperimentInstance):
+        return PipeExperimentWorker( createExperimentInstance, context=multiprocessing.get_context( "spawn" ) )
+
+
+def measure(workers, workerFactory):
+    experiment = MultiExperiment( workers, createDummyWorker, workerFactory=workerFactory )
+    try:
+        experiment.doExperiment( 1 )
+        return experiment.startupTime
+    finally:
+        experiment.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark of startup of experiment workers')
+    parser.add_argument('-w', '--workers', action='store', type=int, default=8, help='Number of workers' )
+    args = parser.parse_args()
+
+    print("Workers:", args.workers)
+    print("")
+
+    preload = [ "testpybraingym.dummyexperiment" ]
+    configurations = [ ("spawn", SpawnFactory()),
+                       ("forkserver", WorkerLauncher( preload )),
+                       ("fork", WorkerLauncher( preload, method="fork" )) ]
+    for name, workerFactory in configurations:
+        startupTime = measure( args.workers, workerFactory )
+        warmUp = getattr( workerFactory, "warmUpTime", None )
+        if warmUp is None:
+            warmUp = 0.0
+        ## warm up is done by start of first worker
+        perWorker = (startupTime - warmUp) / args.workers
+        print( "%-10s startup: %8.1f ms warm up: %8.1f ms per worker: %8.1f ms" % (name, startupTime * 1000, warmUp * 1000,
+                                                                                  perWorker * 1000) )
+
+
+## processes started by 'spawn' and 'forkserver' import main module
+if __name__ == '__main__':
+    main()
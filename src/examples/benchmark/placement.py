@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+
+# MIT License
+#
+# Copyright (c) 2019 Arkadiusz Netczuk <dev.arnet@gmail.com>
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+
+
+##
+## Measures throughput of parallel experiments depending on placement of workers.
+##
+## Run twice to compare effect of BLAS threads limit, e.g.:
+##     placement.py -w 32
+##     placement.py -w 32 -t 1
+##
+
+import argparse
+
+parser = argparse.ArgumentParser(description='Benchmark of placement of experiment workers')
+parser.add_argument('-w', '--workers', action='store', type=int, default=None, help='Number of workers (number of CPUs by default)' )
+parser.add_argument('-e', '--episodes', action='store', type=int, default=50, help='Number of episodes per worker' )
+parser.add_argument('-s', '--size', action='store', type=int, default=200, help='Size of matrix multiplied in each step' )
+parser.add_argument('-t', '--threads', action='store', type=int, default=None, help='Limit of BLAS threads, set before NumPy import' )
+args = parser.parse_args()
+
+
+from pybraingym.placement import limitThreads, availableCpus, blasThreads
+
+if args.threads is not None:
+    ## has to be done before first import of NumPy
+    limitThreads( args.threads )
+
+
+import time
+import numpy as np
+
+from pybraingym.parallelexperiment import MultiExperiment
+from pybraingym.parallelexperimentworker import ProcessExperimentWorker, PipeExperimentWorker
+
+from benchmarkcommon import BenchmarkTable, BenchmarkAgent, BenchmarkTask, benchmarkIteration
+
+
+## =============================================================================
+
+
+## Synthetic experiment: each step multiplies matrices (BLAS call) and updates table.
+
+
+class BenchmarkExperiment:
+
+    def __init__(self, size, episodeLength=10):
+        self.task = BenchmarkTask()
+        self.agent = BenchmarkAgent( BenchmarkTable(16, 4) )
+        self.stepid = 0
+        self.episodeLength = episodeLength
+        self.matrix = np.random.rand( size, size )
+
+    def doEpisode(self):
+        reward = 0.0
+        for _ in range(0, self.episodeLength):
+            product = self.matrix.dot( self.matrix )
+            reward += product[0, 0]
+            self.agent.module.params[ self.stepid % 64 ] += 1.0
+            self.stepid += 1
+        self.task.cumReward = reward
+
+
+class BenchmarkWorker(ProcessExperimentWorker):
+
+    def getBlasThreads(self):
+        ## threads of BLAS libraries really used by worker process
+        return blasThreads()
+
+
+class BenchmarkFactory:
+
+    def __init__(self, size):
+        self.size = size
+
+    def __call__(self):
+        return BenchmarkWorker( BenchmarkExperiment( self.size ), benchmarkIteration )
+
+
+def measure(workers, episodes, size, **kwargs):
+    experiment = MultiExperiment( workers, BenchmarkFactory( size ), workerFactory=PipeExperimentWorker, **kwargs )
+    try:
+        experiment.doExperiment( 1 )                ## warm up
+        startTime = time.time()
+        experiment.doExperiment( episodes )
+        duration = time.time() - startTime
+        threads = experiment.experiments[0].exp.getBlasThreads()
+        return ( workers * episodes / duration, experiment.placement, threads )
+    finally:
+        experiment.close()
+
+
+## =============================================================================
+
+
+workers = args.workers
+if workers is None:
+    workers = len( availableCpus() )
+
+print("Workers:", workers)
+print("CPUs:", availableCpus())
+print("BLAS threads limit:", args.threads)
+print("BLAS threads of main process:", blasThreads())
+print("")
+
+configurations = [ ("default", dict()),
+                   ("pinned", dict( placement="auto" )) ]
+for name, config in configurations:
+    throughput, placement, threads = measure( workers, args.episodes, args.size, **config )
+    if threads is None:
+        threads = "unknown (threadpoolctl is not installed)"
+    print( "%-8s throughput: %10.2f episodes/s BLAS threads: %s placement: %s" % (name, throughput, threads, placement) )
@@ -36,6 +36,7 @@ import gym
 from pybraingym.environment import Transformation
 from pybraingym.task import GymTask
 from pybraingym.experiment import doEpisode, processLastReward, demonstrate
+from pybraingym.model import DiscreteModel, valueIteration, loadTable
 
 from pybrain.rl.learners.valuebased import ActionValueTable
 from pybrain.rl.learners import SARSA, Q, QLambda
@@ -137,6 +138,12 @@ table = ActionValueTable(gymRawEnv.observation_space.n, gymRawEnv.action_space.n
 table.initialize(0.0)
 # table.initialize( np.random.rand( table.paramdim ) )
 
+warm_start = False
+if warm_start:
+    ## initialize table with optimal values calculated from environment's model
+    model = DiscreteModel.fromEnv( gymRawEnv )
+    loadTable( table, valueIteration( model, 0.99 ) )
+
 ### create agent with controller and learner - use SARSA(), Q() or QLambda() here
 ## alpha -- learning rate (preference of new information -- update value factor)
 ## gamma -- discount factor (importance of future reward -- next value factor)
@@ -30,7 +30,6 @@ import pylab
 from scipy import where
 from random import choice
 import numpy as np
-from collections import deque
 
 import gym
 
@@ -38,6 +37,8 @@ from pybraingym.environment import Transformation
 from pybraingym.task import GymTask
 from pybraingym.parallelexperiment import ProcessExperiment, createExperiment, executeExperiments
 from pybraingym.experiment import doEpisode, processLastReward, demonstrate
+from pybraingym.stats import EpisodeStatistics
+from pybraingym.progress import ProgressChannel, ProgressAggregator, ProgressPrinter
 
 from pybrain.rl.learners.valuebased import ActionValueTable
 from pybrain.rl.learners import SARSA, Q, QLambda
@@ -160,39 +161,6 @@ class ExperimentIteration:
         if render_steps is False:
             experiment.processLastReward()              ## store final reward for learner
             experiment.learn()    
-        if iteration % 100 == 0:
-            expId = experiment.getId()
-            reward = experiment.getReward()
-            totalReward = experiment.getCumulativeReward() + reward
-            quality = experiment.getQuality()
-            rate = quality.getRate()
-            bestRate = quality.getBestPeriodReward()
-            print( "Experiment %s episode ended: %i total reward: %d rate: %d highest period reward: %d" % (expId, iteration, totalReward, rate, bestRate) )
-
-
-class QualityFunctor:
-
-    def __init__(self):
-        self.period_rewards = deque( maxlen=100 )
-        self.best_period_reward = float('-inf')
-        self.rate = 0
-
-    def getBestPeriodReward(self):
-        return self.best_period_reward
-
-    def getRate(self):
-        return self.rate
-
-    def getSuccessRate(self):
-        success_rate = self.best_period_reward / self.period_rewards.maxlen * 100
-        return success_rate
-
-    def __call__(self, iteration, reward):
-        self.period_rewards.append(reward)
-        self.rate = np.sum(self.period_rewards)
-        if self.rate > self.best_period_reward:
-            self.best_period_reward = self.rate
-        return self.rate
 
 
 def createExperimentInstance():
@@ -213,7 +181,7 @@ def createExperimentInstance():
     
     experiment = Experiment(task, agent)
     iterator = ExperimentIteration()
-    quality = QualityFunctor()
+    quality = EpisodeStatistics( 100 )
     experiment = ProcessExperiment( experiment, iterator, quality )
     return experiment
 
@@ -227,7 +195,12 @@ round_epochs = 3000
 rounds_num = 2
 
 
-experiment = createExperiment( parallel_exps, createExperimentInstance, copyAgentState )
+## workers send records of episodes to main process instead of printing them
+progress = ProgressChannel()
+aggregator = ProgressAggregator( progress, 100, 100 )
+aggregator.addCallback( ProgressPrinter( 5.0 ) )
+
+experiment = createExperiment( parallel_exps, createExperimentInstance, copyAgentState, progress=progress )
 
 
 ## prevents "ImportError: sys.meta_path is None, Python is likely shutting down"
@@ -248,7 +221,10 @@ print("Starting")
 
 procStartTime = time.time()
 
-executeExperiments(experiment, rounds_num, round_epochs)
+aggregator.start()
+executeExperiments(experiment, rounds_num, round_epochs, progress=aggregator)
+aggregator.stop()
+print("Received episodes:", aggregator.getEpisodesCount(), "dropped records:", aggregator.getDroppedCount())
 
 procEndTime = time.time()
 print("Duration:", (procEndTime - procStartTime), "sec")
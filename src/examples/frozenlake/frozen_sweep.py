@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+
+# MIT License
+#
+# Copyright (c) 2019 Arkadiusz Netczuk <dev.arnet@gmail.com>
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+
+
+import time
+
+import gym
+
+from pybraingym.environment import Transformation
+from pybraingym.task import GymTask
+from pybraingym.parallelexperiment import ProcessExperiment
+from pybraingym.stats import EpisodeStatistics
+from pybraingym.sweep import Sweep, gridSearch
+from pybraingym.halving import SuccessiveHalving
+
+from pybrain.rl.learners.valuebased import ActionValueTable
+from pybrain.rl.learners import SARSA
+from pybrain.rl.agents import LearningAgent
+from pybrain.rl.experiments import Experiment
+
+
+## =============================================================================
+
+
+class EnvTransformation(Transformation):
+
+    def observation(self, observationValue):
+        ## Gym environment returns number, but PyBrain agent expects array with single integer
+        return [observationValue]
+
+    def action(self, actionValue):
+        ## Gym environment expects one integer value, but PyBrain returns array with single float
+        return int(actionValue[0])
+
+
+def experimentIteration(experiment, iteration, render_steps=False):
+    experiment.doEpisode(render_steps)
+    if render_steps is False:
+        experiment.processLastReward()              ## store final reward for learner
+        experiment.learn()
+
+
+def createExperimentInstance(alpha=0.3, gamma=0.99, epsilon=0.4):
+    gymRawEnv = gym.make('FrozenLake-v0')
+
+    task = GymTask.createTask(gymRawEnv)
+    env = task.env
+    env.setTransformation( EnvTransformation() )
+
+    table = ActionValueTable(gymRawEnv.observation_space.n, gymRawEnv.action_space.n)
+    table.initialize(0.0)
+
+    learner = SARSA(alpha=alpha, gamma=gamma)
+    explorer = learner.explorer
+    explorer.epsilon = epsilon
+    explorer.decay = 0.9999
+    agent = LearningAgent(table, learner)
+
+    experiment = Experiment(task, agent)
+    quality = EpisodeStatistics( quality_window )
+    return ProcessExperiment( experiment, experimentIteration, quality )
+
+
+## =============================================================================
+
+
+processes_num = 4
+rounds_num = 10
+round_epochs = 300
+quality_window = 100                ## quality is sum of rewards of last 'quality_window' episodes
+threshold = 0.5 * quality_window    ## goal reached in half of episodes
+successive_halving = False          ## stop worst configurations early instead of running all to the end
+
+
+space = { "alpha": [0.1, 0.3, 0.5],
+          "gamma": [0.9, 0.99],
+          "epsilon": [0.1, 0.4] }
+configs = gridSearch( space )
+
+
+def printRow(row):
+    quality = row["quality"]
+    qualityText = "%f" % quality if quality is not None else "-"
+    print( "Config %i/%i ended: quality: %s wall time: %f sec" % (row["index"] + 1, len(configs), qualityText, row["wallTime"]) )
+
+
+print("")
+print("Configurations:", len(configs))
+print("Processes:", processes_num)
+print("Starting")
+
+procStartTime = time.time()
+
+if successive_halving:
+    sweep = SuccessiveHalving( createExperimentInstance, configs, processes_num, minEpisodes=round_epochs, maxRungs=3 )
+    sweep.execute()
+    sweep.close()
+else:
+    sweep = Sweep( createExperimentInstance, processes_num, rounds_num, round_epochs, threshold )
+    sweep.execute( configs, "frozen_sweep.csv", printRow )
+
+procEndTime = time.time()
+print("Duration:", (procEndTime - procStartTime), "sec")
+
+print( "\nBest configuration:", sweep.getBestResult() )
+
+print("\nDone\n")
@@ -30,6 +30,7 @@ from pybraingym.environment import Transformation
 from pybraingym.task import GymTask
 from pybraingym.experiment import doEpisode, processLastReward, evaluate
 from pybraingym.digitizer import Digitizer, ArrayDigitizer
+from pybraingym.checkpoint import Checkpointer
 
 from pybrain.rl.learners.valuebased import ActionValueTable
 from pybrain.rl.learners import SARSA, Q, QLambda
@@ -50,6 +51,8 @@ parser = argparse.ArgumentParser(description='Mountain Car solution')
 parser.add_argument('-l', '--load', action='store', default=None, help='File with agent state to load from' )
 parser.add_argument('-s', '--save', action='store', default=None, help='File with agent state to save to' )
 parser.add_argument('-x', '--state', action='store', default=None, help='File with agent state to load and save, same as -l -s' )
+parser.add_argument('-c', '--checkpoint', action='store', default=None, help='File with periodic checkpoint of experiment, resumed if exists' )
+parser.add_argument('-ci', '--checkpointinterval', action='store', type=float, default=60.0, help='Checkpoint interval in seconds' )
 args = parser.parse_args()
 
 
@@ -157,6 +160,16 @@ experiment = Experiment(task, agent)
 atexit.register( task.close )
 
 
+checkpointer = None
+first_episode = 1
+if args.checkpoint is not None:
+    checkpointer = Checkpointer( args.checkpoint, timeInterval=args.checkpointinterval )
+    checkpoint_state = checkpointer.restore( experiment )
+    if checkpoint_state is not None:
+        first_episode = checkpoint_state["extra"]["episode"] + 1
+        print("Resuming from checkpoint:", args.checkpoint, "episode:", first_episode)
+
+
 render_demo = False
 render_steps = False
 imax = 800
@@ -172,7 +185,7 @@ period_reward = 0
 
 procStartTime = time.time()
 
-for i in range(1, imax + 1):
+for i in range(first_episode, imax + 1):
     doEpisode( experiment, render_steps )
 
     reward = task.getCumulativeReward()
@@ -191,9 +204,15 @@ for i in range(1, imax + 1):
         doEpisode( experiment, True )
 #         print("vals:", table.params.reshape(16 * 4, 3))
 
+    if checkpointer is not None:
+        checkpointer.update( experiment, experiment.stepid, { "episode": i } )
+
 procEndTime = time.time()
 print("Duration:", (procEndTime - procStartTime), "sec")
 
+if checkpointer is not None:
+    checkpointer.save( experiment, experiment.stepid, { "episode": imax } )
+
 
 if state_save_file is not None:
     print("Storing state to file:", state_save_file)
@@ -30,6 +30,8 @@ from pybraingym.environment import Transformation
 from pybraingym.task import GymTask
 from pybraingym.parallelexperiment import ProcessExperiment, createExperiment
 from pybraingym.digitizer import Digitizer, ArrayDigitizer
+from pybraingym.interface import DirtyRowsTableWrapper
+from pybraingym.transfer import DeltaTransfer
 
 from pybrain.rl.learners.valuebased import ActionValueTable
 from pybrain.rl.learners import SARSA, Q, QLambda
@@ -38,7 +40,7 @@ from pybrain.rl.experiments import Experiment
 
 import time
 import atexit
-# import numpy as np
+import numpy as np
 import copy
 
 
@@ -112,6 +114,9 @@ def createExperimentInstance():
     # create value table and initialize with ones
     table = ActionValueTable(observationDigitizer.states, env.numActions)
     table.initialize(0.0)
+    if delta_transfer:
+        ## tracks rows changed by learner
+        table = DirtyRowsTableWrapper(table)
     # table.initialize( np.random.rand( table.paramdim ) )
     agent = createAgent( table )
 
@@ -162,9 +167,13 @@ round_epochs = 3000
 # rounds_num = int(1000 / round_epochs)
 # rounds_num = 10
 rounds_num = 1
+delta_transfer = False          ## propagate only changed rows of best table, down-cast to float32
 
 
-experiment = createExperiment( parallel_exps, createExperimentInstance, copyAgentState )
+deltaTransfer = None
+if delta_transfer:
+    deltaTransfer = DeltaTransfer( np.float32 )
+experiment = createExperiment( parallel_exps, createExperimentInstance, copyAgentState, deltaTransfer=deltaTransfer )
 
 
 ## prevents "ImportError: sys.meta_path is None, Python is likely shutting down"
@@ -194,6 +203,8 @@ for i in range(1, rounds_num + 1):
 
 procEndTime = time.time()
 print("Duration:", (procEndTime - procStartTime), "sec")
+if deltaTransfer is not None:
+    print("Transferred: %i bytes, %f of full tables" % (deltaTransfer.bytesSent, deltaTransfer.getRatio()) )
 
 reward = experiment.demonstrate()
 print("\nFinal demonstration, reward: %d" % ( reward ) )
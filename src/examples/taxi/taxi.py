@@ -35,6 +35,7 @@ import gym
 from pybraingym.environment import Transformation
 from pybraingym.task import GymTask
 from pybraingym.interface import ActionValueTableWrapper
+from pybraingym.model import DiscreteModel, valueIteration, loadTable
 from pybraingym.experiment import doEpisode, processLastReward, evaluate, demonstrate
 
 from pybrain.rl.learners.valuebased import ActionValueTable
@@ -97,6 +98,12 @@ table = ActionValueTable(env.numStates, env.numActions)
 table = ActionValueTableWrapper(table)
 table.initialize(0.0)
 # table.initialize( np.random.rand( table.paramdim ) )
+
+warm_start = False
+if warm_start:
+    ## initialize table with optimal values calculated from environment's model
+    model = DiscreteModel.fromEnv( gymRawEnv )
+    loadTable( table, valueIteration( model, 0.99 ) )
  
 ### create agent with controller and learner - use SARSA(), Q() or QLambda() here
 ## alpha -- learning rate (preference of new information)
@@ -30,13 +30,15 @@ import pylab
 import numpy as np
 from collections import deque
 
-import gym
-
 from pybraingym.environment import Transformation
 from pybraingym.task import GymTask
-from pybraingym.parallelexperiment import ProcessExperiment, createExperiment, executeExperiments
+from pybraingym.parallelexperiment import ProcessExperiment, ManagedExperimentWorker, createExperiment, executeExperiments
+from pybraingym.launcher import WorkerLauncher, makeEnv
 from pybraingym.interface import ActionValueTableWrapper
+from pybraingym.merge import VisitWeightedMerge
+from pybraingym.progress import ProgressChannel, ProgressAggregator, ProgressPrinter
 from pybraingym.experiment import doEpisode, processLastReward, evaluate, demonstrate
+from pybraingym.model import DiscreteModel, ModelQuality
 
 from pybrain.rl.learners.valuebased import ActionValueTable
 from pybrain.rl.learners import Q, SARSA
@@ -111,14 +113,10 @@ def experimentIteration( experiment, iteration, render_steps=False ):
         experiment.processLastReward()              ## store final reward for learner
         experiment.learn()
 
-    if iteration % 100 == 0:
-        reward = experiment.getReward()
-        totalReward = experiment.getCumulativeReward() + reward
-        print("Episode ended: %i total reward: %d rate: %f" % (iteration, totalReward, totalReward / iteration ))
-
 
 def createExperimentInstance():
-    gymRawEnv = gym.make('Taxi-v2')
+    ## environment created by launcher before fork or new one
+    gymRawEnv = makeEnv('Taxi-v2')
     
     transformation = EnvTransformation()
      
@@ -129,13 +127,17 @@ def createExperimentInstance():
      
     ## create value table and initialize with ones
     table = ActionValueTable(env.numStates, env.numActions)
-#     table = ActionValueTableWrapper(table)
+    if merge_tables:
+        ## counts visits of states used as weights of merge
+        table = ActionValueTableWrapper(table)
     table.initialize(0.0)
     # table.initialize( np.random.rand( table.paramdim ) )
     agent = createAgent(table)
      
     experiment = Experiment(task, agent)
-    experiment = ProcessExperiment( experiment, experimentIteration )
+    ## exact value of greedy policy is used to select best experiment
+    quality = ModelQuality( DiscreteModel.fromEnv(gymRawEnv), experiment )
+    experiment = ProcessExperiment( experiment, experimentIteration, quality )
     return experiment
 
 
@@ -147,6 +149,9 @@ render_steps = False
 parallel_exps = 8
 round_epochs = 3000
 rounds_num = 1
+hogwild = False                 ## all experiments update single shared table
+merge_tables = False            ## merge tables weighted by visits of states instead of copying best one
+preloaded_workers = False       ## fork workers from process with preloaded modules and environment
 # imax = 7000
 period_print = 100
 eval_periods = 100
@@ -156,7 +161,20 @@ eval_periods = 100
 # eval_periods = 100
 
 
-experiment = createExperiment( parallel_exps, createExperimentInstance, copyAgentState )
+mergeParameters = None
+if merge_tables:
+    mergeParameters = VisitWeightedMerge()
+## workers send records of episodes to main process instead of printing them
+progress = ProgressChannel()
+aggregator = ProgressAggregator( progress, period_print, period_print )
+aggregator.addCallback( ProgressPrinter( 5.0 ) )
+
+workerFactory = ManagedExperimentWorker
+if preloaded_workers:
+    workerFactory = WorkerLauncher( method="fork", envs=["Taxi-v2"] )
+
+experiment = createExperiment( parallel_exps, createExperimentInstance, copyAgentState, hogwild=hogwild,
+                               mergeParameters=mergeParameters, progress=progress, workerFactory=workerFactory )
 
 
 ## prevents "ImportError: sys.meta_path is None, Python is likely shutting down"
@@ -167,13 +185,21 @@ print("")
 print("Parallel experiments:", parallel_exps)
 print("Epochs per round:", round_epochs)
 print("Rounds:", rounds_num)
+print("Hogwild:", hogwild)
+print("Merge tables:", merge_tables)
+print("Workers startup time:", experiment.startupTime, "sec")
+if preloaded_workers:
+    print("Workers startup:", workerFactory.getStartupStats())
 
 print("\nStarting")
 
 
 procStartTime = time.time()
 
-executeExperiments(experiment, rounds_num, round_epochs)
+aggregator.start()
+executeExperiments(experiment, rounds_num, round_epochs, progress=aggregator)
+aggregator.stop()
+print("Received episodes:", aggregator.getEpisodesCount(), "dropped records:", aggregator.getDroppedCount())
  
 procEndTime = time.time()
 print("Duration:", (procEndTime - procStartTime), "sec")
@@ -0,0 +1,192 @@
+# MIT License
+#
+# Copyright (c) 2019 Arkadiusz Netczuk <dev.arnet@gmail.com>
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+
+
+import os
+import time
+import pickle
+import tempfile
+import numpy as np
+
+
+LEARNER_ATTRIBUTES = ["alpha", "gamma", "qlambda"]
+EXPLORER_ATTRIBUTES = ["epsilon", "decay", "sigma"]
+
+
+def saveCheckpoint(path, state):
+    """Store state to file atomically.
+
+       Data is written to temporary file in the same directory and then
+       renamed, so file under 'path' always contains complete checkpoint.
+    """
+    directory = os.path.dirname( os.path.abspath(path) )
+    if not os.path.exists(directory):
+        os.makedirs(directory)
+    fd, tmpPath = tempfile.mkstemp( dir=directory, prefix=".checkpoint-" )
+    try:
+        with os.fdopen(fd, "wb") as tmpFile:
+            pickle.dump( state, tmpFile, protocol=pickle.HIGHEST_PROTOCOL )
+            tmpFile.flush()
+            os.fsync( tmpFile.fileno() )
+        os.replace( tmpPath, path )
+    except BaseException:
+        os.remove( tmpPath )
+        raise
+
+
+def loadCheckpoint(path):
+    with open(path, "rb") as dataFile:
+        return pickle.load( dataFile )
+
+
+def getAgentState(agent):
+    """Return parameters of agent's module and hyperparameters of its learner and explorer."""
+    learner = agent.learner
+    explorer = getattr( learner, "explorer", None )
+    return { "params": np.array( agent.module.params ),
+             "learner": _getAttributes( learner, LEARNER_ATTRIBUTES ),
+             "explorer": _getAttributes( explorer, EXPLORER_ATTRIBUTES ) }
+
+
+def setAgentState(agent, state):
+    np.copyto( agent.module.params, state["params"] )
+    learner = agent.learner
+    _setAttributes( learner, state["learner"] )
+    _setAttributes( getattr( learner, "explorer", None ), state["explorer"] )
+
+
+def getHyperParameters(agent):
+    """Return flat dict of hyperparameters of agent's learner and explorer (e.g. alpha, gamma, epsilon)."""
+    learner = agent.learner
+    params = _getAttributes( getattr( learner, "explorer", None ), EXPLORER_ATTRIBUTES )
+    params.update( _getAttributes( learner, LEARNER_ATTRIBUTES ) )
+    return params
+
+
+def setHyperParameters(agent, params):
+    learner = agent.learner
+    explorer = getattr( learner, "explorer", None )
+    for name, value in params.items():
+        if name in LEARNER_ATTRIBUTES:
+            setattr( learner, name, value )
+        elif name in EXPLORER_ATTRIBUTES and explorer is not None:
+            setattr( explorer, name, value )
+        else:
+            raise ValueError("unknown hyperparameter:", name)
+
+
+def getExperimentState(experiment, extra=None):
+    """Return state of PyBrain's Experiment (agent state and steps counter)."""
+    state = getAgentState( experiment.agent )
+    state["steps"] = experiment.stepid
+    state["extra"] = extra
+    return state
+
+
+def setExperimentState(experiment, state):
+    setAgentState( experiment.agent, state )
+    experiment.stepid = state["steps"]
+
+
+class Checkpointer:
+    """Periodically stores state of experiment to file.
+
+       Target can be PyBrain's Experiment or any object implementing
+       'getState()' and 'setState()' methods (experiment workers and
+       parallel experiments). Checkpoint is stored when at least
+       'stepInterval' steps or 'timeInterval' seconds passed since
+       last save.
+    """
+
+    def __init__(self, path, stepInterval=None, timeInterval=None):
+        self.path = path
+        self.stepInterval = stepInterval
+        self.timeInterval = timeInterval
+        self.lastSteps = 0
+        self.steps = 0                          ## last steps counter given to checkpointer, continued after restore
+        self.lastTime = time.time()
+
+    def isDue(self, steps=None):
+        if self.stepInterval is not None and steps is not None:
+            if steps - self.lastSteps >= self.stepInterval:
+                return True
+        if self.timeInterval is not None:
+            if time.time() - self.lastTime >= self.timeInterval:
+                return True
+        return False
+
+    def update(self, target, steps=None, extra=None):
+        """Store checkpoint if interval passed. Return True if checkpoint was stored."""
+        if steps is not None:
+            self.steps = steps
+        if self.isDue( steps ) is False:
+            return False
+        self.save( target, steps, extra )
+        return True
+
+    def save(self, target, steps=None, extra=None):
+        if hasattr(target, "getState"):
+            state = target.getState()
+        else:
+            state = getExperimentState( target )
+        state["extra"] = extra
+        state["checkpointSteps"] = steps        ## steps counter of checkpointer, restored with state
+        saveCheckpoint( self.path, state )
+        if steps is not None:
+            self.lastSteps = steps
+        self.lastTime = time.time()
+
+    def restore(self, target):
+        """Load checkpoint into target. Return loaded state or None if there is no checkpoint."""
+        if not os.path.isfile( self.path ):
+            return None
+        state = loadCheckpoint( self.path )
+        if hasattr(target, "setState"):
+            target.setState( state )
+        else:
+            setExperimentState( target, state )
+        steps = state.get( "checkpointSteps", None )
+        if steps is None:
+            ## checkpoint stored without steps -- steps of experiment if known
+            steps = state.get( "steps", 0 )
+        self.lastSteps = steps
+        self.steps = steps
+        self.lastTime = time.time()
+        return state
+
+
+def _getAttributes(obj, names):
+    ret = dict()
+    if obj is None:
+        return ret
+    for name in names:
+        if hasattr(obj, name):
+            ret[ name ] = getattr(obj, name)
+    return ret
+
+
+def _setAttributes(obj, values):
+    if obj is None:
+        return
+    for name, value in values.items():
+        setattr(obj, name, value)
@@ -23,12 +23,12 @@
 
 
 from pybrain.rl.environments.environment import Environment
-from gym.spaces.discrete import Discrete
 
 
 class GymEnvironment(Environment):
 
     def __init__(self, gymRawEnv):
+        from gym.spaces.discrete import Discrete
         Environment.__init__(self)
 
         observationSpace = gymRawEnv.observation_space
@@ -50,6 +50,7 @@ class GymEnvironment(Environment):
         self.done = True
         self.info = None
         self.transform = None
+        self.recorder = None
         self.doCumulative = False
         self.doRender = False
 
@@ -66,12 +67,21 @@ class GymEnvironment(Environment):
         self.transform = transformation
         self.transform.env = self
 
+    def setRecorder(self, recorder):
+        """Set object receiving every transition, e.g. TrajectoryRecorder.
+
+           Recorded values are the ones seen by PyBrain (after transformation).
+        """
+        self.recorder = recorder
+
     # ==========================================================================
 
     def getSensors(self):
         return self.observation
 
     def performAction(self, action):
+        agentAction = action
+        prevObservation = self.observation
         if self.transform is not None:
             action = self.transform.action(action)
         self.observation, self.reward, self.done, self.info = self.env.step(action)
@@ -79,6 +89,10 @@ class GymEnvironment(Environment):
             self.observation = self.transform.observation(self.observation)
             self.reward = self.transform.reward(self.reward)
         self.cumReward += self.reward
+        if self.recorder is not None:
+            self.recorder.record( prevObservation, agentAction, self.reward )
+            if self.done:
+                self.recorder.recordTerminal( self.observation )
 
     def reset(self):
         self.done = False
@@ -88,6 +102,8 @@ class GymEnvironment(Environment):
         self.observation = self.env.reset()
         if self.transform is not None:
             self.observation = self.transform.observation(self.observation)
+        if self.recorder is not None:
+            self.recorder.newEpisode()
 
     # ==========================================================================
 
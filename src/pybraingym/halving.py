@@ -0,0 +1,204 @@
+# MIT License
+#
+# Copyright (c) 2019 Arkadiusz Netczuk <dev.arnet@gmail.com>
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+
+
+import functools
+from collections import deque
+from concurrent.futures import wait, FIRST_COMPLETED
+
+from pybraingym.parallelexperiment import MultiExperiment
+
+
+class SuccessiveHalving:
+    """Successive halving of configurations executed by slots of MultiExperiment.
+
+       Each configuration passes rungs of growing number of episodes: rung
+       'k' takes 'minEpisodes * growth ** k' episodes. When configuration
+       finishes rung its quality rate is compared with all results recorded
+       on the same rung. Configurations outside of best '1 - fraction' part
+       are stopped and their worker slot takes next pending configuration,
+       so budget of stopped configurations goes to new ones. When there is
+       no pending configuration, slot of stopped or completed configuration
+       stays idle. Workers execute chunks of at most 'minEpisodes' episodes.
+       In 'execute()' each slot receives next chunk as soon as it finishes
+       previous one, so slots do not wait for each other, while 'doRound()'
+       executes single chunk on all active slots and waits for the slowest.
+    """
+
+    def __init__(self, createExperimentInstance, configs, workersNumber, minEpisodes=10, growth=2, maxRungs=3,
+                 fraction=0.5, workerFactory=None, **kwargs):
+        """Class constructor.
+
+        Arguments:
+        createExperimentInstance -- picklable function receiving parameters as keyword arguments
+                                    and returning ProcessExperimentWorker (as for Sweep)
+        configs -- list of dicts of parameters (e.g. result of 'randomSearch()')
+        workersNumber -- number of worker slots executed in parallel
+        minEpisodes -- number of episodes of first rung and size of execution round
+        growth -- factor of number of episodes of consecutive rungs
+        maxRungs -- number of rungs, configuration finishing last rung is completed
+        fraction -- part of configurations stopped on each rung
+        kwargs -- passed to MultiExperiment (e.g. 'placement', 'respawnWorkers')
+        """
+        if minEpisodes < 1:
+            raise AssertionError("invalid parameter: minEpisodes - it has to be greater than 0")
+        if maxRungs < 1:
+            raise AssertionError("invalid parameter: maxRungs - it has to be greater than 0")
+        if fraction < 0.0 or fraction >= 1.0:
+            raise AssertionError("invalid parameter: fraction - it has to be in range [0, 1)")
+        self.createExperimentInstance = createExperimentInstance
+        self.configs = list( configs )
+        self.minEpisodes = minEpisodes
+        self.growth = growth
+        self.maxRungs = maxRungs
+        self.fraction = fraction
+        self.rungResults = [ [] for _ in range(0, maxRungs) ]       ## quality rates recorded on each rung
+        self.results = [ None ] * len(self.configs)
+        self.pending = deque( range(0, len(self.configs)) )
+        workersNumber = min( workersNumber, len(self.configs) )
+        assert workersNumber > 0, "no configurations given"
+        self.slots = [ None ] * workersNumber                      ## index of configuration executed in slot
+        factories = []
+        for slot in range(0, workersNumber):
+            factories.append( self._startConfiguration( slot ) )
+        self.multiExperiment = MultiExperiment( workersNumber, factories, workerFactory=workerFactory, **kwargs )
+
+    def getRungEpisodes(self, rung):
+        return self.minEpisodes * self.growth ** rung
+
+    def doRound(self):
+        """Execute single chunk on all active slots and wait for all of them.
+
+           Return False if there is nothing to execute.
+        """
+        active = [ slot for slot in range(0, len(self.slots)) if self.slots[ slot ] is not None ]
+        if len(active) < 1:
+            return False
+        paramsList = [ self._chunkParams( slot ) for slot in active ]
+        stepsList = list( self.multiExperiment.pool.map(SuccessiveHalving.processRound, paramsList) )
+        for params, steps in zip( paramsList, stepsList ):
+            self._updateSlot( params[1], params[2], steps )
+        return True
+
+    @staticmethod
+    def processRound(params):
+        multiExperiment = params[0]
+        index = params[1]
+        number = params[2]
+        ## returns None if worker was respawned
+        return multiExperiment.callWorker( index, "doExperiment", number, False )
+
+    def execute(self):
+        """Execute all configurations and return list of result rows ordered as configurations.
+
+           Each slot receives next chunk of episodes as soon as it finishes
+           previous one.
+        """
+        pool = self.multiExperiment.pool
+        running = dict()                                   ## future: parameters of chunk
+        for slot in range(0, len(self.slots)):
+            if self.slots[ slot ] is not None:
+                params = self._chunkParams( slot )
+                running[ pool.submit( SuccessiveHalving.processRound, params ) ] = params
+        chunks = 0
+        while len(running) > 0:
+            done, _ = wait( list( running.keys() ), return_when=FIRST_COMPLETED )
+            for future in done:
+                params = running.pop( future )
+                slot = params[1]
+                self._updateSlot( slot, params[2], future.result() )
+                chunks += 1
+                if self.slots[ slot ] is not None:
+                    params = self._chunkParams( slot )
+                    running[ pool.submit( SuccessiveHalving.processRound, params ) ] = params
+            best = self.getBestResult()
+            bestRate = best["quality"] if best is not None else float("nan")
+            print("Chunks ended: %i active: %i pending: %i best rate: %f" % (chunks, self.getActiveCount(),
+                                                                            len(self.pending), bestRate) )
+        return self.results
+
+    def _chunkParams(self, slot):
+        row = self.results[ self.slots[ slot ] ]
+        number = min( self.minEpisodes, self.getRungEpisodes( row["rung"] ) - row["rungEpisodes"] )
+        return (self.multiExperiment, slot, number)
+
+    def getActiveCount(self):
+        return len(self.slots) - self.slots.count( None )
+
+    def getBestResult(self):
+        """Return row of configuration of highest quality on the highest reached rung or None."""
+        valid = [ row for row in self.results if row is not None and row["quality"] is not None ]
+        if len(valid) < 1:
+            return None
+        return max( valid, key=lambda row: (row["rung"], row["quality"]) )
+
+    def close(self):
+        self.multiExperiment.close()
+
+    def isPromoted(self, rung, rate):
+        """Check if rate belongs to best part of results recorded on rung."""
+        results = self.rungResults[ rung ]
+        better = sum( 1 for item in results if item > rate )
+        keep = max( int( round( len(results) * (1.0 - self.fraction) ) ), 1 )
+        return better < keep
+
+    def _updateSlot(self, slot, number, steps):
+        if steps is None:
+            ## worker was respawned -- chunk is lost and will be repeated
+            return
+        row = self.results[ self.slots[ slot ] ]
+        experiment = self.multiExperiment.experiments[ slot ]
+        row["episodes"] += number
+        row["rungEpisodes"] += number
+        row["steps"] += steps
+        if row["rungEpisodes"] < self.getRungEpisodes( row["rung"] ):
+            return
+        ## rung finished
+        rate = experiment.getQualityRate()
+        rung = row["rung"]
+        row["quality"] = rate
+        self.rungResults[ rung ].append( rate )
+        if rung + 1 >= self.maxRungs:
+            row["status"] = "completed"
+        elif self.isPromoted( rung, rate ):
+            row["rung"] = rung + 1
+            row["rungEpisodes"] = 0
+            return
+        else:
+            row["status"] = "stopped"
+        if len(self.pending) < 1:
+            ## worker stays idle until end of execution
+            self.slots[ slot ] = None
+            return
+        factory = self._startConfiguration( slot )
+        self.multiExperiment.replaceWorker( slot, factory )
+
+    def _startConfiguration(self, slot):
+        index = self.pending.popleft()
+        config = self.configs[ index ]
+        row = dict( config )
+        row.update( { "index": index, "rung": 0, "rungEpisodes": 0, "episodes": 0, "steps": 0,
+                      "quality": None, "status": "running" } )
+        self.results[ index ] = row
+        self.slots[ slot ] = index
+        return functools.partial( self.createExperimentInstance, **config )
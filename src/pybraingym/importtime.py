@@ -0,0 +1,166 @@
+# MIT License
+#
+# Copyright (c) 2019 Arkadiusz Netczuk <dev.arnet@gmail.com>
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+
+
+import os
+import sys
+import csv
+import pkgutil
+import subprocess
+
+
+## dependencies which should be loaded only when used
+HEAVY_MODULES = [ "scipy", "gym", "pybrain", "matplotlib", "pylab", "threadpoolctl" ]
+
+
+def parseImportTime(text):
+    """Parse output of 'python -X importtime'.
+
+       Returns list of tuples: (self time, cumulative time, depth, module name),
+       times are in microseconds. Rows are in order of output, so imports of
+       module precede its row.
+    """
+    ret = []
+    for line in text.splitlines():
+        if line.startswith("import time:") is False:
+            continue
+        fields = line[ len("import time:"): ].split( "|" )
+        if len(fields) != 3:
+            continue
+        try:
+            selfTime = int( fields[0] )
+            cumulativeTime = int( fields[1] )
+        except ValueError:
+            ## header line
+            continue
+        name = fields[2].rstrip()
+        stripped = name.lstrip()
+        depth = (len(name) - len(stripped) - 1) // 2
+        ret.append( (selfTime, cumulativeTime, depth, stripped) )
+    return ret
+
+
+def listModules(packageName="pybraingym"):
+    """Return names of all modules of package."""
+    package = __import__( packageName )
+    ret = []
+    for info in pkgutil.iter_modules( package.__path__ ):
+        ret.append( packageName + "." + info.name )
+    return sorted( ret )
+
+
+def measureModule(name, runs=3, python=None):
+    """Import module in new interpreter 'runs' times and return dict of results of fastest run.
+
+       Result contains import time of module with its package in milliseconds,
+       list of its direct imports sorted by time and list of loaded heavy
+       dependencies (see HEAVY_MODULES).
+    """
+    if python is None:
+        python = sys.executable
+    env = dict( os.environ )
+    env["PYTHONPATH"] = os.pathsep.join( sys.path )
+    best = None
+    for _ in range(0, max(runs, 1)):
+        proc = subprocess.run( [python, "-X", "importtime", "-c", "import " + name],
+                               stdout=subprocess.PIPE, stderr=subprocess.PIPE, env=env, universal_newlines=True )
+        if proc.returncode != 0:
+            lines = proc.stderr.strip().splitlines()
+            if len(lines) > 0:
+                error = lines[-1]
+            else:
+                error = "import failed with return code %i" % proc.returncode
+            return { "module": name, "time": None, "imports": [], "heavy": [], "error": error }
+        rows = parseImportTime( proc.stderr )
+        result = _moduleResult( name, rows )
+        if best is None or result["time"] < best["time"]:
+            best = result
+    return best
+
+
+def _moduleResult(name, rows):
+    parts = name.split( "." )
+    packages = set( ".".join( parts[:i] ) for i in range(1, len(parts) + 1) )
+    total = 0
+    imports = []
+    start = 0
+    for i in range(0, len(rows)):
+        selfTime, cumulativeTime, depth, rowName = rows[i]
+        if depth != 0:
+            continue
+        if rowName in packages:
+            total += cumulativeTime
+            for child in rows[ start:i ]:
+                if child[2] == 1 and child[3] not in packages:
+                    imports.append( (child[3], child[1] / 1000.0) )
+        start = i + 1
+    imports.sort( key=lambda item: item[1], reverse=True )
+    heavy = set()
+    for row in rows:
+        root = row[3].split( "." )[0]
+        if root in HEAVY_MODULES:
+            heavy.add( root )
+    return { "module": name, "time": total / 1000.0, "imports": imports, "heavy": sorted( heavy ), "error": None }
+
+
+def main():
+    import argparse
+    parser = argparse.ArgumentParser(description='Measure import time of pybraingym modules')
+    parser.add_argument('modules', nargs='*', help='Modules to measure (all modules of package if not given)')
+    parser.add_argument('-r', '--runs', type=int, default=3, help='Number of imports of each module, fastest is reported')
+    parser.add_argument('-b', '--budget', type=float, default=None, help='Maximum import time of module in milliseconds')
+    parser.add_argument('-t', '--top', type=int, default=3, help='Number of the slowest imports of module to print')
+    parser.add_argument('-o', '--output', default=None, help='CSV file to write results to')
+
+    args = parser.parse_args()
+
+    modules = args.modules
+    if len(modules) < 1:
+        modules = listModules()
+    results = []
+    exceeded = 0
+    for name in modules:
+        result = measureModule( name, args.runs )
+        results.append( result )
+        if result["error"] is not None:
+            print("%-40s error: %s" % (name, result["error"]))
+            continue
+        slowest = ", ".join( "%s %.1f" % item for item in result["imports"][ :args.top ] )
+        mark = ""
+        if args.budget is not None and result["time"] > args.budget:
+            mark = " OVER BUDGET"
+            exceeded += 1
+        print("%-40s %8.1f ms heavy: %s slowest: %s%s" % (name, result["time"], result["heavy"], slowest, mark))
+    if args.output is not None:
+        with open( args.output, "w", newline="" ) as resultsFile:
+            writer = csv.writer( resultsFile )
+            writer.writerow( ["module", "time", "heavy", "error"] )
+            for result in results:
+                writer.writerow( [result["module"], result["time"], " ".join(result["heavy"]), result["error"]] )
+    if exceeded > 0:
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit( main() )
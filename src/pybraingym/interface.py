@@ -22,7 +22,7 @@
 #
 
 
-from scipy import zeros
+from numpy import zeros
 
 
 class Wrapper(object):
@@ -44,3 +44,18 @@ class ActionValueTableWrapper(Wrapper):
     def activate(self, inpt):
         self.stateArray[ inpt ] += 1
         return self.wrapped.activate(inpt)
+
+
+class DirtyRowsTableWrapper(Wrapper):
+    """Marks rows of table changed by learner since last synchronization."""
+
+    def __init__(self, module):
+        Wrapper.__init__(self, module)
+        self.dirtyRows = zeros( module.numRows, dtype=bool )
+
+    def updateValue(self, row, column, value):
+        self.dirtyRows[ int(row) ] = True
+        return self.wrapped.updateValue(row, column, value)
+
+    def clearDirtyRows(self):
+        self.dirtyRows[:] = False
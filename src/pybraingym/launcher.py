@@ -0,0 +1,295 @@
+# MIT License
+#
+# Copyright (c) 2019 Arkadiusz Netczuk <dev.arnet@gmail.com>
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+
+
+import io
+import os
+import sys
+import time
+import inspect
+import warnings
+import threading
+import multiprocessing
+from multiprocessing import forkserver, popen_forkserver, process, reduction, spawn, util
+from multiprocessing.context import ForkServerContext, set_spawning_popen
+
+from pybraingym.parallelexperimentworker import PipeExperimentWorker
+
+
+## modules imported once by fork server instead of by every worker
+DEFAULT_PRELOAD = [ "numpy",
+                    "scipy.sparse",
+                    "gym",
+                    "pybrain.rl.agents",
+                    "pybrain.rl.learners",
+                    "pybrain.rl.experiments",
+                    "pybraingym.parallelexperimentworker",
+                    "pybraingym.experiment",
+                    "pybraingym.environment",
+                    "pybraingym.task" ]
+
+
+## Python versions (first and last) whose private 'multiprocessing' internals
+## are copied by LauncherPopen, see 'checkForkServerInternals()'
+SUPPORTED_PYTHON = ( (3, 8), (3, 13) )
+
+
+## environments created before fork, each forked worker has its own copy
+_preparedEnvs = dict()
+
+
+def makeEnv(envId):
+    """Return environment created by launcher before fork or new one created by 'gym.make()'.
+
+       Each prepared environment is returned only once in process.
+    """
+    envs = _preparedEnvs.get( envId, None )
+    if envs:
+        return envs.pop()
+    import gym
+    return gym.make( envId )
+
+
+def envModules(envIds):
+    """Return list of modules containing classes of given Gym environments."""
+    import gym
+    ret = []
+    for envId in envIds:
+        entryPoint = gym.spec( envId ).entry_point
+        if isinstance( entryPoint, str ):
+            ret.append( entryPoint.split(":")[0] )
+    return ret
+
+
+def checkForkServerInternals():
+    """Return list of differences between private 'multiprocessing' internals used by LauncherPopen and current ones.
+
+       LauncherPopen copies 'popen_forkserver.Popen._launch()' of CPython, so empty
+       list is returned only for Python versions in range of SUPPORTED_PYTHON
+       having the same internals.
+    """
+    ret = []
+    version = tuple( sys.version_info[:2] )
+    if version < SUPPORTED_PYTHON[0] or version > SUPPORTED_PYTHON[1]:
+        ret.append( "Python %s.%s is not supported" % version )
+    expected = [ (popen_forkserver.Popen._launch, ["self", "process_obj"]),
+                 (forkserver.ForkServer.connect_to_new_process, ["self", "fds"]),
+                 (forkserver.ForkServer.set_forkserver_preload, ["self", "modules_names"]),
+                 (forkserver.ForkServer.ensure_running, ["self"]),
+                 (forkserver.read_signed, ["fd"]) ]
+    for func, params in expected:
+        found = list( inspect.signature( func ).parameters )
+        if found != params:
+            ret.append( "%s has parameters %s instead of %s" % (func.__qualname__, found, params) )
+    try:
+        source = inspect.getsource( popen_forkserver.Popen._launch )
+        for call in ("forkserver.connect_to_new_process(self._fds)", "forkserver.read_signed(self.sentinel)"):
+            if call not in source:
+                ret.append( "Popen._launch does not call %s" % call )
+    except OSError:
+        ## source of standard library is not available
+        pass
+    return ret
+
+
+class LauncherProcess(process.BaseProcess):
+    """Process started by fork server of LauncherContext."""
+
+    _start_method = "forkserver"
+
+    @staticmethod
+    def _Popen(process_obj):
+        return LauncherPopen( process_obj )
+
+    def __getstate__(self):
+        ## fork server stays in parent process
+        state = dict( self.__dict__ )
+        state.pop( "_server", None )
+        return state
+
+
+class LauncherPopen(popen_forkserver.Popen):
+    """Same as Popen of 'forkserver' method, but process is forked by server of its context."""
+
+    def _launch(self, process_obj):
+        prep_data = spawn.get_preparation_data( process_obj._name )
+        buf = io.BytesIO()
+        set_spawning_popen( self )
+        try:
+            reduction.dump( prep_data, buf )
+            reduction.dump( process_obj, buf )
+        finally:
+            set_spawning_popen( None )
+        self.sentinel, w = process_obj._server.connect_to_new_process( self._fds )
+        ## duplicate of data pipe is sentinel of parent process used by child
+        parentW = os.dup( w )
+        self.finalizer = util.Finalize( self, util.close_fds, (parentW, self.sentinel) )
+        with open( w, 'wb', closefd=True ) as f:
+            f.write( buf.getbuffer() )
+        self.pid = forkserver.read_signed( self.sentinel )
+
+
+class LauncherContext(ForkServerContext):
+    """Context of 'forkserver' method with its own fork server.
+
+       Preloaded modules are set only for this server, so process-wide
+       default 'forkserver' context is not changed. Private server relies on
+       internals of CPython's 'multiprocessing', so RuntimeError is raised if
+       they differ from supported ones (see 'checkForkServerInternals()').
+    """
+
+    def __init__(self):
+        problems = checkForkServerInternals()
+        if len(problems) > 0:
+            raise RuntimeError("private fork server can not be used (supported Python %s.%s - %s.%s): %s" %
+                               (SUPPORTED_PYTHON[0] + SUPPORTED_PYTHON[1] + ("; ".join( problems ),)) )
+        ForkServerContext.__init__( self )
+        self.server = forkserver.ForkServer()
+
+    def Process(self, *args, **kwargs):
+        proc = LauncherProcess( *args, **kwargs )
+        proc._server = self.server
+        return proc
+
+    def set_forkserver_preload(self, module_names):
+        self.server.set_forkserver_preload( module_names )
+
+    def ensure_running(self):
+        self.server.ensure_running()
+
+
+class WorkerLauncher:
+    """Starts workers from process with preloaded modules.
+
+       With "forkserver" method launcher's own fork server imports 'preload'
+       modules once and every worker is forked from it, so worker starts
+       without cold imports. 'createExperimentInstance' has to be picklable
+       then. With "fork" method modules are imported and environments are
+       created in current process before workers are forked from it. Forking
+       process running other threads (e.g. threads of MultiExperiment's pool
+       or feeder threads of queues) can deadlock child on lock held by them,
+       so in "fork" mode workers can not be started from other thread than
+       main one (e.g. respawned by MultiExperiment) and warning is issued if
+       other threads are running. Launcher is passed to MultiExperiment as
+       'workerFactory'. Startup time of every worker is stored in
+       'startupTimes'.
+    """
+
+    def __init__(self, preload=None, method="forkserver", workerClass=PipeExperimentWorker, envs=None, envFactory=None):
+        """Class constructor.
+
+        Arguments:
+        preload -- list of modules to import before forking workers (DEFAULT_PRELOAD if None),
+                   modules which can not be imported are skipped
+        method -- start method of workers' processes: "forkserver" or "fork"
+        workerClass -- PipeExperimentWorker or ManagedExperimentWorker
+        envs -- list of ids of Gym environments created before fork (see 'makeEnv()'),
+                in "forkserver" mode only modules of environments are preloaded
+        envFactory -- function creating environment from id ('gym.make' if None)
+        """
+        if method not in ("forkserver", "fork"):
+            raise AssertionError("invalid parameter: method - it has to be 'forkserver' or 'fork'")
+        if preload is None:
+            preload = DEFAULT_PRELOAD
+        self.preload = list( preload )
+        self.method = method
+        self.workerClass = workerClass
+        self.envs = list( envs ) if envs is not None else []
+        self.envFactory = envFactory
+        if method == "forkserver":
+            self.context = LauncherContext()
+        else:
+            self.context = multiprocessing.get_context( method )
+        self.startupTimes = []
+        self.warmUpTime = None
+
+    def warmUp(self):
+        """Import modules (and create environments) before first worker is started.
+
+           Returns duration of warm up in seconds.
+        """
+        startTime = time.time()
+        if self.method == "forkserver":
+            preload = self.preload
+            if len(self.envs) > 0:
+                try:
+                    preload = preload + envModules( self.envs )
+                except ImportError:
+                    ## Gym is not available -- there is nothing to preload
+                    pass
+            self.context.set_forkserver_preload( preload )
+            self.context.ensure_running()
+            ## wait until server finishes imports
+            process = self.context.Process( target=_emptyMain, daemon=True )
+            process.start()
+            process.join()
+        else:
+            for name in self.preload:
+                _tryImport( name )
+            for envId in self.envs:
+                _preparedEnvs.setdefault( envId, [] ).append( self.createEnv( envId ) )
+        self.warmUpTime = time.time() - startTime
+        return self.warmUpTime
+
+    def createEnv(self, envId):
+        if self.envFactory is not None:
+            return self.envFactory( envId )
+        import gym
+        return gym.make( envId )
+
+    def __call__(self, createExperimentInstance):
+        if self.warmUpTime is None:
+            self.warmUp()
+        if self.method == "fork":
+            self._checkThreads()
+        startTime = time.time()
+        worker = self.workerClass( createExperimentInstance, context=self.context )
+        self.startupTimes.append( time.time() - startTime )
+        return worker
+
+    def _checkThreads(self):
+        if threading.current_thread() is not threading.main_thread():
+            raise RuntimeError("'fork' method can not start worker from other thread than main one, use 'forkserver' method")
+        if threading.active_count() > 1:
+            warnings.warn( "forking process running other threads -- worker can deadlock, use 'forkserver' method",
+                           RuntimeWarning )
+
+    def getStartupStats(self):
+        """Return dict of number of started workers and total, mean and max of their startup times."""
+        count = len(self.startupTimes)
+        if count < 1:
+            return { "workers": 0, "warmUp": self.warmUpTime, "total": 0.0, "mean": None, "max": None }
+        total = sum( self.startupTimes )
+        return { "workers": count, "warmUp": self.warmUpTime, "total": total,
+                 "mean": total / count, "max": max( self.startupTimes ) }
+
+
+def _emptyMain():
+    pass
+
+
+def _tryImport(name):
+    try:
+        __import__( name )
+    except ImportError:
+        pass
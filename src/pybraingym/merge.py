@@ -0,0 +1,85 @@
+# MIT License
+#
+# Copyright (c) 2019 Arkadiusz Netczuk <dev.arnet@gmail.com>
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+
+
+import numpy as np
+
+
+def mergeTables(paramsList, weightsList, numRows):
+    """Return parameters of action value tables merged row by row.
+
+       Each row of result is weighted average of corresponding rows of all
+       tables. Rows with zero total weight are plain average of tables.
+
+       Arguments:
+       paramsList -- list of flat parameters arrays of tables of the same shape
+       weightsList -- list of arrays of weight of each row (e.g. state visit counts)
+       numRows -- number of rows (states) of tables
+    """
+    tables = np.stack( paramsList ).reshape( len(paramsList), numRows, -1 )
+    weights = np.stack( weightsList ).astype( np.float64 )
+    totals = weights.sum( axis=0 )
+    empty = totals <= 0
+    weights[ :, empty ] = 1.0
+    totals[ empty ] = len(paramsList)
+    merged = np.einsum( "wr,wrc->rc", weights / totals, tables )
+    return merged.reshape( -1 )
+
+
+class VisitWeightedMerge:
+    """Merges parameters of workers' tables weighted by per-state visit counts.
+
+       Can be passed to MultiExperiment as 'mergeParameters' instead of
+       'copyAgentState'. Visit counts are read from 'stateArray' of agent's
+       module (see ActionValueTableWrapper). Only visits since previous merge
+       are taken into account, because after merge all tables are equal.
+       Workers without visit counts are weighted equally.
+    """
+
+    def __init__(self):
+        self.lastVisits = None
+
+    def __call__(self, paramsList, visitsList):
+        numRows = None
+        for visits in visitsList:
+            if visits is not None:
+                numRows = len(visits)
+                break
+        if numRows is None:
+            return np.mean( np.stack( paramsList ), axis=0 )
+        if self.lastVisits is None:
+            self.lastVisits = [ None ] * len(visitsList)
+        weightsList = []
+        for i in range(0, len(visitsList)):
+            visits = visitsList[i]
+            if visits is None:
+                weightsList.append( np.ones( numRows ) )
+                continue
+            last = self.lastVisits[i]
+            if last is None or (visits < last).any():
+                ## first merge or counter started again (e.g. worker was respawned)
+                weightsList.append( visits )
+            else:
+                weightsList.append( np.maximum( visits - last, 0 ) )
+            self.lastVisits[i] = visits
+        return mergeTables( paramsList, weightsList, numRows )
@@ -0,0 +1,210 @@
+# MIT License
+#
+# Copyright (c) 2019 Arkadiusz Netczuk <dev.arnet@gmail.com>
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+
+
+import numpy as np
+
+
+## scipy is imported inside methods, so importing module does not load it
+
+
+class DiscreteModel:
+    """Transition model of discrete Gym environment.
+
+       Model consists of sparse matrix of transition probabilities with
+       rows indexed by (state * numActions + action) and columns indexed by
+       next state, and vector of expected immediate rewards. Transitions
+       ending episode are not stored in matrix, so value of terminal
+       state is always zero.
+    """
+
+    def __init__(self, numStates, numActions, transitions, rewards, initial=None):
+        self.numStates = numStates
+        self.numActions = numActions
+        import scipy.sparse
+        self.transitions = scipy.sparse.csr_matrix( transitions )
+        self.rewards = np.asarray( rewards, dtype=np.float64 )
+        if initial is None:
+            initial = np.zeros( numStates )
+            initial[0] = 1.0
+        self.initial = np.asarray( initial, dtype=np.float64 )
+
+    @staticmethod
+    def fromEnv(gymEnv):
+        """Build model from 'P' attribute of Gym's toy text environments (e.g. FrozenLake, Taxi)."""
+        rawEnv = getattr( gymEnv, "unwrapped", gymEnv )
+        return DiscreteModel.fromTransitions( rawEnv.P, getattr( rawEnv, "isd", None ) )
+
+    @staticmethod
+    def fromTransitions(transitionsDict, initial=None):
+        """Build model from dict in format: P[state][action] == [(probability, nextstate, reward, done), ...]."""
+        numStates = len(transitionsDict)
+        numActions = len(transitionsDict[0])
+        rows = []
+        cols = []
+        probs = []
+        rewards = np.zeros( numStates * numActions )
+        for state in range(0, numStates):
+            stateActions = transitionsDict[ state ]
+            for action in range(0, numActions):
+                row = state * numActions + action
+                for prob, nextState, reward, done in stateActions[ action ]:
+                    rewards[ row ] += prob * reward
+                    if done:
+                        continue
+                    rows.append( row )
+                    cols.append( nextState )
+                    probs.append( prob )
+        import scipy.sparse
+        transitions = scipy.sparse.coo_matrix( (probs, (rows, cols)), shape=(numStates * numActions, numStates) )
+        return DiscreteModel( numStates, numActions, transitions, rewards, initial )
+
+    def policyRows(self, policy):
+        return np.arange( self.numStates ) * self.numActions + np.asarray( policy, dtype=np.int64 )
+
+    def evaluatePolicy(self, policy, gamma=0.99):
+        """Return values of states under deterministic policy (array of actions).
+
+           Values are exact solution of linear system (I - gamma * P) * v = r.
+           For gamma equal 1 policy has to reach terminal state from every state.
+        """
+        rows = self.policyRows( policy )
+        policyTransitions = self.transitions[ rows ]
+        policyRewards = self.rewards[ rows ]
+        import scipy.sparse.linalg
+        system = scipy.sparse.identity( self.numStates, format="csc" ) - gamma * policyTransitions.tocsc()
+        return scipy.sparse.linalg.spsolve( system, policyRewards )
+
+    def actionValues(self, stateValues, gamma=0.99):
+        """Return array (states, actions) of action values for given state values."""
+        qvalues = self.rewards + gamma * self.transitions.dot( stateValues )
+        return qvalues.reshape( self.numStates, self.numActions )
+
+    def expectedReturn(self, stateValues):
+        """Return value of initial state distribution."""
+        return float( self.initial.dot( stateValues ) )
+
+
+def valueIteration(model, gamma=0.99, tolerance=1e-8, maxIterations=100000):
+    """Calculate optimal action values using value iteration.
+
+       Returns 2-D array (states, actions) of action values.
+    """
+    stateValues = np.zeros( model.numStates )
+    qvalues = model.actionValues( stateValues, gamma )
+    for _ in range(0, maxIterations):
+        newValues = qvalues.max( axis=1 )
+        diff = np.max( np.abs( newValues - stateValues ) )
+        stateValues = newValues
+        qvalues = model.actionValues( stateValues, gamma )
+        if diff < tolerance:
+            break
+    return qvalues
+
+
+def policyIteration(model, gamma=0.99, maxIterations=1000, policy=None):
+    """Calculate optimal action values using policy iteration.
+
+       Each iteration evaluates policy exactly. For gamma equal 1 every
+       intermediate policy has to reach terminal state. Returns 2-D array
+       (states, actions) of action values.
+    """
+    if policy is None:
+        policy = np.zeros( model.numStates, dtype=np.int64 )
+    policy = np.asarray( policy, dtype=np.int64 )
+    states = np.arange( model.numStates )
+    for _ in range(0, maxIterations):
+        stateValues = model.evaluatePolicy( policy, gamma )
+        qvalues = model.actionValues( stateValues, gamma )
+        newPolicy = greedyPolicy( qvalues )
+        ## keep current action in case of tie to prevent oscillation
+        keep = qvalues[ states, policy ] >= qvalues[ states, newPolicy ] - 1e-12
+        newPolicy[ keep ] = policy[ keep ]
+        if np.array_equal( newPolicy, policy ):
+            break
+        policy = newPolicy
+    return qvalues
+
+
+def loadTable(table, qvalues):
+    """Set action values (e.g. calculated by valueIteration) as parameters of ActionValueTable."""
+    params = np.array( qvalues, dtype=np.float64 ).ravel()
+    assert params.size == table.numRows * table.numColumns, "table size differs from size of values"
+    table._setParameters( params )
+
+
+def greedyPolicy(values):
+    """Return array of best actions of 2-D array (states, actions) of action values."""
+    return np.argmax( values, axis=1 )
+
+
+def tableValues(table):
+    """Return view of ActionValueTable parameters as 2-D array (states, actions)."""
+    return table.params.reshape( table.numRows, table.numColumns )
+
+
+def evaluateTable(model, table, gamma=0.99):
+    """Return exact expected return of greedy policy of ActionValueTable."""
+    policy = greedyPolicy( tableValues(table) )
+    stateValues = model.evaluatePolicy( policy, gamma )
+    return model.expectedReturn( stateValues )
+
+
+class ModelQuality:
+    """Quality functor evaluating greedy policy of experiment's agent with model.
+
+       Can be passed as quality functor to ProcessExperimentWorker instead of
+       statistics of episodes rewards. Evaluation is performed every 'period'
+       episodes.
+    """
+
+    def __init__(self, model, experiment, gamma=0.99, period=1):
+        self.model = model
+        self.experiment = experiment
+        self.gamma = gamma
+        self.period = period
+        self.calls = 0
+        self.rate = 0
+
+    def setExperiment(self, experiment):
+        self.experiment = experiment
+
+    def getRate(self):
+        return self.rate
+
+    def evaluate(self):
+        table = self.experiment.agent.module
+        self.rate = evaluateTable( self.model, table, self.gamma )
+        return self.rate
+
+    def __call__(self, iteration, reward):
+        if self.calls % self.period == 0:
+            self.evaluate()
+        self.calls += 1
+        return self.rate
+
+    def __getstate__(self):
+        ## experiment is not stored -- it is attached by owner after restore
+        state = self.__dict__.copy()
+        state["experiment"] = None
+        return state
@@ -0,0 +1,146 @@
+# MIT License
+#
+# Copyright (c) 2019 Arkadiusz Netczuk <dev.arnet@gmail.com>
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+
+
+import numpy as np
+
+
+## Recorded episode is dict of columns as returned by TrajectoryReader.getEpisode().
+## Last row of finished episode contains final observation and has 'done' flag set.
+
+
+def learnFromEpisodes(learner, episodes, processLastReward=True):
+    """Pass recorded episodes to PyBrain's value based learner (e.g. Q, SARSA, QLambda).
+
+       Episodes are passed one by one, so learners considering only last
+       sequence of dataset (QLambda) get whole data. Learner's module is
+       updated in place. If 'processLastReward' is set, then final
+       observation is passed to learner with greedy action, similarly to
+       'processLastReward()' during experiment.
+    """
+    from pybrain.datasets import ReinforcementDataSet
+
+    module = learner.module
+    prevDataset = learner.dataset
+    try:
+        for episode in episodes:
+            observations = episode["observation"]
+            actions = episode["action"]
+            rewards = episode["reward"]
+            steps = _stepsNumber( episode )
+            if steps < 1:
+                continue
+            dataset = ReinforcementDataSet( observations.shape[1], actions.shape[1] )
+            dataset.newSequence()
+            for i in range(0, steps):
+                dataset.addSample( observations[i], actions[i], rewards[i] )
+            if processLastReward and _isFinished( episode ):
+                lastObservation = observations[ steps ]
+                lastAction = module.getMaxAction( lastObservation[0] )
+                dataset.addSample( lastObservation, [lastAction], rewards[ steps - 1 ] )
+            learner.dataset = dataset
+            learner.learn()
+    finally:
+        learner.dataset = prevDataset
+
+
+def replayEpisodes(values, episodes, alpha, gamma, method="q", processLastReward=True):
+    """Apply Q or SARSA update of recorded episodes directly on table of values.
+
+       'values' is 2-D array of shape (states, actions), e.g. view returned by
+       'table.params.reshape(table.numRows, table.numColumns)'. Updates are
+       performed in place in the same order and with the same formula as
+       PyBrain's Q and SARSA learners do, but without overhead of dataset
+       and module calls.
+    """
+    if method not in ("q", "sarsa"):
+        raise ValueError("invalid method:", method)
+    for episode in episodes:
+        states, actions, rewards, nextStates, nextActions = episodeTransitions( episode, processLastReward )
+        for i in range(0, len(states)):
+            state = states[i]
+            action = actions[i]
+            if method == "q":
+                nextValue = values[ nextStates[i] ].max()
+            else:
+                nextAction = nextActions[i]
+                if nextAction < 0:
+                    nextAction = values[ nextStates[i] ].argmax()
+                nextValue = values[ nextStates[i], nextAction ]
+            qvalue = values[ state, action ]
+            values[ state, action ] = qvalue + alpha * (rewards[i] + gamma * nextValue - qvalue)
+    return values
+
+
+def batchUpdate(values, states, actions, rewards, nextStates, alpha, gamma):
+    """Apply one synchronous Q-learning update for all given transitions at once.
+
+       Targets are calculated from values before update. Transitions sharing
+       the same (state, action) pair are averaged. It is approximation of
+       sequential update, but whole batch is processed without Python loop.
+    """
+    numActions = values.shape[1]
+    targets = rewards + gamma * values[ nextStates ].max( axis=1 )
+    cells = states * numActions + actions
+    deltaSum = np.bincount( cells, weights=(targets - values[ states, actions ]), minlength=values.size )
+    counts = np.bincount( cells, minlength=values.size )
+    visited = np.flatnonzero( counts )
+    ## 'values' is indexed in two dimensions, so views (e.g. not contiguous) are updated in place
+    values[ visited // numActions, visited % numActions ] += alpha * deltaSum[ visited ] / counts[ visited ]
+    return values
+
+
+def episodeTransitions(episode, processLastReward=True):
+    """Convert recorded episode of discrete environment to arrays of transitions.
+
+       Returns tuple of arrays: (states, actions, rewards, next states, next actions).
+       Next action of transition to final observation is -1 (not taken).
+    """
+    steps = _stepsNumber( episode )
+    observations = episode["observation"]
+    actions = episode["action"]
+    rewards = episode["reward"]
+    count = steps
+    if not (processLastReward and _isFinished( episode )):
+        count = max( steps - 1, 0 )             ## last step has no successor
+    states = observations[ :count, 0 ].astype( np.int64 )
+    acts = actions[ :count, 0 ].astype( np.int64 )
+    rews = np.asarray( rewards[ :count ], dtype=np.float64 )
+    nextStates = observations[ 1:count + 1, 0 ].astype( np.int64 )
+    nextActions = np.full( count, -1, dtype=np.int64 )
+    if count > 1:
+        nextActions[ :count - 1 ] = acts[ 1: ]
+    if count > 0 and count < steps:
+        nextActions[ count - 1 ] = int( actions[ count, 0 ] )
+    return (states, acts, rews, nextStates, nextActions)
+
+
+def _stepsNumber(episode):
+    if _isFinished( episode ):
+        return len(episode["reward"]) - 1
+    return len(episode["reward"])
+
+
+def _isFinished(episode):
+    done = episode["done"]
+    return len(done) > 0 and bool( done[-1] )
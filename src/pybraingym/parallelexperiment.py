@@ -22,12 +22,27 @@
 #
 
 
-from pybraingym.parallelexperimentworker import ProcessExperimentWorker as ProcessExperiment    ## backward compatibility
-from pybraingym.parallelexperimentworker import ManagedExperimentWorker
-from pybraingym.experiment import doEpisode, processLastReward, evaluate
+from pybraingym.placement import planPlacement, PlacedFactory, setThreadsVariables, hasThreadsControl
 from concurrent.futures import ThreadPoolExecutor
 
 import abc
+import time
+import warnings
+import threading
+
+
+## workers (and NumPy) are imported on first use, see __getattr__()
+_WORKER_CLASSES = { "ProcessExperiment": "ProcessExperimentWorker",        ## backward compatibility
+                    "ManagedExperimentWorker": "ManagedExperimentWorker",
+                    "PipeExperimentWorker": "PipeExperimentWorker" }
+
+
+def __getattr__(name):
+    workerClass = _WORKER_CLASSES.get( name, None )
+    if workerClass is None:
+        raise AttributeError( "module %r has no attribute %r" % (__name__, name) )
+    from pybraingym import parallelexperimentworker
+    return getattr( parallelexperimentworker, workerClass )
 
 
 class ParallelExperiment(metaclass=abc.ABCMeta):
@@ -44,6 +59,10 @@ class ParallelExperiment(metaclass=abc.ABCMeta):
     def getCumulativeReward(self):
         raise NotImplementedError('You need to define this method in derived class!')
 
+    @abc.abstractmethod
+    def getStepsCount(self):
+        raise NotImplementedError('You need to define this method in derived class!')
+
     @abc.abstractmethod
     def demonstrate(self):
         raise NotImplementedError('You need to define this method in derived class!')
@@ -52,6 +71,14 @@ class ParallelExperiment(metaclass=abc.ABCMeta):
     def getBestExperiment(self):
         raise NotImplementedError('You need to define this method in derived class!')
 
+    @abc.abstractmethod
+    def getState(self):
+        raise NotImplementedError('You need to define this method in derived class!')
+
+    @abc.abstractmethod
+    def setState(self, state):
+        raise NotImplementedError('You need to define this method in derived class!')
+
     @abc.abstractmethod
     def close(self):
         raise NotImplementedError('You need to define this method in derived class!')
@@ -71,12 +98,21 @@ class WrapperExperiment(ParallelExperiment):
     
     def getCumulativeReward(self):
         return self.experiment.getCumulativeReward()
+
+    def getStepsCount(self):
+        return self.experiment.getStepsCount()
     
     def demonstrate(self):
         return self.experiment.demonstrate()
     
     def getBestExperiment(self):
         return self.experiment
+
+    def getState(self):
+        return self.experiment.getState()
+
+    def setState(self, state):
+        self.experiment.setState( state )
     
     def close(self):
         self.experiment.close()
@@ -84,16 +120,96 @@ class WrapperExperiment(ParallelExperiment):
 
 class MultiExperiment(ParallelExperiment):
 
-    def __init__(self, experimentsNumber, createExperimentInstance, copyAgentState=None):
+    def __init__(self, experimentsNumber, createExperimentInstance, copyAgentState=None, workerFactory=None,
+                 sharedParameters=False, hogwild=False, mergeParameters=None, respawnWorkers=False,
+                 placement=None, threadsNumber=None, progress=None, deltaTransfer=None, sharedMetrics=False):
+        """Class constructor.
+
+        Arguments:
+        createExperimentInstance -- function creating ProcessExperimentWorker or list of
+                                    such functions, one for each worker
+        workerFactory -- class of worker executing experiment in separate process,
+                         e.g. ManagedExperimentWorker (default) or PipeExperimentWorker
+        sharedParameters -- keep parameters of each worker's module in shared memory
+                            and propagate best result by copying parameters in place
+                            instead of calling 'copyAgentState'
+        hogwild -- all workers' modules use single table of parameters in shared memory,
+                   updated concurrently without locks, so experience of every worker
+                   is kept (best result is not propagated)
+        mergeParameters -- function merging parameters of all workers, called with list
+                           of parameters and list of states visit counts (e.g. VisitWeightedMerge),
+                           result is set to every worker instead of calling 'copyAgentState'
+        respawnWorkers -- replace worker which died (e.g. its process was killed) with new one
+                          created by 'createExperimentInstance' and restore last best parameters,
+                          so only current round of the worker is lost (calls made by DeltaTransfer
+                          are not guarded)
+        placement -- list of sets of CPUs, one for each worker, or "auto" (see planPlacement()),
+                     worker's process is pinned to its CPUs
+        threadsNumber -- limit of threads of BLAS/OpenMP libraries in worker process, environment
+                         variables are set in current process before workers are started, forked
+                         workers are limited only if 'threadpoolctl' is installed
+        progress -- ProgressChannel receiving records of episodes of all workers
+        deltaTransfer -- DeltaTransfer propagating best result by sending only changed rows
+                         of parameters instead of calling 'copyAgentState'
+        sharedMetrics -- workers write their metrics to table in shared memory (see SharedMetrics),
+                         so best worker is selected without calling workers (not available
+                         for remote workers)
+        """
         ParallelExperiment.__init__( self )
         self.stepid = 0
         self.bestExperiment = None
         self.expNum = experimentsNumber
         self.copyAgentState = copyAgentState
+        self.mergeParameters = mergeParameters
+        self.createExperimentInstance = createExperimentInstance
+        if isinstance(createExperimentInstance, list):
+            assert len(createExperimentInstance) == experimentsNumber, "function has to be given for every worker"
+            self.slotFactories = list( createExperimentInstance )
+        else:
+            self.slotFactories = [ createExperimentInstance ] * experimentsNumber
+        if workerFactory is None:
+            from pybraingym.parallelexperimentworker import ManagedExperimentWorker
+            workerFactory = ManagedExperimentWorker
+        self.workerFactory = workerFactory
+        self.respawnWorkers = respawnWorkers
+        self.respawnCounter = 0
+        self.bestParameters = None              ## parameters restored in respawned worker
+        self.respawnLock = threading.Lock()
+        self.asyncLock = threading.Lock()
+        self.asyncBest = None
+        self.roundSteps = None                  ## steps of each worker in last balanced round
+        self.roundEpisodes = None
+        if placement == "auto":
+            placement = planPlacement( experimentsNumber )
+        if placement is not None:
+            assert len(placement) == experimentsNumber, "placement has to be given for every worker"
+        self.placement = placement              ## CPUs of each worker or None
+        self.threadsNumber = threadsNumber
+        if threadsNumber is not None:
+            ## processes started by 'spawn' or 'forkserver' load libraries with the limit
+            setThreadsVariables( threadsNumber )
+            if hasThreadsControl() is False:
+                warnings.warn( "threadpoolctl is not installed -- threads limit is not applied to forked workers",
+                               RuntimeWarning )
+        self.progress = progress
+        self.deltaTransfer = deltaTransfer
         self.experiments = []
-        for _ in range(0, self.expNum):
-            procExp = ManagedExperimentWorker( createExperimentInstance )
+        startTime = time.time()
+        for i in range(0, self.expNum):
+            procExp = self._createWorker( i )
             self.experiments.append( procExp )
+        self.startupTime = time.time() - startTime      ## seconds of starting all workers
+        ## threads dispatching calls to workers, kept for whole life of object
+        self.pool = ThreadPoolExecutor( max_workers=self.expNum )
+        self.sharedBlocks = None
+        self.metrics = None
+        if sharedMetrics:
+            self._shareMetrics()
+        self.hogwild = hogwild
+        if hogwild:
+            self._shareTable()
+        elif sharedParameters:
+            self._shareParameters()
 
     def getExperiments(self):
         ret = []
@@ -103,18 +219,141 @@ class MultiExperiment(ParallelExperiment):
 
     def doExperiment(self, number=1, render_steps=False):
         self.bestExperiment = None
+        self.asyncBest = None
         ## execute experiments
+        if self.respawnWorkers:
+            self.checkWorkers()
+            paramsList = []
+            for i in range(0, self.expNum):
+                paramsList.append( (self, i, number, render_steps) )
+            list( self.pool.map(MultiExperiment.processRespawnExperiment, paramsList) )
+        else:
+            paramsList = []
+            for exp in self.experiments:
+                paramsList.append( (exp, number, render_steps) )
+            list( self.pool.map(MultiExperiment.processExperiment, paramsList) )
+        self.roundSteps = None
+        self._finishRound()
+
+    def doBalancedExperiment(self, maxSteps, chunkSize=1, render_steps=False):
+        """Execute experiments until total number of steps of all workers reaches 'maxSteps'.
+
+           Workers take chunks of 'chunkSize' episodes as long as budget is
+           not used up, so workers with short episodes execute more of them
+           and all workers are busy until end of round. Budget can be exceeded
+           by at most one chunk per worker.
+        """
+        self.bestExperiment = None
+        self.asyncBest = None
+        if self.respawnWorkers:
+            self.checkWorkers()
+        self.balanceLock = threading.Lock()
+        self.usedSteps = 0
+        self.roundSteps = [ 0 ] * self.expNum
+        self.roundEpisodes = [ 0 ] * self.expNum
         paramsList = []
-        for exp in self.experiments:
-            paramsList.append( (exp, number, render_steps) )
-        with ThreadPoolExecutor( max_workers=self.expNum ) as pool:
-            pool.map(MultiExperiment.processExperiment, paramsList)
+        for i in range(0, self.expNum):
+            paramsList.append( (self, i, maxSteps, chunkSize, render_steps) )
+        list( self.pool.map(MultiExperiment.processBalancedExperiment, paramsList) )
+        self._finishRound()
+
+    @staticmethod
+    def processBalancedExperiment(params):
+        multiExperiment = params[0]
+        index = params[1]
+        maxSteps = params[2]
+        chunkSize = params[3]
+        render_steps = params[4]
+        while multiExperiment._isBudgetLeft( maxSteps ):
+            ## steps count comes with reply, so chunk costs single round trip
+            if multiExperiment.respawnWorkers:
+                steps = multiExperiment.callWorker( index, "doExperiment", chunkSize, render_steps )
+            else:
+                steps = multiExperiment.experiments[ index ].doExperiment( chunkSize, render_steps )
+            if steps is None:
+                steps = 0
+            with multiExperiment.balanceLock:
+                multiExperiment.usedSteps += steps
+                multiExperiment.roundSteps[ index ] += steps
+                multiExperiment.roundEpisodes[ index ] += chunkSize
+            if steps < 1:
+                ## worker makes no progress (e.g. was respawned)
+                break
 
+    def _isBudgetLeft(self, maxSteps):
+        with self.balanceLock:
+            return self.usedSteps < maxSteps
+
+    def _finishRound(self):
         ## find best agent
         self.bestExperiment = self.getBestExperimentIndex()
-        if self.copyAgentState is not None:
+        if self.respawnWorkers:
+            self.bestParameters = self.experiments[ self.bestExperiment ].getParameters()
+        if self.hogwild:
+            ## all workers already use the same parameters
+            pass
+        elif self.mergeParameters is not None:
+            self._mergeWorkersParameters()
+        elif self.sharedBlocks is not None:
+            self._propagateSharedParameters()
+        elif self.deltaTransfer is not None:
+            self.deltaTransfer.propagate( self.experiments, self.bestExperiment, self.pool )
+        elif self.copyAgentState is not None:
             self._propagateBestResult()
 
+    def doAsyncExperiment(self, number=1, chunkSize=10, render_steps=False):
+        """Execute experiments without waiting for all workers between chunks of episodes.
+
+           Each worker executes 'number' episodes in chunks of 'chunkSize'
+           episodes. After each chunk worker's quality is compared with best
+           result found so far. If it is better, then worker's parameters
+           become the best result, otherwise worker receives best parameters
+           and continues.
+        """
+        self.bestExperiment = None
+        self.roundSteps = None
+        self.asyncBest = None                   ## tuple: (quality rate, parameters)
+        paramsList = []
+        for i in range(0, self.expNum):
+            paramsList.append( (self, i, number, chunkSize, render_steps) )
+        list( self.pool.map(MultiExperiment.processAsyncExperiment, paramsList) )
+        self.bestExperiment = self.getBestExperimentIndex()
+
+    @staticmethod
+    def processAsyncExperiment(params):
+        multiExperiment = params[0]
+        index = params[1]
+        number = params[2]
+        chunkSize = params[3]
+        render_steps = params[4]
+        experiment = multiExperiment.experiments[ index ]
+        done = 0
+        while done < number:
+            chunk = min( chunkSize, number - done )
+            if multiExperiment.respawnWorkers:
+                multiExperiment.callWorker( index, "doExperiment", chunk, render_steps )
+                experiment = multiExperiment.experiments[ index ]
+            else:
+                experiment.doExperiment( chunk, render_steps )
+            done += chunk
+            if multiExperiment.hogwild is False:
+                multiExperiment._compareAsyncResult( experiment )
+
+    def _compareAsyncResult(self, experiment):
+        rate = experiment.getQualityRate()
+        with self.asyncLock:
+            best = self.asyncBest
+        if best is None or rate > best[0]:
+            ## parameters are received without holding lock, so other workers are not blocked
+            params = experiment.getParameters()
+            with self.asyncLock:
+                best = self.asyncBest
+                if best is None or rate > best[0]:
+                    self.asyncBest = ( rate, params )
+                    return
+            ## other worker stored better result in the meantime
+        experiment.setParameters( best[1] )
+
     @staticmethod
     def processExperiment(params):
         experiment = params[0]
@@ -122,26 +361,130 @@ class MultiExperiment(ParallelExperiment):
         demonstrate = params[2]
         experiment.doExperiment(number, demonstrate)
 
+    @staticmethod
+    def processRespawnExperiment(params):
+        multiExperiment = params[0]
+        index = params[1]
+        number = params[2]
+        demonstrate = params[3]
+        multiExperiment.callWorker( index, "doExperiment", number, demonstrate )
+
+    def callWorker(self, index, command, *args):
+        """Call method of worker. If worker died, then it is respawned and None is returned."""
+        experiment = self.experiments[ index ]
+        try:
+            return getattr( experiment, command )( *args )
+        except Exception:
+            if self.respawnWorkers is False or experiment.isAlive():
+                raise
+        self.respawnWorker( index )
+        return None
+
+    def checkWorkers(self):
+        """Respawn dead workers. Return list of indexes of respawned workers."""
+        ret = []
+        for i in range(0, self.expNum):
+            if self.experiments[i].isAlive() is False:
+                self.respawnWorker( i )
+                ret.append( i )
+        return ret
+
+    def respawnWorker(self, index):
+        """Replace worker with new one and restore last best parameters in it."""
+        oldWorker = self.experiments[ index ]
+        try:
+            oldWorker.close()
+        except Exception:
+            ## worker is already dead
+            pass
+        newWorker = self._createWorker( index )
+        with self.respawnLock:
+            self._bindSharedMemory( newWorker, index )
+            if self.hogwild is False:
+                bestParameters = self.bestParameters
+                if self.asyncBest is not None:
+                    bestParameters = self.asyncBest[1]
+                if bestParameters is not None:
+                    newWorker.setParameters( bestParameters )
+            self.experiments[ index ] = newWorker
+            self.respawnCounter += 1
+        return newWorker
+
+    def replaceWorker(self, index, createExperimentInstance):
+        """Replace worker with new one created by given function (e.g. with other configuration).
+
+           New worker starts from its own initial parameters, so it is not
+           counted as respawn.
+        """
+        oldWorker = self.experiments[ index ]
+        try:
+            oldWorker.close()
+        except Exception:
+            ## worker is already dead
+            pass
+        self.slotFactories[ index ] = createExperimentInstance
+        newWorker = self._createWorker( index )
+        with self.respawnLock:
+            self._bindSharedMemory( newWorker, index )
+            self.experiments[ index ] = newWorker
+        return newWorker
+
+    def _bindSharedMemory(self, worker, index):
+        if self.metrics is not None:
+            worker.shareMetrics( self.metrics.name, self.expNum, index )
+        if self.sharedBlocks is None:
+            return
+        if self.hogwild:
+            ## binding would overwrite shared table with parameters of new worker
+            block = self.sharedBlocks[0]
+            snapshot = block.array.copy()
+            worker.shareParameters( block.name )
+            block.array[:] = snapshot
+        else:
+            worker.shareParameters( self.sharedBlocks[ index ].name )
+
     def getCumulativeReward(self):
         assert self.bestExperiment >= 0
         exp = self.experiments[ self.bestExperiment ]
         return exp.getCumulativeReward()
 
+    def getStepsCount(self):
+        """Return total number of environment steps of all workers performed in last round."""
+        if self.roundSteps is not None:
+            return sum( self.roundSteps )
+        if self.metrics is not None:
+            return int( self.metrics.array["roundSteps"].sum() )
+        steps = 0
+        for i in range(0, self.expNum):
+            ## respawned worker returns None
+            steps += self.callWorker( i, "getStepsCount" ) or 0
+        return steps
+
     def getBestExperimentIndex(self):
         if self.expNum < 1:
             return -1
         if self.expNum == 1:
             return 0
+        if self.metrics is not None:
+            return self.metrics.getBestIndex()
         retIndex = 0
-        maxRew = self.experiments[0].getQualityRate()
-        for i in range(1, self.expNum):
-            exp = self.experiments[i]
-            rew = exp.getQualityRate()
-            if rew > maxRew:
+        maxRew = None
+        for i in range(0, self.expNum):
+            rew = self.callWorker( i, "getQualityRate" )
+            if rew is None:
+                ## worker was respawned
+                continue
+            if maxRew is None or rew > maxRew:
                 maxRew = rew
                 retIndex = i
         return retIndex
 
+    def getMetrics(self):
+        """Return copy of shared metrics table (one row per worker) or None if metrics are not shared."""
+        if self.metrics is None:
+            return None
+        return self.metrics.snapshot()
+
     def getBestExperiment(self):
         assert self.bestExperiment >= 0
         bestExp = self.experiments[ self.bestExperiment ]
@@ -152,18 +495,7 @@ class MultiExperiment(ParallelExperiment):
         paramsList = []
         for exp in self.experiments:
             paramsList.append( (exp, number) )
-
-        with ThreadPoolExecutor( max_workers=self.expNum ) as pool:
-            ret = pool.map(MultiExperiment.processEvaluation, paramsList)
-        
-        retData = []
-        while True:
-            try:
-                item = next(ret) # lst_iterator.__next__()
-                retData.append( item )
-            except StopIteration:
-                break
-        return retData
+        return list( self.pool.map(MultiExperiment.processEvaluation, paramsList) )
 
     @staticmethod
     def processEvaluation(params):
@@ -176,34 +508,280 @@ class MultiExperiment(ParallelExperiment):
         bestExp = self.experiments[ self.bestExperiment ]
         return bestExp.demonstrate()
 
+    def getState(self):
+        states = []
+        for exp in self.experiments:
+            states.append( exp.getState() )
+        return { "workers": states, "bestExperiment": self.bestExperiment }
+
+    def setState(self, state):
+        states = state["workers"]
+        assert len(states) == self.expNum, "number of stored workers differs from number of experiments"
+        for i in range(0, self.expNum):
+            self.experiments[i].setState( states[i] )
+        self.bestExperiment = state["bestExperiment"]
+
     def close(self):
         for exp in self.experiments:
             exp.close()
+        self.pool.shutdown()
+        if self.sharedBlocks is not None:
+            for block in self.sharedBlocks:
+                block.close()
+                block.unlink()
+            self.sharedBlocks = None
+        if self.metrics is not None:
+            self.metrics.close()
+            self.metrics.unlink()
+            self.metrics = None
 
     def _propagateBestResult(self):
         assert self.bestExperiment >= 0
-        bestExp = self.experiments[ self.bestExperiment ]
-        bestAgent = bestExp.getAgent()
+        bestAgent = self.callWorker( self.bestExperiment, "getAgent" )
+        if bestAgent is None:
+            ## best worker was respawned with parameters of previous round
+            return
         for i in range(0, self.expNum):
             if i == self.bestExperiment:
                 continue
-            exp = self.experiments[i]
-            agent = exp.getAgent()
+            agent = self.callWorker( i, "getAgent" )
+            if agent is None:
+                continue
             newAgent = self.copyAgentState(bestAgent, agent)
-            exp.setAgent( newAgent )
+            self.callWorker( i, "setAgent", newAgent )
+
+    def _createWorker(self, index):
+        factory = self.slotFactories[ index ]
+        cpus = None
+        if self.placement is not None:
+            cpus = self.placement[ index ]
+        if isinstance(factory, str):
+            ## import path is resolved by remote agent, so it can not be wrapped
+            assert cpus is None and self.threadsNumber is None and self.progress is None, \
+                   "placement, threadsNumber and progress are not supported for factory given by import path"
+            return self.workerFactory( factory )
+        if cpus is not None or self.threadsNumber is not None:
+            factory = PlacedFactory( factory, cpus, self.threadsNumber )
+        if self.progress is not None:
+            from pybraingym.progress import ProgressFactory
+            factory = ProgressFactory( factory, self.progress, index )
+        return self.workerFactory( factory )
+
+    def _mergeWorkersParameters(self):
+        paramsList = [ (self, i) for i in range(0, self.expNum) ]
+        results = list( self.pool.map(MultiExperiment.processMergeData, paramsList) )
+        paramsList = [ item[0] for item in results ]
+        visitsList = [ item[1] for item in results ]
+        merged = self.mergeParameters( paramsList, visitsList )
+        paramsList = []
+        for i in range(0, self.expNum):
+            paramsList.append( (self, i, merged) )
+        list( self.pool.map(MultiExperiment.processSetParameters, paramsList) )
+
+    @staticmethod
+    def processMergeData(params):
+        multiExperiment = params[0]
+        index = params[1]
+        parameters = multiExperiment.callWorker( index, "getParameters" )
+        if parameters is None:
+            ## worker was respawned -- take its restored parameters
+            parameters = multiExperiment.callWorker( index, "getParameters" )
+        visits = multiExperiment.callWorker( index, "getVisitCounts" )
+        return ( parameters, visits )
+
+    @staticmethod
+    def processSetParameters(params):
+        multiExperiment = params[0]
+        index = params[1]
+        parameters = params[2]
+        multiExperiment.callWorker( index, "setParameters", parameters )
+
+    def _shareParameters(self):
+        size = self.experiments[0].getParameters().size
+        self.sharedBlocks = []
+        from pybraingym.sharedparams import SharedParameters
+        for exp in self.experiments:
+            block = SharedParameters( size )
+            exp.shareParameters( block.name )
+            self.sharedBlocks.append( block )
+
+    def _shareMetrics(self):
+        from pybraingym.sharedparams import SharedMetrics
+        self.metrics = SharedMetrics( self.expNum )
+        for i in range(0, self.expNum):
+            self.experiments[i].shareMetrics( self.metrics.name, self.expNum, i )
+
+    def _shareTable(self):
+        ## each worker binds its module to the same block, values of last worker are kept
+        size = self.experiments[0].getParameters().size
+        from pybraingym.sharedparams import SharedParameters
+        block = SharedParameters( size )
+        for exp in self.experiments:
+            exp.shareParameters( block.name )
+        self.sharedBlocks = [ block ]
+
+    def _propagateSharedParameters(self):
+        assert self.bestExperiment >= 0
+        bestName = self.sharedBlocks[ self.bestExperiment ].name
+        paramsList = []
+        for i in range(0, self.expNum):
+            if i == self.bestExperiment:
+                continue
+            paramsList.append( (self, i, bestName) )
+        list( self.pool.map(MultiExperiment.processCopyParameters, paramsList) )
+
+    @staticmethod
+    def processCopyParameters(params):
+        multiExperiment = params[0]
+        index = params[1]
+        name = params[2]
+        multiExperiment.callWorker( index, "copyParameters", name )
             
 
-def createExperiment(experimentsNumber, createExperimentInstance, copyAgentState=None):
+def createExperiment(experimentsNumber, createExperimentInstance, copyAgentState=None, **kwargs):
+    """Create parallel experiment. Keyword arguments are passed to MultiExperiment."""
     if experimentsNumber == 1:
         exp = createExperimentInstance()
         return WrapperExperiment( exp )
     else:
-        return MultiExperiment( experimentsNumber, createExperimentInstance, copyAgentState )
+        return MultiExperiment( experimentsNumber, createExperimentInstance, copyAgentState, **kwargs )
 
 
-def executeExperiments(multiExperiment, rounds, epochs_per_round):
+def executeExperiments(multiExperiment, rounds, epochs_per_round, checkpointer=None, progress=None):
+    """Execute rounds of experiment. If ProgressAggregator is given, then throughput is printed as well."""
+    totalSteps = 0
+    if checkpointer is not None:
+        ## resumed run continues steps counter of restored checkpoint
+        totalSteps = checkpointer.steps
     for i in range(1, rounds + 1):
         multiExperiment.doExperiment(epochs_per_round, False)
         bestExp = multiExperiment.getBestExperiment()
         rate = bestExp.getQualityRate()
-        print("Round ended: %i/%i best rate: %f" % (i, rounds, rate) )
+        if progress is None:
+            print("Round ended: %i/%i best rate: %f" % (i, rounds, rate) )
+        else:
+            episodesRate, stepsRate = progress.getThroughput()
+            print("Round ended: %i/%i best rate: %f mean reward: %f episodes/s: %f steps/s: %f" %
+                  (i, rounds, rate, progress.getMeanReward(), episodesRate, stepsRate) )
+        if checkpointer is not None:
+            ## steps are counted only if needed -- it can cost call of every worker
+            totalSteps += multiExperiment.getStepsCount()
+            checkpointer.update( multiExperiment, totalSteps )
+
+
+def executeBalancedExperiments(multiExperiment, rounds, steps_per_round, chunk_size=1, checkpointer=None):
+    """Execute rounds of experiment, each round uses given number of steps of all workers together."""
+    totalSteps = 0
+    if checkpointer is not None:
+        ## resumed run continues steps counter of restored checkpoint
+        totalSteps = checkpointer.steps
+    for i in range(1, rounds + 1):
+        multiExperiment.doBalancedExperiment(steps_per_round, chunk_size, False)
+        ## steps of balanced round are already gathered in 'roundSteps'
+        roundSteps = sum( multiExperiment.roundSteps )
+        totalSteps += roundSteps
+        bestExp = multiExperiment.getBestExperiment()
+        rate = bestExp.getQualityRate()
+        print("Round ended: %i/%i steps: %i episodes: %s best rate: %f" % (i, rounds, roundSteps,
+                                                                         multiExperiment.roundEpisodes, rate) )
+        if checkpointer is not None:
+            checkpointer.update( multiExperiment, totalSteps )
+
+
+class BudgetScheduler:
+    """Calculates number of episodes of consecutive rounds to fit in budget.
+
+       Budget is given as total number of environment steps and/or wall time
+       in seconds. If 'roundTime' is given, then rounds are sized to take
+       approximately given number of seconds. Size of next round is
+       estimated from duration and steps of previous round.
+    """
+
+    def __init__(self, maxSteps=None, maxTime=None, roundTime=None, initialEpisodes=10):
+        if maxSteps is None and maxTime is None:
+            raise AssertionError("invalid parameters: maxSteps or maxTime has to be given")
+        if initialEpisodes < 1:
+            raise AssertionError("invalid parameter: initialEpisodes - it has to be greater than 0")
+        self.maxSteps = maxSteps
+        self.maxTime = maxTime
+        self.roundTime = roundTime
+        self.initialEpisodes = initialEpisodes
+        self.startTime = time.time()
+        self.steps = 0
+        self.episodes = 0
+        self.rounds = 0
+        self.stepsPerEpisode = None
+        self.timePerEpisode = None
+
+    def start(self):
+        self.startTime = time.time()
+
+    def elapsedTime(self):
+        return time.time() - self.startTime
+
+    def isExhausted(self):
+        if self.maxSteps is not None and self.steps >= self.maxSteps:
+            return True
+        if self.maxTime is not None and self.elapsedTime() >= self.maxTime:
+            return True
+        return False
+
+    def nextRound(self):
+        """Return number of episodes of next round or 0 if budget is exhausted."""
+        if self.isExhausted():
+            return 0
+        if self.timePerEpisode is None:
+            return self.initialEpisodes
+        episodes = self.initialEpisodes
+        if self.roundTime is not None:
+            episodes = self.roundTime / self.timePerEpisode
+        if self.maxTime is not None:
+            remainingTime = self.maxTime - self.elapsedTime()
+            episodes = min( episodes, remainingTime / self.timePerEpisode )
+        if self.maxSteps is not None and self.stepsPerEpisode > 0:
+            remainingSteps = self.maxSteps - self.steps
+            episodes = min( episodes, remainingSteps / self.stepsPerEpisode )
+        return max( int( round(episodes) ), 1 )
+
+    def update(self, episodes, steps, duration):
+        """Store measurements of finished round. Steps can be None if they are not counted."""
+        self.rounds += 1
+        self.episodes += episodes
+        if steps is not None:
+            self.steps += steps
+        if episodes > 0:
+            if steps is not None:
+                self.stepsPerEpisode = steps / episodes
+            self.timePerEpisode = max( duration, 1e-9 ) / episodes
+
+
+def executeBudgetExperiments(multiExperiment, maxSteps=None, maxTime=None, roundTime=None, initialEpisodes=10, checkpointer=None):
+    """Execute rounds of experiments until budget of steps or time is exhausted.
+
+       Number of episodes is given per worker, steps are counted for all
+       workers. Returns scheduler containing totals of execution.
+    """
+    scheduler = BudgetScheduler( maxSteps, maxTime, roundTime, initialEpisodes )
+    scheduler.start()
+    baseSteps = 0
+    if checkpointer is not None:
+        ## resumed run continues steps counter of restored checkpoint
+        baseSteps = checkpointer.steps
+    while True:
+        episodes = scheduler.nextRound()
+        if episodes < 1:
+            break
+        roundStart = time.time()
+        multiExperiment.doExperiment(episodes, False)
+        duration = time.time() - roundStart
+        steps = None
+        if maxSteps is not None or checkpointer is not None:
+            ## steps are counted only if needed -- it can cost call of every worker
+            steps = multiExperiment.getStepsCount()
+        scheduler.update( episodes, steps, duration )
+        bestExp = multiExperiment.getBestExperiment()
+        rate = bestExp.getQualityRate()
+        print("Round ended: %i episodes: %i steps: %i/%s time: %f best rate: %f" % (scheduler.rounds, episodes, scheduler.steps, maxSteps, scheduler.elapsedTime(), rate) )
+        if checkpointer is not None:
+            checkpointer.update( multiExperiment, baseSteps + scheduler.steps )
+    return scheduler
@@ -23,10 +23,17 @@
 
 
 from pybraingym.experiment import doEpisode, processLastReward, evaluate
+from pybraingym.checkpoint import getExperimentState, setExperimentState, getHyperParameters, setHyperParameters
+from pybraingym.sharedparams import SharedParameters, SharedMetrics
+from pybraingym.transfer import encodeRows, applyRows, parametersRows
 from multiprocessing.managers import BaseManager
 from multiprocessing import Value
 
 import abc
+import time
+import multiprocessing
+import threading
+import numpy as np
 
 
 class AbstractExperimentWorker(metaclass=abc.ABCMeta):
@@ -63,6 +70,62 @@ class AbstractExperimentWorker(metaclass=abc.ABCMeta):
     def demonstrate(self):
         raise NotImplementedError('You need to define this method in derived class!')
 
+    ## methods below are not abstract, so workers derived for older versions can still be created,
+    ## default implementations fall back to 'getAgent()' and 'setAgent()' where possible
+
+    def getStepsCount(self):
+        raise NotImplementedError('You need to define this method in derived class!')
+
+    def getParameters(self):
+        return np.array( self.getAgent().module.params )
+
+    def setParameters(self, params):
+        agent = self.getAgent()
+        np.copyto( agent.module.params, params )
+        self.setAgent( agent )
+
+    def shareParameters(self, name):
+        raise NotImplementedError('Worker does not support shared memory')
+
+    def shareMetrics(self, name, size, index):
+        raise NotImplementedError('Worker does not support shared memory')
+
+    def copyParameters(self, name):
+        raise NotImplementedError('Worker does not support shared memory')
+
+    def getHyperParameters(self):
+        return getHyperParameters( self.getAgent() )
+
+    def setHyperParameters(self, params):
+        agent = self.getAgent()
+        setHyperParameters( agent, params )
+        self.setAgent( agent )
+
+    def getVisitCounts(self):
+        ## visits are not counted
+        return None
+
+    def getDirtyRows(self):
+        ## changed rows are not tracked, so whole table is transferred
+        return None
+
+    def getRows(self, rows, dtype=None, compress=True):
+        return encodeRows( parametersRows( self.getAgent().module ), rows, dtype, compress )
+
+    def setRows(self, delta):
+        agent = self.getAgent()
+        applyRows( parametersRows( agent.module ), delta )
+        self.setAgent( agent )
+
+    def getState(self):
+        raise NotImplementedError('You need to define this method in derived class!')
+
+    def setState(self, state):
+        raise NotImplementedError('You need to define this method in derived class!')
+
+    def isAlive(self):
+        return True
+
     @abc.abstractmethod
     def close(self):
         raise NotImplementedError('You need to define this method in derived class!')
@@ -84,6 +147,14 @@ class ProcessExperimentWorker(AbstractExperimentWorker):
         self.experimentExecutor = doSingleExperiment
         self.qualityFunctor = qualityFunctor
         self.qualityRate = 0
+        self.episodesCounter = 0
+        self.stepsCounter = 0
+        self.checkpointer = None
+        self.progress = None
+        self.sharedParams = None
+        self.sharedBlocks = dict()
+        self.sharedMetrics = None
+        self.metrics = None                 ## row of shared metrics table
 
     def getId(self):
         return self.objId
@@ -93,6 +164,8 @@ class ProcessExperimentWorker(AbstractExperimentWorker):
 
     def setAgent(self, newAgent):
         self.exp.agent = newAgent
+        if self.sharedParams is not None:
+            self.sharedParams.bind( newAgent.module )
 
     def getExecutor(self):
         return self.experimentExecutor
@@ -100,8 +173,20 @@ class ProcessExperimentWorker(AbstractExperimentWorker):
     def getQuality(self):
         return self.qualityFunctor
 
+    def setCheckpointer(self, checkpointer):
+        """Set Checkpointer storing state of worker after episodes."""
+        self.checkpointer = checkpointer
+
+    def setProgress(self, reporter):
+        """Set ProgressReporter receiving record of every episode."""
+        self.progress = reporter
+
     def doExperiment( self, number=1, render_steps=False ):
+        """Execute 'number' episodes and return number of environment steps performed."""
         self.cumulativeReward = 0
+        startStep = self.exp.stepid
+        if self.metrics is not None:
+            self.metrics["startTime"] = time.time()
         for i in range(1, number+1):
             self.experimentExecutor( self, i, render_steps )
             task = self.exp.task
@@ -110,7 +195,19 @@ class ProcessExperimentWorker(AbstractExperimentWorker):
             if self.qualityFunctor is not None:
                 self.qualityRate = self.qualityFunctor( i, reward )
             else:
-                self.qualityRate = self.cumulativeReward 
+                ## mean reward of episodes of the call, so calls of different length are comparable
+                self.qualityRate = self.cumulativeReward / i
+            self.episodesCounter += 1
+            if self.metrics is not None:
+                self._updateMetrics( reward, self.exp.stepid - startStep )
+            if self.progress is not None:
+                self.progress.report( self.episodesCounter, reward, self.exp.stepid )
+            if self.checkpointer is not None:
+                self.checkpointer.update( self, self.exp.stepid )
+        self.stepsCounter = self.exp.stepid - startStep
+        if self.progress is not None:
+            self.progress.flush()
+        return self.stepsCounter
 
     def getReward(self):
         task = self.exp.task
@@ -122,6 +219,10 @@ class ProcessExperimentWorker(AbstractExperimentWorker):
     def getQualityRate(self):
         return self.qualityRate
 
+    def getStepsCount(self):
+        """Return number of environment steps performed by last call of doExperiment()."""
+        return self.stepsCounter
+
     def evaluate(self, number=1):
         return evaluate( self.exp, number )
 
@@ -129,6 +230,105 @@ class ProcessExperimentWorker(AbstractExperimentWorker):
         self.doExperiment(1, True)
         return self.getCumulativeReward()
 
+    def getParameters(self):
+        return np.array( self.exp.agent.module.params )
+
+    def setParameters(self, params):
+        np.copyto( self.exp.agent.module.params, params )
+
+    def shareParameters(self, name):
+        """Move parameters of agent's module to shared memory block of given name."""
+        self.sharedParams = self._attachBlock( name )
+        self.sharedParams.bind( self.exp.agent.module )
+
+    def shareMetrics(self, name, size, index):
+        """Store metrics of worker in given row of shared metrics table (see SharedMetrics)."""
+        if self.sharedMetrics is not None:
+            self.metrics = None             ## view has to be released before closing block
+            self.sharedMetrics.close()
+        self.sharedMetrics = SharedMetrics( size, name )
+        self.metrics = self.sharedMetrics.getRow( index )
+        self.metrics["startTime"] = time.time()
+        self._updateMetrics( self.getReward(), self.stepsCounter )
+
+    def _updateMetrics(self, reward, roundSteps):
+        metrics = self.metrics
+        metrics["episodes"] = self.episodesCounter
+        metrics["steps"] = self.exp.stepid
+        metrics["roundSteps"] = roundSteps
+        metrics["reward"] = reward
+        metrics["quality"] = self.qualityRate
+        metrics["updateTime"] = time.time()
+
+    def copyParameters(self, name):
+        """Copy parameters from shared memory block of given name to agent's module."""
+        block = self._attachBlock( name )
+        block.copyTo( self.exp.agent.module )
+
+    def _attachBlock(self, name):
+        block = self.sharedBlocks.get( name, None )
+        if block is None:
+            size = self.exp.agent.module.params.size
+            block = SharedParameters( size, name )
+            self.sharedBlocks[ name ] = block
+        return block
+
+    def getHyperParameters(self):
+        return getHyperParameters( self.exp.agent )
+
+    def setHyperParameters(self, params):
+        setHyperParameters( self.exp.agent, params )
+
+    def getVisitCounts(self):
+        """Return copy of states visit counts of agent's module or None if module does not count them."""
+        visits = getattr( self.exp.agent.module, "stateArray", None )
+        if visits is None:
+            return None
+        return np.array( visits )
+
+    def getDirtyRows(self):
+        """Return indexes of rows changed since last call of 'setRows()' or None if module does not track them."""
+        dirty = getattr( self.exp.agent.module, "dirtyRows", None )
+        if dirty is None:
+            return None
+        return np.flatnonzero( dirty )
+
+    def getRows(self, rows, dtype=None, compress=True):
+        """Return delta of given rows of parameters (see transfer.encodeRows())."""
+        return encodeRows( parametersRows( self.exp.agent.module ), rows, dtype, compress )
+
+    def setRows(self, delta):
+        """Apply delta of rows to parameters and clear changed rows."""
+        module = self.exp.agent.module
+        applyRows( parametersRows( module ), delta )
+        if hasattr(module, "clearDirtyRows"):
+            module.clearDirtyRows()
+
+    def getState(self):
+        state = getExperimentState( self.exp )
+        state["episodes"] = self.episodesCounter
+        state["cumulativeReward"] = self.cumulativeReward
+        state["qualityRate"] = self.qualityRate
+        state["quality"] = self.qualityFunctor
+        return state
+
+    def setState(self, state):
+        setExperimentState( self.exp, state )
+        self.episodesCounter = state["episodes"]
+        self.cumulativeReward = state["cumulativeReward"]
+        self.qualityRate = state["qualityRate"]
+        self.qualityFunctor = state["quality"]
+        if hasattr(self.qualityFunctor, "setExperiment"):
+            self.qualityFunctor.setExperiment( self.exp )
+        if self.metrics is not None:
+            self._updateMetrics( self.getReward(), self.stepsCounter )
+        if self.progress is not None:
+            ## restored steps are not progress of worker
+            self.progress.baseSteps = self.exp.stepid
+
+    def isAlive(self):
+        return True
+
     def close(self):
         self.exp.task.close()
 
@@ -150,13 +350,19 @@ class ProcessExperimentWorker(AbstractExperimentWorker):
 ## ===========================================================================
 
 
+## registry of BaseManager is shared by all managers
+_registryLock = threading.Lock()
+
+
 class ManagedExperimentWorker(AbstractExperimentWorker):
 
-    def __init__(self, createExperimentInstance):
+    def __init__(self, createExperimentInstance, context=None):
         AbstractExperimentWorker.__init__( self )
-        self.manager = BaseManager()
-        self.manager.register( 'createExperiment', createExperimentInstance )
-        self.manager.start()
+        self.manager = BaseManager( ctx=context )
+        with _registryLock:
+            ## server receives registry on start, so other thread can not replace factory before it
+            self.manager.register( 'createExperiment', createExperimentInstance )
+            self.manager.start()
         self.exp = self.manager.createExperiment()
 
     def getAgent(self):
@@ -166,7 +372,7 @@ class ManagedExperimentWorker(AbstractExperimentWorker):
         self.exp.setAgent( newAgent )
 
     def doExperiment(self, number=1, render_steps=False):
-        self.exp.doExperiment( number, render_steps )
+        return self.exp.doExperiment( number, render_steps )
 
     def getReward(self):
         return self.exp.getReward()
@@ -177,11 +383,273 @@ class ManagedExperimentWorker(AbstractExperimentWorker):
     def getQualityRate(self):
         return self.exp.getQualityRate()
 
+    def getStepsCount(self):
+        return self.exp.getStepsCount()
+
     def evaluate(self, number=1):
         return self.exp.evaluate( number )
 
     def demonstrate(self):
         return self.exp.demonstrate()
 
+    def getParameters(self):
+        return self.exp.getParameters()
+
+    def setParameters(self, params):
+        self.exp.setParameters( params )
+
+    def shareParameters(self, name):
+        self.exp.shareParameters( name )
+
+    def shareMetrics(self, name, size, index):
+        self.exp.shareMetrics( name, size, index )
+
+    def copyParameters(self, name):
+        self.exp.copyParameters( name )
+
+    def getHyperParameters(self):
+        return self.exp.getHyperParameters()
+
+    def setHyperParameters(self, params):
+        self.exp.setHyperParameters( params )
+
+    def getVisitCounts(self):
+        return self.exp.getVisitCounts()
+
+    def getDirtyRows(self):
+        return self.exp.getDirtyRows()
+
+    def getRows(self, rows, dtype=None, compress=True):
+        return self.exp.getRows( rows, dtype, compress )
+
+    def setRows(self, delta):
+        self.exp.setRows( delta )
+
+    def getState(self):
+        return self.exp.getState()
+
+    def setState(self, state):
+        self.exp.setState( state )
+
+    def setCheckpointer(self, checkpointer):
+        self.exp.setCheckpointer( checkpointer )
+
+    def isAlive(self):
+        """Check if manager process is running."""
+        process = getattr( self.manager, "_process", None )
+        return process is not None and process.is_alive()
+
     def close(self):
         self.exp.close()
+
+
+
+## ===========================================================================
+
+
+def serveWorker(connection, worker):
+    """Execute commands received through connection on given worker.
+
+       Each request is tuple (command, arguments). Each response is tuple
+       (status, value, results), where results contain summary of worker
+       (quality rate, rewards and steps), so client does not need separate
+       calls to get them.
+    """
+    while True:
+        try:
+            command, args = connection.recv()
+        except EOFError:
+            break
+        try:
+            value = getattr(worker, command)( *args )
+            connection.send( ("ok", value, workerResults(worker)) )
+        except Exception as exc:
+            connection.send( ("error", exc, None) )
+        if command == "close":
+            break
+
+
+def workerResults(worker):
+    return { "quality": worker.getQualityRate(),
+             "cumulativeReward": worker.getCumulativeReward(),
+             "reward": worker.getReward(),
+             "steps": worker.getStepsCount() }
+
+
+class ConnectionProxy:
+    """Forwards any method call to worker on other side of connection."""
+
+    def __init__(self, client):
+        self._client = client
+
+    def __getattr__(self, attr):
+        def call(*args):
+            return self._client.call( attr, *args )
+        return call
+
+
+class ConnectionExperimentWorker(AbstractExperimentWorker):
+    """Base class of workers communicating with ProcessExperimentWorker through connection.
+
+       Summary of worker is received with every response and cached, so
+       quality rate, rewards and steps count are read without communication.
+    """
+
+    def __init__(self, connection=None):
+        AbstractExperimentWorker.__init__( self )
+        self.connection = connection
+        self.lock = threading.Lock()
+        self.results = None
+        self.exp = ConnectionProxy( self )
+
+    def call(self, command, *args):
+        with self.lock:
+            if self.connection is None:
+                raise EOFError("connection to worker is closed")
+            try:
+                self.connection.send( (command, args) )
+                self._waitResponse()
+                status, value, results = self.connection.recv()
+            except (EOFError, OSError):
+                ## other side is dead -- connection is unusable
+                self.connection.close()
+                self.connection = None
+                raise
+        if status != "ok":
+            raise value
+        self.results = results
+        return value
+
+    def _waitResponse(self):
+        """Wait for response of worker. Derived class can check meanwhile if worker is alive."""
+        pass
+
+    def getAgent(self):
+        return self.call( "getAgent" )
+
+    def setAgent(self, newAgent):
+        self.call( "setAgent", newAgent )
+
+    def doExperiment(self, number=1, render_steps=False):
+        return self.call( "doExperiment", number, render_steps )
+
+    def getReward(self):
+        return self.results["reward"]
+
+    def getCumulativeReward(self):
+        return self.results["cumulativeReward"]
+
+    def getQualityRate(self):
+        return self.results["quality"]
+
+    def getStepsCount(self):
+        return self.results["steps"]
+
+    def evaluate(self, number=1):
+        return self.call( "evaluate", number )
+
+    def demonstrate(self):
+        return self.call( "demonstrate" )
+
+    def getParameters(self):
+        return self.call( "getParameters" )
+
+    def setParameters(self, params):
+        self.call( "setParameters", params )
+
+    def shareParameters(self, name):
+        self.call( "shareParameters", name )
+
+    def shareMetrics(self, name, size, index):
+        self.call( "shareMetrics", name, size, index )
+
+    def copyParameters(self, name):
+        self.call( "copyParameters", name )
+
+    def getHyperParameters(self):
+        return self.call( "getHyperParameters" )
+
+    def setHyperParameters(self, params):
+        self.call( "setHyperParameters", params )
+
+    def getVisitCounts(self):
+        return self.call( "getVisitCounts" )
+
+    def getDirtyRows(self):
+        return self.call( "getDirtyRows" )
+
+    def getRows(self, rows, dtype=None, compress=True):
+        return self.call( "getRows", rows, dtype, compress )
+
+    def setRows(self, delta):
+        self.call( "setRows", delta )
+
+    def getState(self):
+        return self.call( "getState" )
+
+    def setState(self, state):
+        self.call( "setState", state )
+
+    def setCheckpointer(self, checkpointer):
+        self.call( "setCheckpointer", checkpointer )
+
+    def isAlive(self):
+        return self.connection is not None
+
+    def close(self):
+        if self.connection is None:
+            return
+        try:
+            self.call( "close" )
+        finally:
+            if self.connection is not None:
+                self.connection.close()
+                self.connection = None
+
+
+def _pipeWorkerMain(connection, createExperimentInstance):
+    try:
+        worker = createExperimentInstance()
+        connection.send( ("ok", None, workerResults(worker)) )
+    except Exception as exc:
+        connection.send( ("error", exc, None) )
+        return
+    serveWorker( connection, worker )
+
+
+class PipeExperimentWorker(ConnectionExperimentWorker):
+    """Worker running experiment in separate process, communicating through duplex pipe.
+
+       Each method call is single message round trip, comparing to
+       ManagedExperimentWorker, where every call is handled by manager
+       server with separate thread.
+    """
+
+    def __init__(self, createExperimentInstance, context=None):
+        """Class constructor.
+
+        Arguments:
+        createExperimentInstance -- function creating ProcessExperimentWorker in worker's process
+        context -- multiprocessing context starting worker's process (default context if None)
+        """
+        if context is None:
+            context = multiprocessing.get_context()
+        parentConnection, childConnection = context.Pipe()
+        ConnectionExperimentWorker.__init__( self, parentConnection )
+        self.process = context.Process( target=_pipeWorkerMain, args=(childConnection, createExperimentInstance), daemon=True )
+        self.process.start()
+        childConnection.close()
+        status, value, results = self.connection.recv()
+        if status != "ok":
+            self.process.join()
+            raise value
+        self.results = results
+
+    def isAlive(self):
+        return self.connection is not None and self.process.is_alive()
+
+    def close(self):
+        try:
+            ConnectionExperimentWorker.close( self )
+        finally:
+            self.process.join()
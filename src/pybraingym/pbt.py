@@ -0,0 +1,139 @@
+# MIT License
+#
+# Copyright (c) 2019 Arkadiusz Netczuk <dev.arnet@gmail.com>
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+
+
+import random
+import numpy as np
+
+
+DEFAULT_BOUNDS = { "alpha": (0.0001, 1.0),
+                   "gamma": (0.0, 1.0),
+                   "epsilon": (0.0, 1.0),
+                   "decay": (0.0, 1.0) }
+
+
+class PopulationBasedTraining:
+    """Population based training of hyperparameters of MultiExperiment's workers.
+
+       After each round workers are ranked by quality rate. Each of the
+       bottom 'fraction' of workers copies parameters of one of the top
+       'fraction' of workers (exploit) and takes its hyperparameters
+       multiplied by randomly chosen perturbation factor (explore).
+       MultiExperiment should be created without 'copyAgentState', so
+       parameters are propagated only by this class.
+    """
+
+    def __init__(self, multiExperiment, fraction=0.25, perturbations=(0.8, 1.2),
+                 hyperParameters=("alpha", "epsilon"), bounds=None, seed=None):
+        self.multiExperiment = multiExperiment
+        self.fraction = fraction
+        self.perturbations = perturbations
+        self.hyperParameters = hyperParameters
+        self.bounds = DEFAULT_BOUNDS.copy()
+        if bounds is not None:
+            self.bounds.update( bounds )
+        self.random = random.Random( seed )
+        self.round = 0
+        self.lineage = []                       ## list of exploit events
+        self.trajectories = []                  ## hyperparameters and rates of all workers after each round
+
+    def explore(self, hyperParams):
+        """Return copy of hyperparameters with perturbed values."""
+        ret = dict( hyperParams )
+        for name in self.hyperParameters:
+            if name not in ret:
+                continue
+            value = ret[ name ] * self.random.choice( self.perturbations )
+            bounds = self.bounds.get( name, None )
+            if bounds is not None:
+                value = min( max( value, bounds[0] ), bounds[1] )
+            ret[ name ] = value
+        return ret
+
+    def randomize(self):
+        """Perturb initial hyperparameters of every worker to diversify population."""
+        multiExperiment = self.multiExperiment
+        for i in range(0, multiExperiment.expNum):
+            hyperParams = multiExperiment.callWorker( i, "getHyperParameters" )
+            if hyperParams is None:
+                ## worker was respawned
+                continue
+            multiExperiment.callWorker( i, "setHyperParameters", self.explore( hyperParams ) )
+
+    def step(self):
+        """Perform exploit and explore on results of last round."""
+        self.round += 1
+        ## calls are made by MultiExperiment, so dead workers are respawned if enabled
+        multiExperiment = self.multiExperiment
+        size = multiExperiment.expNum
+        rates = np.full( size, -np.inf )
+        hyperParams = []
+        for i in range(0, size):
+            rate = multiExperiment.callWorker( i, "getQualityRate" )
+            if rate is not None:
+                rates[i] = rate
+            hyperParams.append( multiExperiment.callWorker( i, "getHyperParameters" ) or dict() )
+        self.trajectories.append( { "round": self.round, "rates": rates.tolist(), "hyperParameters": hyperParams } )
+
+        count = min( max( int( round(size * self.fraction) ), 1 ), size // 2 )
+        if count < 1:
+            return
+        order = np.argsort( rates, kind="stable" )
+        bottom = order[ :count ]
+        top = order[ size - count: ]
+        winnersParams = dict()
+        for loser in bottom:
+            winner = int( self.random.choice( top ) )
+            params = winnersParams.get( winner, None )
+            if params is None:
+                params = multiExperiment.callWorker( winner, "getParameters" )
+                if params is None:
+                    ## winner died and was respawned with parameters of previous round
+                    continue
+                winnersParams[ winner ] = params
+            newHyper = self.explore( hyperParams[ winner ] )
+            multiExperiment.callWorker( loser, "setParameters", params )
+            multiExperiment.callWorker( loser, "setHyperParameters", newHyper )
+            self.lineage.append( { "round": self.round,
+                                   "worker": int( loser ),
+                                   "parent": winner,
+                                   "rate": float( rates[ loser ] ),
+                                   "parentRate": float( rates[ winner ] ),
+                                   "hyperParameters": newHyper } )
+
+    def execute(self, rounds, episodes):
+        for i in range(1, rounds + 1):
+            self.multiExperiment.doExperiment( episodes, False )
+            self.step()
+            rate = max( self.trajectories[-1]["rates"] )
+            print("Round ended: %i/%i best rate: %f" % (i, rounds, rate) )
+
+    def getLineage(self, worker):
+        """Return list of ancestors of worker's current parameters, starting from the closest one."""
+        ret = []
+        current = worker
+        for event in reversed( self.lineage ):
+            if event["worker"] == current:
+                ret.append( event["parent"] )
+                current = event["parent"]
+        return ret
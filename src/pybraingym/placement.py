@@ -0,0 +1,146 @@
+# MIT License
+#
+# Copyright (c) 2019 Arkadiusz Netczuk <dev.arnet@gmail.com>
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+
+
+import os
+import sys
+
+
+## variables read by BLAS and OpenMP libraries when they are loaded
+THREADS_VARIABLES = [ "OMP_NUM_THREADS",
+                      "OPENBLAS_NUM_THREADS",
+                      "MKL_NUM_THREADS",
+                      "BLIS_NUM_THREADS",
+                      "VECLIB_MAXIMUM_THREADS",
+                      "NUMEXPR_NUM_THREADS" ]
+
+
+def setThreadsVariables(threadsNumber=1):
+    """Set environment variables limiting threads of BLAS and OpenMP libraries.
+
+       Variables take effect only in processes loading the libraries
+       later, e.g. processes started afterwards by 'spawn' or 'forkserver'
+       method. Forked processes inherit libraries already loaded.
+    """
+    value = str( threadsNumber )
+    for name in THREADS_VARIABLES:
+        os.environ[ name ] = value
+
+
+def hasThreadsControl():
+    """Check if 'threadpoolctl' package limiting libraries already loaded is available."""
+    try:
+        import threadpoolctl            # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def limitThreads(threadsNumber=1):
+    """Limit number of threads of BLAS and OpenMP libraries.
+
+       Environment variables take effect only if they are set before
+       library is loaded (before first import of NumPy in the process),
+       so in case of 'fork' start method the function should be called
+       at the beginning of main script. If 'threadpoolctl' package is
+       available, then libraries already loaded are limited as well.
+       Returns False if limit could not be applied to loaded libraries.
+    """
+    setThreadsVariables( threadsNumber )
+    try:
+        from threadpoolctl import threadpool_limits
+    except ImportError:
+        return "numpy" not in sys.modules
+    threadpool_limits( limits=threadsNumber )
+    return True
+
+
+def blasThreads():
+    """Return dict of number of threads of each loaded BLAS/OpenMP library or None if 'threadpoolctl' is not available."""
+    try:
+        from threadpoolctl import threadpool_info
+    except ImportError:
+        return None
+    ret = dict()
+    for info in threadpool_info():
+        ret[ info["internal_api"] ] = info["num_threads"]
+    return ret
+
+
+def availableCpus():
+    """Return sorted list of CPUs the process is allowed to run on."""
+    if hasattr(os, "sched_getaffinity"):
+        return sorted( os.sched_getaffinity(0) )
+    return list( range(0, os.cpu_count() or 1) )
+
+
+def planPlacement(workersNumber, cpus=None):
+    """Return list of sets of CPUs, one set for each worker.
+
+       If there are enough CPUs, then they are split into disjoint
+       contiguous sets of (almost) equal size. Otherwise each worker gets
+       single CPU assigned in round robin manner.
+    """
+    if cpus is None:
+        cpus = availableCpus()
+    cpus = sorted( cpus )
+    assert len(cpus) > 0
+    assert workersNumber > 0
+    if workersNumber >= len(cpus):
+        return [ [ cpus[ i % len(cpus) ] ] for i in range(0, workersNumber) ]
+    ret = []
+    size, rest = divmod( len(cpus), workersNumber )
+    start = 0
+    for i in range(0, workersNumber):
+        end = start + size + (1 if i < rest else 0)
+        ret.append( cpus[ start:end ] )
+        start = end
+    return ret
+
+
+def setAffinity(cpus):
+    """Pin current process to given CPUs. Return False if not supported by platform."""
+    if not hasattr(os, "sched_setaffinity"):
+        return False
+    os.sched_setaffinity( 0, cpus )
+    return True
+
+
+class PlacedFactory:
+    """Wrapper of experiment factory applying placement in worker process.
+
+       Worker's process is pinned to given CPUs and threads of BLAS
+       libraries are limited before original factory is called.
+    """
+
+    def __init__(self, createExperimentInstance, cpus=None, threadsNumber=None):
+        self.createExperimentInstance = createExperimentInstance
+        self.cpus = cpus
+        self.threadsNumber = threadsNumber
+
+    def __call__(self):
+        if self.threadsNumber is not None:
+            limitThreads( self.threadsNumber )
+        if self.cpus is not None:
+            setAffinity( self.cpus )
+        return self.createExperimentInstance()
@@ -0,0 +1,249 @@
+# MIT License
+#
+# Copyright (c) 2019 Arkadiusz Netczuk <dev.arnet@gmail.com>
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+
+
+import time
+import queue
+import threading
+import multiprocessing
+
+from pybraingym.stats import RollingSum
+
+
+## Record of single episode is tuple: (worker index, episode number, episode reward, worker's steps counter, time).
+## Batch is tuple: (number of records dropped since previous batch, list of records).
+
+
+class ProgressChannel:
+    """Bounded queue passing records of episodes from workers to coordinator.
+
+       Records are sent in batches. If queue is full, then batch is dropped
+       instead of blocking worker and number of dropped records is sent with
+       next batch. Channel has to be created before workers (it is inherited
+       by worker processes).
+    """
+
+    def __init__(self, maxSize=1000, batchSize=100):
+        self.queue = multiprocessing.Queue( maxSize )
+        self.batchSize = batchSize
+
+    def reporter(self, workerIndex, baseSteps=0):
+        return ProgressReporter( self.queue, workerIndex, self.batchSize, baseSteps )
+
+    def get(self, timeout=None):
+        """Return next batch of records or None if there is no data."""
+        try:
+            return self.queue.get( timeout=timeout )
+        except queue.Empty:
+            return None
+
+    def close(self):
+        self.queue.close()
+        self.queue.join_thread()
+
+
+class ProgressReporter:
+    """Worker side of ProgressChannel.
+
+       Steps counter of records is counted from 'baseSteps', so steps made
+       before reporter was attached (e.g. restored from checkpoint) are
+       not reported.
+    """
+
+    def __init__(self, channelQueue, workerIndex, batchSize=100, baseSteps=0):
+        self.queue = channelQueue
+        self.workerIndex = workerIndex
+        self.batchSize = batchSize
+        self.baseSteps = baseSteps
+        self.buffer = []
+        self.dropped = 0                        ## all dropped records
+        self.unreported = 0                     ## dropped records not yet sent to coordinator
+
+    def report(self, episode, reward, steps):
+        self.buffer.append( (self.workerIndex, episode, reward, steps - self.baseSteps, time.time()) )
+        if len(self.buffer) >= self.batchSize:
+            self.flush()
+
+    def flush(self):
+        if len(self.buffer) < 1:
+            return
+        try:
+            self.queue.put_nowait( (self.unreported, self.buffer) )
+            self.unreported = 0
+        except queue.Full:
+            self.dropped += len(self.buffer)
+            self.unreported += len(self.buffer)
+        self.buffer = []
+
+
+class ProgressFactory:
+    """Wrapper of experiment factory attaching reporter of channel to created worker."""
+
+    def __init__(self, createExperimentInstance, channel, workerIndex):
+        self.createExperimentInstance = createExperimentInstance
+        self.channel = channel
+        self.workerIndex = workerIndex
+
+    def __call__(self):
+        worker = self.createExperimentInstance()
+        worker.setProgress( self.channel.reporter( self.workerIndex, worker.exp.stepid ) )
+        return worker
+
+
+class ProgressAggregator:
+    """Collects records from ProgressChannel in background thread.
+
+       Calculates throughput and learning curves (mean reward of last
+       'window' episodes stored every 'curvePeriod' episodes of each
+       worker). Callbacks are called with aggregator and each record.
+       Throughput counts only episodes and steps received after start().
+    """
+
+    def __init__(self, channel, window=100, curvePeriod=100):
+        self.channel = channel
+        self.window = window
+        self.curvePeriod = curvePeriod
+        self.callbacks = []
+        self.lock = threading.Lock()
+        self.episodes = dict()                  ## worker: number of received episodes
+        self.steps = dict()                     ## worker: number of received steps
+        self.counters = dict()                  ## worker: last steps counter
+        self.baseEpisodes = dict()              ## worker: number of episodes received before start()
+        self.baseSteps = dict()                 ## worker: number of steps received before start()
+        self.dropped = 0
+        self.rewards = dict()                   ## worker: RollingSum
+        self.curves = dict()                    ## worker: list of (episode, mean reward)
+        self.startTime = None
+        self.stopped = threading.Event()
+        self.thread = None
+
+    def addCallback(self, callback):
+        self.callbacks.append( callback )
+
+    def start(self):
+        with self.lock:
+            self.baseEpisodes = dict( self.episodes )
+            self.baseSteps = dict( self.steps )
+        self.startTime = time.time()
+        self.stopped.clear()
+        self.thread = threading.Thread( target=self._receive, daemon=True )
+        self.thread.start()
+
+    def stop(self):
+        """Stop receiving thread and process batches remaining in channel."""
+        self.stopped.set()
+        if self.thread is not None:
+            self.thread.join()
+            self.thread = None
+        while True:
+            batch = self.channel.get( 0.1 )
+            if batch is None:
+                break
+            self.addBatch( batch )
+
+    def _receive(self):
+        while not self.stopped.is_set():
+            batch = self.channel.get( 0.1 )
+            if batch is not None:
+                self.addBatch( batch )
+
+    def addBatch(self, batch):
+        dropped, records = batch
+        with self.lock:
+            self.dropped += dropped
+        self.add( records )
+
+    def add(self, records):
+        for record in records:
+            worker, episode, reward, steps, _ = record
+            with self.lock:
+                rewards = self.rewards.get( worker, None )
+                if rewards is None:
+                    rewards = RollingSum( self.window )
+                    self.rewards[ worker ] = rewards
+                    self.curves[ worker ] = []
+                rewardSum = rewards.add( reward )
+                count = self.episodes.get( worker, 0 ) + 1
+                self.episodes[ worker ] = count
+                lastSteps = self.counters.get( worker, 0 )
+                if steps < lastSteps:
+                    ## worker was respawned -- counter starts from zero
+                    lastSteps = 0
+                self.steps[ worker ] = self.steps.get( worker, 0 ) + steps - lastSteps
+                self.counters[ worker ] = steps
+                if count % self.curvePeriod == 0:
+                    self.curves[ worker ].append( (episode, rewardSum / len(rewards)) )
+            for callback in self.callbacks:
+                callback( self, record )
+
+    def getEpisodesCount(self):
+        with self.lock:
+            return sum( self.episodes.values() )
+
+    def getStepsCount(self):
+        with self.lock:
+            return sum( self.steps.values() )
+
+    def getDroppedCount(self):
+        """Return number of records dropped by workers because of full channel."""
+        with self.lock:
+            return self.dropped
+
+    def getThroughput(self):
+        """Return tuple: (episodes per second, steps per second) since start."""
+        duration = time.time() - self.startTime
+        if duration <= 0:
+            return (0.0, 0.0)
+        with self.lock:
+            episodes = sum( self.episodes.values() ) - sum( self.baseEpisodes.values() )
+            steps = sum( self.steps.values() ) - sum( self.baseSteps.values() )
+        return ( episodes / duration, steps / duration )
+
+    def getMeanReward(self):
+        """Return mean reward of last episodes of all workers."""
+        with self.lock:
+            means = [ rewards.sum / len(rewards) for rewards in self.rewards.values() ]
+        if len(means) < 1:
+            return 0.0
+        return sum( means ) / len(means)
+
+    def getCurve(self, worker):
+        with self.lock:
+            return list( self.curves.get( worker, [] ) )
+
+
+class ProgressPrinter:
+    """Callback of ProgressAggregator printing summary every 'period' seconds."""
+
+    def __init__(self, period=5.0):
+        self.period = period
+        self.lastTime = time.time()
+
+    def __call__(self, aggregator, record):
+        currTime = time.time()
+        if currTime - self.lastTime < self.period:
+            return
+        self.lastTime = currTime
+        episodesRate, stepsRate = aggregator.getThroughput()
+        print( "Episodes: %i mean reward: %f episodes/s: %f steps/s: %f dropped: %i" % (aggregator.getEpisodesCount(), aggregator.getMeanReward(),
+                                                                                        episodesRate, stepsRate, aggregator.getDroppedCount()) )
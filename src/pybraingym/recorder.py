@@ -0,0 +1,226 @@
+# MIT License
+#
+# Copyright (c) 2019 Arkadiusz Netczuk <dev.arnet@gmail.com>
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+
+
+import os
+import re
+import numpy as np
+
+
+class TrajectoryRecorder:
+    """Records transitions to preallocated memory-mapped column files.
+
+       Each row contains observation seen by agent, action taken by agent,
+       received reward, done flag and episode id. Final observation of episode
+       is stored in separate row with done flag set and NaN action.
+       Data is split into chunks of 'chunkSize' rows. New chunk is allocated
+       when current one is full. Offsets of episodes started in chunk are
+       stored in separate file of the chunk, so only offsets of current chunk
+       are kept in memory and rewritten on flush.
+    """
+
+    def __init__(self, directory, chunkSize=100000, overwrite=False):
+        """Class constructor.
+
+        Arguments:
+        directory -- output directory, created if not exists
+        chunkSize -- number of rows of each chunk
+        overwrite -- if True then recording existing in 'directory' is removed,
+                     otherwise FileExistsError is raised
+        """
+        if chunkSize < 1:
+            raise AssertionError("invalid parameter: chunkSize - it has to be greater than 0")
+        self.directory = directory
+        self.chunkSize = chunkSize
+        self.chunkRows = []                     ## number of rows of each chunk
+        self.chunkEpisodes = []                 ## global row index of first row of episodes started in current chunk
+        self.episodeId = -1
+        self.rows = 0
+        self.chunkIndex = 0
+        self.columns = None
+        if not os.path.exists(directory):
+            os.makedirs(directory)
+        existing = recordingFiles( directory )
+        if len(existing) > 0:
+            if overwrite is False:
+                raise FileExistsError("directory %s already contains recording" % directory)
+            for name in existing:
+                os.remove( os.path.join(directory, name) )
+
+    def newEpisode(self):
+        self.episodeId += 1
+        self.chunkEpisodes.append( self.rows )
+
+    def record(self, observation, action, reward, done=False):
+        if self.episodeId < 0:
+            self.newEpisode()
+        if self.columns is None:
+            self._allocate( observation, action )
+        elif self.chunkIndex >= self.chunkSize:
+            self._rotate()
+        pos = self.chunkIndex
+        cols = self.columns
+        cols["observation"][pos] = np.ravel( observation )
+        cols["action"][pos] = np.ravel( action )
+        cols["reward"][pos] = reward
+        cols["done"][pos] = done
+        cols["episode"][pos] = self.episodeId
+        self.chunkIndex += 1
+        self.chunkRows[-1] = self.chunkIndex
+        self.rows += 1
+
+    def recordTerminal(self, observation):
+        self.record( observation, np.nan, 0.0, True )
+
+    def flush(self):
+        if self.columns is not None:
+            for col in self.columns.values():
+                col.flush()
+        np.save( os.path.join(self.directory, "chunks.npy"), np.array(self.chunkRows, dtype=np.int64) )
+        np.save( columnPath( self.directory, "offsets", self._chunkId() ), np.array(self.chunkEpisodes, dtype=np.int64) )
+
+    def close(self):
+        self.flush()
+        if self.columns is not None:
+            ## next record allocates new chunk
+            self.chunkEpisodes = []
+        self.columns = None
+
+    def _allocate(self, observation, action):
+        obsDim = np.size( observation )
+        actDim = np.size( action )
+        chunkId = len(self.chunkRows)
+        self.columns = {
+            "observation": self._openColumn( "observation", chunkId, np.float64, (self.chunkSize, obsDim) ),
+            "action": self._openColumn( "action", chunkId, np.float64, (self.chunkSize, actDim) ),
+            "reward": self._openColumn( "reward", chunkId, np.float64, (self.chunkSize,) ),
+            "done": self._openColumn( "done", chunkId, np.bool_, (self.chunkSize,) ),
+            "episode": self._openColumn( "episode", chunkId, np.int64, (self.chunkSize,) )
+        }
+        self.chunkRows.append( 0 )
+        self.chunkIndex = 0
+
+    def _rotate(self):
+        obsDim = self.columns["observation"].shape[1]
+        actDim = self.columns["action"].shape[1]
+        self.flush()
+        self.columns = None
+        self.chunkEpisodes = []
+        self._allocate( np.zeros(obsDim), np.zeros(actDim) )
+
+    def _chunkId(self):
+        ## id of current chunk or of chunk allocated by next record
+        if self.columns is None:
+            return len(self.chunkRows)
+        return len(self.chunkRows) - 1
+
+    def _openColumn(self, name, chunkId, dtype, shape):
+        path = columnPath( self.directory, name, chunkId )
+        return np.lib.format.open_memmap( path, mode="w+", dtype=dtype, shape=shape )
+
+
+class TrajectoryReader:
+    """Gives access to data stored by TrajectoryRecorder.
+
+       Columns are opened as read-only memory maps, so data is not loaded
+       into memory until accessed.
+    """
+
+    COLUMNS = ["observation", "action", "reward", "done", "episode"]
+
+    def __init__(self, directory):
+        self.directory = directory
+        self.chunkRows = np.load( os.path.join(directory, "chunks.npy") )
+        offsets = []
+        chunkId = 0
+        while os.path.exists( columnPath( directory, "offsets", chunkId ) ):
+            offsets.append( np.load( columnPath( directory, "offsets", chunkId ) ) )
+            chunkId += 1
+        self.episodeOffsets = np.concatenate( offsets ) if len(offsets) > 0 else np.zeros( 0, dtype=np.int64 )
+        self.chunkOffsets = np.concatenate( ([0], np.cumsum(self.chunkRows)) )
+        self.rows = int( self.chunkOffsets[-1] )
+
+    def numRows(self):
+        return self.rows
+
+    def numEpisodes(self):
+        return len(self.episodeOffsets)
+
+    def getChunk(self, chunkId):
+        """Return dict of memory mapped columns of given chunk."""
+        rows = self.chunkRows[ chunkId ]
+        ret = dict()
+        for name in self.COLUMNS:
+            path = columnPath( self.directory, name, chunkId )
+            ret[ name ] = np.load( path, mmap_mode="r" )[:rows]
+        return ret
+
+    def chunks(self):
+        for chunkId in range(0, len(self.chunkRows)):
+            yield self.getChunk( chunkId )
+
+    def getRows(self, fromRow, toRow):
+        """Return dict of columns containing rows from given range."""
+        first = np.searchsorted( self.chunkOffsets, fromRow, side="right" ) - 1
+        first = min( first, len(self.chunkRows) - 1 )
+        last = np.searchsorted( self.chunkOffsets, toRow, side="left" )
+        last = max( last, first + 1 )           ## empty range
+        parts = { name: [] for name in self.COLUMNS }
+        for chunkId in range(first, last):
+            chunk = self.getChunk( chunkId )
+            begin = max( fromRow - self.chunkOffsets[chunkId], 0 )
+            end = min( toRow - self.chunkOffsets[chunkId], self.chunkRows[chunkId] )
+            for name in self.COLUMNS:
+                parts[ name ].append( chunk[ name ][begin:end] )
+        ret = dict()
+        for name in self.COLUMNS:
+            data = parts[ name ]
+            if len(data) == 1:
+                ret[ name ] = data[0]
+            else:
+                ret[ name ] = np.concatenate( data )
+        return ret
+
+    def getEpisode(self, episodeId):
+        fromRow = self.episodeOffsets[ episodeId ]
+        if episodeId + 1 < len(self.episodeOffsets):
+            toRow = self.episodeOffsets[ episodeId + 1 ]
+        else:
+            toRow = self.rows
+        return self.getRows( fromRow, toRow )
+
+    def episodes(self):
+        for episodeId in range(0, self.numEpisodes()):
+            yield self.getEpisode( episodeId )
+
+
+def columnPath(directory, name, chunkId):
+    return os.path.join( directory, "%s_%05d.npy" % (name, chunkId) )
+
+
+_RECORDING_FILE = re.compile( r"^(chunks|(%s|offsets)_\d{5})\.npy$" % "|".join( TrajectoryReader.COLUMNS ) )
+
+
+def recordingFiles(directory):
+    """Return names of files of recording stored in given directory."""
+    return sorted( name for name in os.listdir( directory ) if _RECORDING_FILE.match( name ) )
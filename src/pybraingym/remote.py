@@ -0,0 +1,305 @@
+# MIT License
+#
+# Copyright (c) 2019 Arkadiusz Netczuk <dev.arnet@gmail.com>
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+
+
+import os
+import sys
+import time
+import uuid
+import queue
+import socket
+import importlib
+import threading
+from multiprocessing import Process, AuthenticationError
+from multiprocessing.connection import Listener, Client, deliver_challenge, answer_challenge
+
+from pybraingym.parallelexperimentworker import ConnectionExperimentWorker, serveWorker, workerResults
+
+
+## Remote worker agent connects to coordinator with two connections: first one
+## serves requests of worker (see serveWorker()), second one sends heartbeats.
+## First message of each connection is tuple (role, agent id, host name).
+
+
+AUTHKEY_VARIABLE = "PYBRAINGYM_AUTHKEY"
+
+
+def importFactory(path):
+    """Return object given by import path in format 'package.module:function' or 'package.module.function'."""
+    if ":" in path:
+        moduleName, attrName = path.split( ":", 1 )
+    else:
+        moduleName, attrName = path.rsplit( ".", 1 )
+    module = importlib.import_module( moduleName )
+    ret = module
+    for name in attrName.split( "." ):
+        ret = getattr( ret, name )
+    return ret
+
+
+class RemoteCoordinator:
+    """Accepts connections of remote worker agents and creates workers on them.
+
+       'createWorker' can be passed to MultiExperiment as 'workerFactory'.
+       Then experiment factory has to be given by import path, which is
+       resolved on agent's host (so 'placement', 'threadsNumber' and
+       'progress' of MultiExperiment are not supported), e.g.:
+
+       coordinator = RemoteCoordinator( ("0.0.0.0", 6000), b"secret" )
+       experiment = MultiExperiment( 64, "mypackage.myexperiment:createExperimentInstance",
+                                     workerFactory=coordinator.createWorker )
+    """
+
+    def __init__(self, address=("localhost", 0), authkey=None, heartbeatTimeout=30.0, acceptTimeout=None):
+        """Class constructor.
+
+        Arguments:
+        address -- tuple (host, port) to listen on, port 0 means any free port
+        authkey -- bytes shared with agents, used to authenticate connections
+        heartbeatTimeout -- number of seconds without heartbeat after which agent is considered dead
+        acceptTimeout -- maximum number of seconds of waiting for free agent in 'createWorker()'
+        """
+        assert authkey is not None, "authkey is required"
+        self.authkey = authkey
+        self.heartbeatTimeout = heartbeatTimeout
+        self.acceptTimeout = acceptTimeout
+        ## default backlog of Listener is 1, so simultaneous connections of many agents would be delayed,
+        ## authentication is done by connection's own thread (see _handshake())
+        self.listener = Listener( address, backlog=128 )
+        self.agents = queue.Queue()                 ## waiting worker connections
+        self.heartbeats = dict()                    ## agent id: time of last heartbeat
+        self.lost = set()                           ## agents with broken heartbeat connection
+        self.lock = threading.Lock()
+        self.closed = False
+        self.acceptThread = threading.Thread( target=self._acceptLoop, daemon=True )
+        self.acceptThread.start()
+
+    @property
+    def address(self):
+        return self.listener.address
+
+    def createWorker(self, factoryPath):
+        """Create worker on first free agent. Factory is given by import path."""
+        try:
+            connection, agentId, hostName = self.agents.get( timeout=self.acceptTimeout )
+        except queue.Empty:
+            raise TimeoutError("no remote agent connected") from None
+        return RemoteExperimentWorker( connection, factoryPath, self, agentId, hostName )
+
+    def isAlive(self, agentId):
+        with self.lock:
+            if agentId in self.lost:
+                return False
+            last = self.heartbeats.get( agentId, None )
+        if last is None:
+            return False
+        return time.time() - last < self.heartbeatTimeout
+
+    def close(self):
+        if self.closed:
+            return
+        self.closed = True
+        try:
+            ## wake up accepting thread
+            Client( self.address ).close()
+        except OSError:
+            pass
+        self.acceptThread.join()
+        self.listener.close()
+        while not self.agents.empty():
+            connection = self.agents.get()[0]
+            connection.close()
+
+    def _acceptLoop(self):
+        while True:
+            try:
+                connection = self.listener.accept()
+            except OSError:
+                return
+            if self.closed:
+                connection.close()
+                return
+            ## slow or silent client does not block connections of other agents
+            thread = threading.Thread( target=self._handshake, args=(connection,), daemon=True )
+            thread.start()
+
+    def _handshake(self, connection):
+        try:
+            deliver_challenge( connection, self.authkey )
+            answer_challenge( connection, self.authkey )
+            if connection.poll( 10.0 ) is False:
+                connection.close()
+                return
+            role, agentId, hostName = connection.recv()
+        except (AuthenticationError, EOFError, OSError, ValueError, TypeError):
+            connection.close()
+            return
+        if self.closed:
+            connection.close()
+        elif role == "worker":
+            with self.lock:
+                self.heartbeats[ agentId ] = time.time()
+            self.agents.put( (connection, agentId, hostName) )
+        elif role == "heartbeat":
+            self._receiveHeartbeats( connection, agentId )
+        else:
+            connection.close()
+
+    def _receiveHeartbeats(self, connection, agentId):
+        try:
+            while True:
+                connection.recv()
+                with self.lock:
+                    self.heartbeats[ agentId ] = time.time()
+        except (EOFError, OSError):
+            with self.lock:
+                self.lost.add( agentId )
+        finally:
+            connection.close()
+
+
+class RemoteExperimentWorker(ConnectionExperimentWorker):
+    """Worker running experiment on remote agent, communicating through socket."""
+
+    def __init__(self, connection, factoryPath, coordinator, agentId, hostName=None):
+        ConnectionExperimentWorker.__init__( self, connection )
+        self.coordinator = coordinator
+        self.agentId = agentId
+        self.hostName = hostName
+        self.connection.send( ("create", factoryPath) )
+        status, value, results = self.connection.recv()
+        if status != "ok":
+            self.connection.close()
+            self.connection = None
+            raise value
+        self.results = results
+
+    def isAlive(self):
+        """Check if agent sends heartbeats."""
+        return self.connection is not None and self.coordinator.isAlive( self.agentId )
+
+    def _waitResponse(self):
+        ## agent's host can hang without closing socket, so heartbeats are checked during call
+        interval = min( 1.0, self.coordinator.heartbeatTimeout )
+        while self.connection.poll( interval ) is False:
+            if self.coordinator.isAlive( self.agentId ) is False:
+                raise ConnectionError("heartbeat of remote agent %s is lost" % self.agentId)
+
+
+class HeartbeatSender(threading.Thread):
+    """Thread periodically sending heartbeats to coordinator."""
+
+    def __init__(self, address, authkey, agentId, interval=5.0):
+        threading.Thread.__init__( self, daemon=True )
+        self.connection = Client( address, authkey=authkey )
+        self.connection.send( ("heartbeat", agentId, socket.gethostname()) )
+        self.interval = interval
+        self.stopped = threading.Event()
+
+    def run(self):
+        try:
+            while True:
+                self.connection.send( time.time() )
+                if self.stopped.wait( self.interval ):
+                    break
+        except OSError:
+            pass
+
+    def stop(self):
+        self.stopped.set()
+        self.join()
+        self.connection.close()
+
+
+def runAgent(address, authkey, heartbeatInterval=5.0, connectTimeout=30.0):
+    """Connect to coordinator, create worker requested by it and serve it until closed."""
+    agentId = uuid.uuid4().hex
+    connection = connectClient( address, authkey, connectTimeout )
+    try:
+        connection.send( ("worker", agentId, socket.gethostname()) )
+        try:
+            command, factoryPath = connection.recv()
+        except EOFError:
+            return
+        heartbeat = HeartbeatSender( address, authkey, agentId, heartbeatInterval )
+        heartbeat.start()
+        try:
+            try:
+                worker = importFactory( factoryPath )()
+                connection.send( ("ok", None, workerResults(worker)) )
+            except Exception as exc:
+                connection.send( ("error", exc, None) )
+                return
+            serveWorker( connection, worker )
+        finally:
+            heartbeat.stop()
+    finally:
+        connection.close()
+
+
+def connectClient(address, authkey, timeout=30.0):
+    """Connect to listener, retrying until it is available or timeout passes."""
+    endTime = time.time() + timeout
+    while True:
+        try:
+            return Client( address, authkey=authkey )
+        except ConnectionRefusedError:
+            if time.time() > endTime:
+                raise
+            time.sleep( 0.1 )
+
+
+def startAgents(address, authkey, workersNumber, heartbeatInterval=5.0):
+    """Start given number of agent processes. Return list of processes."""
+    processes = []
+    for _ in range(0, workersNumber):
+        proc = Process( target=runAgent, args=(address, authkey, heartbeatInterval) )
+        proc.start()
+        processes.append( proc )
+    return processes
+
+
+def main():
+    import argparse
+    parser = argparse.ArgumentParser(description='Run remote experiment worker agents')
+    parser.add_argument('host', help='Coordinator host')
+    parser.add_argument('port', type=int, help='Coordinator port')
+    parser.add_argument('-w', '--workers', type=int, default=1, help='Number of workers (processes) to start')
+    parser.add_argument('-hb', '--heartbeat', type=float, default=5.0, help='Heartbeat interval in seconds')
+    parser.add_argument('-p', '--path', action='append', default=[], help='Directory added to import path of factories')
+
+    args = parser.parse_args()
+
+    authkey = os.environ.get( AUTHKEY_VARIABLE, None )
+    if authkey is None:
+        print("missing authentication key in environment variable %s" % AUTHKEY_VARIABLE)
+        return 1
+    sys.path.extend( args.path )
+    processes = startAgents( (args.host, args.port), authkey.encode(), args.workers, args.heartbeat )
+    for proc in processes:
+        proc.join()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit( main() )
@@ -0,0 +1,146 @@
+# MIT License
+#
+# Copyright (c) 2019 Arkadiusz Netczuk <dev.arnet@gmail.com>
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+
+
+import threading
+import numpy as np
+from multiprocessing import shared_memory, resource_tracker
+
+
+class SharedParameters:
+    """Array of parameters stored in block of shared memory.
+
+       Block is created if 'name' is not given, otherwise existing block is
+       attached. Creator of block is responsible for calling 'unlink()'.
+    """
+
+    def __init__(self, size, name=None):
+        create = name is None
+        if create:
+            self.memory = shared_memory.SharedMemory( create=True, size=size * np.dtype(np.float64).itemsize )
+        else:
+            self.memory = attachMemory( name )
+        self.owner = create
+        self.size = size
+        self.array = np.ndarray( (size,), dtype=np.float64, buffer=self.memory.buf )
+
+    @property
+    def name(self):
+        return self.memory.name
+
+    def bind(self, module):
+        """Copy parameters of module to shared memory and make module use them in place."""
+        np.copyto( self.array, module.params )
+        module._setParameters( self.array )
+
+    def copyTo(self, module):
+        np.copyto( module.params, self.array )
+
+    def close(self):
+        self.array = None
+        self.memory.close()
+
+    def unlink(self):
+        if self.owner:
+            self.memory.unlink()
+
+
+## row of metrics table, one row per worker
+METRICS_DTYPE = np.dtype( [ ("episodes", np.int64),           ## total number of episodes
+                            ("steps", np.int64),              ## total number of environment steps
+                            ("roundSteps", np.int64),         ## steps of last call of doExperiment()
+                            ("reward", np.float64),           ## reward of last episode
+                            ("quality", np.float64),          ## quality rate after last episode
+                            ("startTime", np.float64),        ## start of last call of doExperiment()
+                            ("updateTime", np.float64) ] )    ## end of last episode
+
+
+class SharedMetrics:
+    """Table of metrics of workers stored in block of shared memory.
+
+       Table is structured array of METRICS_DTYPE with one row per worker.
+       Each worker updates only its own row in place, so all rows can be
+       read at once without calling workers. Block is created if 'name'
+       is not given, otherwise existing block is attached.
+    """
+
+    def __init__(self, rowsNumber, name=None):
+        create = name is None
+        if create:
+            self.memory = shared_memory.SharedMemory( create=True, size=rowsNumber * METRICS_DTYPE.itemsize )
+        else:
+            self.memory = attachMemory( name )
+        self.owner = create
+        self.size = rowsNumber
+        self.array = np.ndarray( (rowsNumber,), dtype=METRICS_DTYPE, buffer=self.memory.buf )
+        if create:
+            self.array.fill( 0 )
+
+    @property
+    def name(self):
+        return self.memory.name
+
+    def getRow(self, index):
+        """Return view of single row, writing to its fields updates table in place."""
+        return self.array[ index:index + 1 ]
+
+    def getBestIndex(self):
+        """Return index of row of the highest quality rate."""
+        return int( np.argmax( self.array["quality"] ) )
+
+    def snapshot(self):
+        return self.array.copy()
+
+    def close(self):
+        self.array = None
+        self.memory.close()
+
+    def unlink(self):
+        if self.owner:
+            self.memory.unlink()
+
+
+_attachLock = threading.Lock()
+
+
+def attachMemory(name):
+    """Attach existing block of shared memory without registering it in resource tracker.
+
+       Block is owned by its creator. Otherwise resource tracker of attaching
+       process would remove the block when the process exits.
+    """
+    try:
+        return shared_memory.SharedMemory( name=name, track=False )           ## Python 3.13+
+    except TypeError:
+        pass
+    with _attachLock:
+        register = resource_tracker.register
+        resource_tracker.register = _skipRegister
+        try:
+            return shared_memory.SharedMemory( name=name )
+        finally:
+            resource_tracker.register = register
+
+
+def _skipRegister(name, rtype):
+    pass
@@ -0,0 +1,161 @@
+# MIT License
+#
+# Copyright (c) 2019 Arkadiusz Netczuk <dev.arnet@gmail.com>
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+
+
+import random
+import numpy as np
+
+
+class RunningStats:
+    """Calculates mean and variance of stream of values (Welford's algorithm)."""
+
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+
+    def add(self, value):
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (value - self.mean)
+
+    def variance(self):
+        if self.count < 2:
+            return 0.0
+        return self.m2 / (self.count - 1)
+
+    def std(self):
+        return np.sqrt( self.variance() )
+
+
+class RollingSum:
+    """Sum of last 'size' values updated incrementally.
+
+       Sum is recalculated from scratch once per full cycle of buffer to
+       prevent accumulation of floating point errors.
+    """
+
+    def __init__(self, size):
+        if size < 1:
+            raise AssertionError("invalid parameter: size - it has to be greater than 0")
+        self.buffer = np.zeros( size )
+        self.size = size
+        self.index = 0
+        self.count = 0
+        self.sum = 0.0
+
+    def __len__(self):
+        return self.count
+
+    def isFull(self):
+        return self.count >= self.size
+
+    def add(self, value):
+        self.sum += value - self.buffer[ self.index ]
+        self.buffer[ self.index ] = value
+        self.index += 1
+        if self.index >= self.size:
+            self.index = 0
+            self.sum = float( np.sum(self.buffer) )
+        if self.count < self.size:
+            self.count += 1
+        return self.sum
+
+
+class PercentileSketch:
+    """Approximates percentiles of stream of values using fixed-size reservoir sample."""
+
+    def __init__(self, size=1000, seed=None):
+        if size < 1:
+            raise AssertionError("invalid parameter: size - it has to be greater than 0")
+        self.reservoir = np.zeros( size )
+        self.size = size
+        self.count = 0
+        self.random = random.Random( seed )
+
+    def add(self, value):
+        if self.count < self.size:
+            self.reservoir[ self.count ] = value
+        else:
+            pos = self.random.randint( 0, self.count )
+            if pos < self.size:
+                self.reservoir[ pos ] = value
+        self.count += 1
+
+    def percentile(self, q):
+        """Return approximated q-th percentile (0-100) of values added so far."""
+        if self.count < 1:
+            return float('nan')
+        stored = min( self.count, self.size )
+        return float( np.percentile( self.reservoir[:stored], q ) )
+
+
+class EpisodeStatistics:
+    """Statistics of episodes rewards with constant cost of each update.
+
+       Object can be passed directly as quality functor to ProcessExperimentWorker.
+       Quality rate is sum of rewards of last 'window' episodes.
+    """
+
+    def __init__(self, window=100, sketchSize=1000, seed=None):
+        self.running = RunningStats()
+        self.period = RollingSum( window )
+        self.sketch = PercentileSketch( sketchSize, seed )
+        self.best_period_reward = float('-inf')
+        self.rate = 0
+
+    def __call__(self, iteration, reward):
+        self.add( reward )
+        return self.rate
+
+    def add(self, reward):
+        self.running.add( reward )
+        self.sketch.add( reward )
+        self.rate = self.period.add( reward )
+        if self.rate > self.best_period_reward:
+            self.best_period_reward = self.rate
+
+    def getCount(self):
+        return self.running.count
+
+    def getRate(self):
+        return self.rate
+
+    def getBestPeriodReward(self):
+        return self.best_period_reward
+
+    def getSuccessRate(self):
+        return self.best_period_reward / self.period.size * 100
+
+    def getMean(self):
+        return self.running.mean
+
+    def getVariance(self):
+        return self.running.variance()
+
+    def getStd(self):
+        return self.running.std()
+
+    def getPercentile(self, q):
+        return self.sketch.percentile( q )
@@ -0,0 +1,184 @@
+# MIT License
+#
+# Copyright (c) 2019 Arkadiusz Netczuk <dev.arnet@gmail.com>
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+
+
+import csv
+import time
+import random
+import itertools
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+
+RESULT_COLUMNS = ["index", "quality", "episodes", "steps", "wallTime", "thresholdTime", "thresholdEpisodes", "error"]
+
+
+def gridSearch(space):
+    """Return list of all combinations of values of parameters.
+
+       Arguments:
+       space -- dict of parameter name and list of its values
+    """
+    names = list( space.keys() )
+    ret = []
+    for values in itertools.product( *[ space[ name ] for name in names ] ):
+        ret.append( dict( zip(names, values) ) )
+    return ret
+
+
+def randomSearch(space, samples, seed=None):
+    """Return list of randomly drawn configurations.
+
+       Arguments:
+       space -- dict of parameter name and its domain: list (value is chosen
+                from elements), tuple (low, high) (value is drawn uniformly)
+                or callable (called with random.Random instance)
+       samples -- number of configurations
+       seed -- random seed
+    """
+    rand = random.Random( seed )
+    ret = []
+    for _ in range(0, samples):
+        config = dict()
+        for name, domain in space.items():
+            if callable( domain ):
+                config[ name ] = domain( rand )
+            elif isinstance( domain, tuple ):
+                config[ name ] = rand.uniform( domain[0], domain[1] )
+            else:
+                config[ name ] = rand.choice( domain )
+        ret.append( config )
+    return ret
+
+
+def runConfiguration(createExperimentInstance, config, rounds, episodes, threshold=None):
+    """Execute single configuration and return dict of results.
+
+       'createExperimentInstance' is called with configuration as keyword
+       arguments and has to return ProcessExperimentWorker. Quality rate is
+       checked after every round of 'episodes' episodes.
+    """
+    startTime = time.time()
+    row = dict( config )
+    row.update( { "quality": None, "episodes": 0, "steps": 0, "wallTime": None,
+                  "thresholdTime": None, "thresholdEpisodes": None, "error": None } )
+    worker = None
+    try:
+        worker = createExperimentInstance( **config )
+        for _ in range(0, rounds):
+            worker.doExperiment( episodes, False )
+            row["episodes"] += episodes
+            row["steps"] += worker.getStepsCount()
+            quality = worker.getQualityRate()
+            row["quality"] = quality
+            if threshold is not None and row["thresholdTime"] is None and quality >= threshold:
+                row["thresholdTime"] = time.time() - startTime
+                row["thresholdEpisodes"] = row["episodes"]
+    except Exception as exc:
+        row["error"] = repr( exc )
+    finally:
+        if worker is not None:
+            worker.close()
+    row["wallTime"] = time.time() - startTime
+    return row
+
+
+class Sweep:
+    """Runs configurations of experiment in bounded pool of processes.
+
+       Processes are reused between configurations, so costly imports and
+       initialization are done only once per process. Each configuration
+       produces one result row containing parameters, final quality rate,
+       time to reach quality threshold and wall time.
+    """
+
+    def __init__(self, createExperimentInstance, processesNumber=None, rounds=10, episodes=10, threshold=None):
+        """Class constructor.
+
+        Arguments:
+        createExperimentInstance -- picklable function receiving parameters as keyword arguments
+        processesNumber -- maximum number of processes (number of CPUs if None)
+        rounds -- number of quality checks of each configuration
+        episodes -- number of episodes of each round
+        threshold -- quality rate to measure time to reach
+        """
+        self.createExperimentInstance = createExperimentInstance
+        self.processesNumber = processesNumber
+        self.rounds = rounds
+        self.episodes = episodes
+        self.threshold = threshold
+        self.results = []
+
+    def execute(self, configs, resultsPath=None, callback=None):
+        """Run all configurations and return list of result rows ordered as configurations.
+
+        Arguments:
+        configs -- list of dicts of parameters (e.g. result of 'gridSearch()')
+        resultsPath -- CSV file to write rows to as soon as they are ready
+        callback -- function called with each row when it is ready
+        """
+        configs = list( configs )
+        rows = [ None ] * len(configs)
+        writer = None
+        resultsFile = None
+        if resultsPath is not None:
+            resultsFile = open( resultsPath, "w", newline="" )
+            writer = csv.DictWriter( resultsFile, fieldnames=resultColumns( configs ), extrasaction="ignore" )
+            writer.writeheader()
+        try:
+            with ProcessPoolExecutor( max_workers=self.processesNumber ) as pool:
+                futures = dict()
+                for index, config in enumerate( configs ):
+                    future = pool.submit( runConfiguration, self.createExperimentInstance, config,
+                                          self.rounds, self.episodes, self.threshold )
+                    futures[ future ] = index
+                for future in as_completed( futures ):
+                    index = futures[ future ]
+                    row = future.result()
+                    row["index"] = index
+                    rows[ index ] = row
+                    if writer is not None:
+                        writer.writerow( row )
+                        resultsFile.flush()
+                    if callback is not None:
+                        callback( row )
+        finally:
+            if resultsFile is not None:
+                resultsFile.close()
+        self.results = rows
+        return rows
+
+    def getBestResult(self):
+        """Return row of highest final quality or None."""
+        valid = [ row for row in self.results if row is not None and row["quality"] is not None ]
+        if len(valid) < 1:
+            return None
+        return max( valid, key=lambda row: row["quality"] )
+
+
+def resultColumns(configs):
+    names = []
+    for config in configs:
+        for name in config.keys():
+            if name not in names:
+                names.append( name )
+    return names + RESULT_COLUMNS
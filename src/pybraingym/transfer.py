@@ -0,0 +1,157 @@
+# MIT License
+#
+# Copyright (c) 2019 Arkadiusz Netczuk <dev.arnet@gmail.com>
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+
+
+import zlib
+import numpy as np
+
+
+## Delta is dict with keys: "rows" (indexes of rows), "data" (bytes of values of rows),
+## "dtype" (type of values), "columns" (number of columns) and "compressed" (bool).
+
+
+def encodeRows(values, rows=None, dtype=None, compress=True):
+    """Encode given rows of 2-D array of parameters.
+
+       Arguments:
+       values -- 2-D array of parameters (rows, columns)
+       rows -- array of indexes of rows to encode, all rows if None
+       dtype -- type values are down-cast to (e.g. numpy.float32 or numpy.float16), no cast if None
+       compress -- compress data with zlib
+    """
+    if rows is None:
+        rows = np.arange( values.shape[0] )
+    return packRows( rows, values[ rows ], dtype, compress )
+
+
+def packRows(rows, rowsValues, dtype=None, compress=True):
+    """Create delta from indexes of rows and 2-D array of their values."""
+    if dtype is not None:
+        rowsValues = rowsValues.astype( dtype )
+    rowsData = np.asarray( rows, dtype=np.int32 ).tobytes()
+    valuesData = np.ascontiguousarray( rowsValues ).tobytes()
+    if compress:
+        ## level 1 is the fastest one
+        rowsData = zlib.compress( rowsData, 1 )
+        valuesData = zlib.compress( valuesData, 1 )
+    return { "rows": rowsData,
+             "data": valuesData,
+             "dtype": rowsValues.dtype.str,
+             "columns": rowsValues.shape[1],
+             "compressed": compress }
+
+
+def decodeRows(delta):
+    """Return tuple: (array of indexes of rows, 2-D array of values of rows as float64)."""
+    rowsData = delta["rows"]
+    valuesData = delta["data"]
+    if delta["compressed"]:
+        rowsData = zlib.decompress( rowsData )
+        valuesData = zlib.decompress( valuesData )
+    rows = np.frombuffer( rowsData, dtype=np.int32 )
+    values = np.frombuffer( valuesData, dtype=np.dtype( delta["dtype"] ) )
+    values = values.astype( np.float64 ).reshape( len(rows), delta["columns"] )
+    return (rows, values)
+
+
+def applyRows(values, delta):
+    """Write rows of delta to 2-D array of parameters in place."""
+    rows, rowsValues = decodeRows( delta )
+    values[ rows ] = rowsValues
+    return values
+
+
+def deltaSize(delta):
+    """Return number of bytes of data of delta."""
+    return len(delta["rows"]) + len(delta["data"])
+
+
+def parametersRows(module):
+    """Return view of module's parameters as 2-D array (rows, columns)."""
+    numColumns = getattr( module, "numColumns", 1 )
+    return module.params.reshape( -1, numColumns )
+
+
+class DeltaTransfer:
+    """Propagates parameters of best worker sending only rows changed since last synchronization.
+
+       Workers' modules should track changed rows (see DirtyRowsTableWrapper),
+       otherwise whole tables are sent. After synchronization each worker
+       has rows changed by itself or by best worker replaced with values of
+       best worker, so all tables are equal (except of precision lost due
+       to down-casting). Can be passed to MultiExperiment as 'deltaTransfer'.
+    """
+
+    def __init__(self, dtype=None, compress=True):
+        self.dtype = dtype
+        self.compress = compress
+        self.bytesSent = 0                  ## size of sent deltas
+        self.bytesFull = 0                  ## size of full parameters that would be sent otherwise
+        self.parametersSize = None
+
+    def propagate(self, experiments, bestIndex, pool=None):
+        """Synchronize workers with best one. Calls are dispatched by executor 'pool' if given."""
+        mapFunction = map
+        if pool is not None:
+            mapFunction = pool.map
+        dirtyList = list( mapFunction( DeltaTransfer.processDirtyRows, experiments ) )
+        tracked = all( dirty is not None for dirty in dirtyList )
+        union = None
+        if tracked:
+            union = np.unique( np.concatenate( dirtyList ) )
+        bestExp = experiments[ bestIndex ]
+        if self.parametersSize is None:
+            self.parametersSize = bestExp.getParameters().nbytes
+        bestDelta = bestExp.getRows( union, self.dtype, self.compress )
+        rows, values = decodeRows( bestDelta )
+        paramsList = []
+        for i in range(0, len(experiments)):
+            if i == bestIndex:
+                continue
+            delta = bestDelta
+            if tracked:
+                needed = np.union1d( dirtyList[ bestIndex ], dirtyList[i] )
+                mask = np.isin( rows, needed )
+                delta = packRows( rows[ mask ], values[ mask ], self.dtype, self.compress )
+            paramsList.append( (experiments[i], delta) )
+            self.bytesSent += deltaSize( delta )
+            self.bytesFull += self.parametersSize
+        list( mapFunction( DeltaTransfer.processSetRows, paramsList ) )
+        ## marks synchronization point of best worker
+        bestExp.setRows( packRows( [], values[ :0 ], None, False ) )
+
+    @staticmethod
+    def processDirtyRows(experiment):
+        return experiment.getDirtyRows()
+
+    @staticmethod
+    def processSetRows(params):
+        experiment = params[0]
+        delta = params[1]
+        experiment.setRows( delta )
+
+    def getRatio(self):
+        """Return ratio of sent bytes to size of full parameters."""
+        if self.bytesFull == 0:
+            return 0.0
+        return self.bytesSent / self.bytesFull
@@ -0,0 +1,167 @@
+# MIT License
+#
+# Copyright (c) 2019 Arkadiusz Netczuk <dev.arnet@gmail.com>
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+
+
+import copy
+import time
+import itertools
+import numpy as np
+
+from pybraingym.parallelexperimentworker import ProcessExperimentWorker
+
+
+## ====================================================
+
+
+## Minimal replacement of PyBrain's classes used by experiment workers.
+## Each episode performs 'episodeLength' steps and updates single row of table.
+
+
+class DummyTable:
+
+    def __init__(self, numRows, numColumns):
+        self.numRows = numRows
+        self.numColumns = numColumns
+        self.params = np.zeros( numRows * numColumns )
+
+    def _setParameters(self, p, owner=None):
+        self.params = p
+
+    def getValue(self, row, column):
+        return self.params.reshape(self.numRows, self.numColumns)[row, column]
+
+    def updateValue(self, row, column, value):
+        self.params.reshape(self.numRows, self.numColumns)[row, column] = value
+
+    def getMaxAction(self, state):
+        return int( self.params.reshape(self.numRows, self.numColumns)[state].argmax() )
+
+    def activate(self, inpt):
+        return [ self.getMaxAction( int(inpt[0]) ) ]
+
+    def copy(self):
+        return copy.deepcopy( self )
+
+
+class DummyExplorer:
+
+    def __init__(self):
+        self.epsilon = 0.3
+        self.decay = 0.9999
+
+
+class DummyLearner:
+
+    def __init__(self, alpha=0.5, gamma=0.99):
+        self.alpha = alpha
+        self.gamma = gamma
+        self.explorer = DummyExplorer()
+
+
+class DummyAgent:
+
+    def __init__(self, module, learner):
+        self.module = module
+        self.learner = learner
+        self.learning = True
+
+    def learn(self):
+        self.learner.explorer.epsilon *= self.learner.explorer.decay
+
+
+class DummyTask:
+
+    def __init__(self):
+        self.cumReward = 0
+        self.closed = False
+
+    def getCumulativeReward(self):
+        return self.cumReward
+
+    def close(self):
+        self.closed = True
+
+
+class DummyExperiment:
+
+    def __init__(self, episodeLength=5, reward=1.0, delay=0.0):
+        self.task = DummyTask()
+        self.agent = DummyAgent( DummyTable(4, 2), DummyLearner() )
+        self.stepid = 0
+        self.episodeLength = episodeLength
+        self.reward = reward
+        self.delay = delay                      ## seconds of each episode
+
+    def doEpisode(self):
+        if self.delay > 0.0:
+            time.sleep( self.delay )
+        self.stepid += self.episodeLength
+        self.task.cumReward = self.reward
+        row = self.stepid % self.agent.module.numRows
+        self.agent.module.activate( [row] )
+        value = self.agent.module.getValue( row, 0 )
+        self.agent.module.updateValue( row, 0, value + self.reward )
+
+
+def dummyIteration(worker, iteration, render_steps=False):
+    worker.exp.doEpisode()
+    worker.learn()
+
+
+def createDummyWorker(episodeLength=5, reward=1.0, qualityFunctor=None, delay=0.0):
+    experiment = DummyExperiment( episodeLength, reward, delay )
+    return ProcessExperimentWorker( experiment, dummyIteration, qualityFunctor )
+
+
+_rewards = itertools.count( 1 )
+
+
+def createDifferentWorker():
+    ## each worker receives different reward
+    return createDummyWorker( reward=float( next(_rewards) ) )
+
+
+def createLocalWorker(createExperimentInstance):
+    ## worker in the same process, can be passed to MultiExperiment as 'workerFactory'
+    return createExperimentInstance()
+
+
+class WorkerFactory:
+    """Creates workers in the same process, each one with next (episode length, reward) pair of 'configs'.
+
+       Table of agent has given shape and is wrapped by 'wrapper' if given.
+    """
+
+    def __init__(self, configs, wrapper=None, tableShape=(4, 2)):
+        self.configs = list( configs )
+        self.wrapper = wrapper
+        self.tableShape = tableShape
+
+    def __call__(self):
+        episodeLength, reward = self.configs.pop( 0 )
+        experiment = DummyExperiment( episodeLength, reward )
+        module = DummyTable( *self.tableShape )
+        if self.wrapper is not None:
+            module = self.wrapper( module )
+        experiment.agent.module = module
+        return ProcessExperimentWorker( experiment, dummyIteration )
@@ -0,0 +1,76 @@
+# MIT License
+#
+# Copyright (c) 2019 Arkadiusz Netczuk <dev.arnet@gmail.com>
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+
+
+import unittest
+
+import time
+
+from pybraingym.parallelexperiment import BudgetScheduler, createExperiment, executeBudgetExperiments, executeExperiments
+from testpybraingym.dummyexperiment import createDummyWorker
+
+
+class BudgetSchedulerTest(unittest.TestCase):
+
+    def test_noBudget(self):
+        self.assertRaises( AssertionError, BudgetScheduler )
+
+    def test_initial(self):
+        scheduler = BudgetScheduler( maxSteps=100, initialEpisodes=7 )
+        self.assertEqual(scheduler.nextRound(), 7)
+
+    def test_steps(self):
+        scheduler = BudgetScheduler( maxSteps=100, initialEpisodes=4 )
+        scheduler.update( 4, 40, 1.0 )
+        self.assertEqual(scheduler.nextRound(), 4)
+        scheduler.update( 4, 40, 1.0 )
+        self.assertEqual(scheduler.nextRound(), 2)
+        scheduler.update( 2, 20, 1.0 )
+        self.assertEqual(scheduler.nextRound(), 0)
+
+    def test_roundTime(self):
+        scheduler = BudgetScheduler( maxTime=1000, roundTime=2.0, initialEpisodes=4 )
+        scheduler.update( 4, 40, 0.1 )
+        self.assertEqual(scheduler.nextRound(), 80)
+
+    def test_time(self):
+        scheduler = BudgetScheduler( maxTime=0.05 )
+        time.sleep( 0.06 )
+        self.assertEqual(scheduler.nextRound(), 0)
+
+    def test_execute(self):
+        experiment = createExperiment( 1, createDummyWorker )
+        scheduler = executeBudgetExperiments( experiment, maxSteps=100, initialEpisodes=3 )
+        self.assertEqual(scheduler.steps, 100)
+        self.assertEqual(scheduler.episodes, 20)
+
+    def test_stepsNotCounted(self):
+        ## without checkpointer and steps budget workers are not asked for steps
+        experiment = createExperiment( 1, createDummyWorker )
+        calls = []
+        experiment.getStepsCount = lambda: calls.append( 1 )
+        executeExperiments( experiment, 2, 1 )
+        scheduler = executeBudgetExperiments( experiment, maxTime=0.05, roundTime=0.01, initialEpisodes=1 )
+        self.assertEqual(calls, [])
+        self.assertGreater(scheduler.episodes, 0)
+        self.assertEqual(scheduler.steps, 0)
@@ -0,0 +1,155 @@
+# MIT License
+#
+# Copyright (c) 2019 Arkadiusz Netczuk <dev.arnet@gmail.com>
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+
+
+import unittest
+import numpy.testing as npt
+
+import os
+import tempfile
+import shutil
+
+from pybraingym.checkpoint import Checkpointer, saveCheckpoint, loadCheckpoint
+from pybraingym.parallelexperiment import MultiExperiment, executeExperiments, executeBudgetExperiments
+from pybraingym.stats import EpisodeStatistics
+from testpybraingym.dummyexperiment import DummyExperiment, createDummyWorker
+
+
+def createStatsWorker():
+    return createDummyWorker( qualityFunctor=EpisodeStatistics(10) )
+
+
+class CheckpointTest(unittest.TestCase):
+
+    def setUp(self):
+        ## Called before testfunction is executed
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join( self.directory, "state.pkl" )
+
+    def tearDown(self):
+        ## Called after testfunction was executed
+        shutil.rmtree( self.directory )
+
+    def test_save_atomic(self):
+        saveCheckpoint( self.path, {"a": 1} )
+        saveCheckpoint( self.path, {"a": 2} )
+        self.assertEqual(loadCheckpoint(self.path), {"a": 2})
+        self.assertEqual(os.listdir(self.directory), ["state.pkl"])
+
+    def test_experiment(self):
+        experiment = DummyExperiment()
+        experiment.doEpisode()
+        experiment.agent.learner.explorer.epsilon = 0.1
+        checkpointer = Checkpointer( self.path )
+        checkpointer.save( experiment, extra={"episode": 7} )
+
+        restored = DummyExperiment()
+        state = checkpointer.restore( restored )
+        self.assertEqual(state["extra"], {"episode": 7})
+        self.assertEqual(restored.stepid, 5)
+        self.assertEqual(restored.agent.learner.explorer.epsilon, 0.1)
+        npt.assert_equal(restored.agent.module.params, experiment.agent.module.params)
+
+    def test_restore_missing(self):
+        checkpointer = Checkpointer( self.path )
+        self.assertEqual(checkpointer.restore( DummyExperiment() ), None)
+
+    def test_stepInterval(self):
+        checkpointer = Checkpointer( self.path, stepInterval=12 )
+        worker = createDummyWorker()
+        worker.setCheckpointer( checkpointer )
+        worker.doExperiment( 2 )
+        self.assertFalse( os.path.isfile(self.path) )
+        worker.doExperiment( 1 )
+        self.assertEqual(loadCheckpoint(self.path)["episodes"], 3)
+
+    def test_restoredWorkerUpdate(self):
+        worker = createDummyWorker()
+        worker.setCheckpointer( Checkpointer( self.path, stepInterval=12 ) )
+        worker.doExperiment( 3 )
+        self.assertEqual(loadCheckpoint(self.path)["episodes"], 3)
+
+        restored = createDummyWorker()
+        checkpointer = Checkpointer( self.path, stepInterval=12 )
+        checkpointer.restore( restored )
+        self.assertEqual(checkpointer.lastSteps, 15)
+        restored.setCheckpointer( checkpointer )
+        ## interval counts from restored checkpoint
+        restored.doExperiment( 1 )
+        self.assertEqual(loadCheckpoint(self.path)["episodes"], 3)
+        restored.doExperiment( 2 )
+        self.assertEqual(loadCheckpoint(self.path)["episodes"], 6)
+
+    def test_worker(self):
+        worker = createStatsWorker()
+        worker.doExperiment( 3 )
+        state = worker.getState()
+
+        restored = createStatsWorker()
+        restored.setState( state )
+        self.assertEqual(restored.episodesCounter, 3)
+        self.assertEqual(restored.getQualityRate(), 3)
+        self.assertEqual(restored.getQuality().getCount(), 3)
+        self.assertEqual(restored.exp.stepid, 15)
+        npt.assert_equal(restored.getAgent().module.params, worker.getAgent().module.params)
+
+    def test_multiExperiment(self):
+        experiment = MultiExperiment( 2, createStatsWorker )
+        try:
+            experiment.doExperiment( 2 )
+            Checkpointer( self.path ).save( experiment, 20, {"round": 1} )
+        finally:
+            experiment.close()
+
+        restored = MultiExperiment( 2, createStatsWorker )
+        try:
+            checkpointer = Checkpointer( self.path )
+            state = checkpointer.restore( restored )
+            self.assertEqual(state["extra"], {"round": 1})
+            self.assertEqual(checkpointer.lastSteps, 20)
+            for worker in restored.experiments:
+                state = worker.getState()
+                self.assertEqual(state["episodes"], 2)
+                self.assertEqual(state["steps"], 10)
+        finally:
+            restored.close()
+
+    def test_resumeExecution(self):
+        experiment = MultiExperiment( 2, createDummyWorker )
+        try:
+            executeExperiments( experiment, 5, 2, Checkpointer( self.path, stepInterval=20 ) )
+        finally:
+            experiment.close()
+        self.assertEqual(loadCheckpoint(self.path)["checkpointSteps"], 100)
+
+        restored = MultiExperiment( 2, createDummyWorker )
+        try:
+            checkpointer = Checkpointer( self.path, stepInterval=20 )
+            checkpointer.restore( restored )
+            ## steps are counted from restored checkpoint, so intervals are kept
+            executeExperiments( restored, 4, 2, checkpointer )
+            self.assertEqual(loadCheckpoint(self.path)["checkpointSteps"], 180)
+            executeBudgetExperiments( restored, maxSteps=20, initialEpisodes=2, checkpointer=checkpointer )
+            self.assertEqual(loadCheckpoint(self.path)["checkpointSteps"], 200)
+        finally:
+            restored.close()
@@ -0,0 +1,145 @@
+# MIT License
+#
+# Copyright (c) 2019 Arkadiusz Netczuk <dev.arnet@gmail.com>
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+
+
+
+import unittest
+import numpy.testing as npt
+
+from pybraingym.halving import SuccessiveHalving
+from pybraingym.parallelexperiment import MultiExperiment
+from testpybraingym.dummyexperiment import createDummyWorker, createLocalWorker
+
+
+class SuccessiveHalvingTest(unittest.TestCase):
+
+    def setUp(self):
+        ## Called before testfunction is executed
+        self.halving = None
+
+    def tearDown(self):
+        ## Called after testfunction was executed
+        if self.halving is not None:
+            self.halving.close()
+
+    def test_badParameters(self):
+        configs = [ {"reward": 1.0} ]
+        self.assertRaises( AssertionError, SuccessiveHalving, createDummyWorker, configs, 1, minEpisodes=0 )
+        self.assertRaises( AssertionError, SuccessiveHalving, createDummyWorker, configs, 1, maxRungs=0 )
+        self.assertRaises( AssertionError, SuccessiveHalving, createDummyWorker, configs, 1, fraction=1.0 )
+
+    def test_rungEpisodes(self):
+        self.halving = SuccessiveHalving( createDummyWorker, [ {"reward": 1.0} ], 1, minEpisodes=3, growth=2,
+                                          workerFactory=createLocalWorker )
+        self.assertEqual(self.halving.getRungEpisodes(0), 3)
+        self.assertEqual(self.halving.getRungEpisodes(2), 12)
+
+    def test_isPromoted(self):
+        self.halving = SuccessiveHalving( createDummyWorker, [ {"reward": 1.0} ], 1, fraction=0.5,
+                                          workerFactory=createLocalWorker )
+        self.halving.rungResults[0] = [ 1.0, 2.0, 3.0, 4.0 ]
+        self.assertTrue( self.halving.isPromoted( 0, 4.0 ) )
+        self.assertTrue( self.halving.isPromoted( 0, 3.0 ) )
+        self.assertFalse( self.halving.isPromoted( 0, 2.0 ) )
+
+    def test_execute(self):
+        configs = [ {"reward": 4.0}, {"reward": 1.0}, {"reward": 3.0}, {"reward": 2.0} ]
+        self.halving = SuccessiveHalving( createDummyWorker, configs, 1, minEpisodes=2, growth=2, maxRungs=2,
+                                          workerFactory=createLocalWorker )
+        results = self.halving.execute()
+
+        ## configurations are compared with results of previous ones on the same rung
+        statuses = [ row["status"] for row in results ]
+        self.assertEqual(statuses, ["completed", "stopped", "completed", "stopped"])
+        npt.assert_equal([ row["episodes"] for row in results ], [6, 2, 6, 2])
+        npt.assert_equal([ row["steps"] for row in results ], [30, 10, 30, 10])
+        self.assertEqual(len(self.halving.rungResults[0]), 4)
+        self.assertEqual(len(self.halving.rungResults[1]), 2)
+        self.assertEqual(self.halving.getBestResult()["reward"], 4.0)
+        self.assertEqual(self.halving.getActiveCount(), 0)
+        self.assertEqual(self.halving.multiExperiment.respawnCounter, 0)
+
+    def test_slots(self):
+        configs = [ {"reward": 1.0}, {"reward": 2.0}, {"reward": 3.0} ]
+        self.halving = SuccessiveHalving( createDummyWorker, configs, 2, minEpisodes=1, maxRungs=2,
+                                          workerFactory=createLocalWorker )
+        self.assertEqual(self.halving.slots, [0, 1])
+        self.halving.execute()
+
+        self.assertEqual(self.halving.slots, [None, None])
+        self.assertEqual(len(self.halving.pending), 0)
+        for row in self.halving.results:
+            self.assertIn( row["status"], ("completed", "stopped") )
+
+    def test_slotsNotWaiting(self):
+        ## slot of fast configurations does not wait for slot of slow one
+        configs = [ {"reward": 9.0, "delay": 0.3}, {"reward": 1.0}, {"reward": 2.0}, {"reward": 3.0} ]
+        self.halving = SuccessiveHalving( createDummyWorker, configs, 2, minEpisodes=1, maxRungs=1,
+                                          workerFactory=createLocalWorker )
+        self.halving.execute()
+        experiments = self.halving.multiExperiment.experiments
+        self.assertEqual(experiments[0].getReward(), 9.0)
+        self.assertEqual(experiments[1].getReward(), 3.0)
+        for row in self.halving.results:
+            self.assertEqual(row["status"], "completed")
+
+    def test_doRound(self):
+        configs = [ {"reward": 1.0}, {"reward": 2.0} ]
+        self.halving = SuccessiveHalving( createDummyWorker, configs, 2, minEpisodes=2, maxRungs=1,
+                                          workerFactory=createLocalWorker )
+        self.assertTrue( self.halving.doRound() )
+        self.assertEqual([ row["episodes"] for row in self.halving.results ], [2, 2])
+        self.assertFalse( self.halving.doRound() )
+
+    def test_respawnedSlot(self):
+        ## chunk of respawned worker is not credited
+        self.halving = SuccessiveHalving( createDummyWorker, [ {"reward": 1.0} ], 1, minEpisodes=2,
+                                          workerFactory=createLocalWorker )
+        self.halving._updateSlot( 0, 2, None )
+        row = self.halving.results[0]
+        self.assertEqual(row["episodes"], 0)
+        self.assertEqual(row["rungEpisodes"], 0)
+        self.assertIsNone( row["quality"] )
+
+
+class ReplaceWorkerTest(unittest.TestCase):
+
+    def setUp(self):
+        ## Called before testfunction is executed
+        factories = [ lambda: createDummyWorker( reward=1.0 ), lambda: createDummyWorker( reward=2.0 ) ]
+        self.experiment = MultiExperiment( 2, factories, workerFactory=createLocalWorker )
+
+    def tearDown(self):
+        ## Called after testfunction was executed
+        self.experiment.close()
+
+    def test_factories(self):
+        self.experiment.doExperiment( 1 )
+        rewards = [ exp.getReward() for exp in self.experiment.experiments ]
+        self.assertEqual(rewards, [1.0, 2.0])
+
+    def test_replace(self):
+        self.experiment.replaceWorker( 0, lambda: createDummyWorker( reward=5.0 ) )
+        self.experiment.doExperiment( 1 )
+        self.assertEqual(self.experiment.bestExperiment, 0)
+        self.assertEqual(self.experiment.experiments[0].getReward(), 5.0)
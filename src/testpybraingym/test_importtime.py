@@ -0,0 +1,86 @@
+# MIT License
+#
+# Copyright (c) 2019 Arkadiusz Netczuk <dev.arnet@gmail.com>
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+
+
+
+import unittest
+
+import sys
+import shutil
+import subprocess
+
+from pybraingym.importtime import parseImportTime, measureModule, listModules
+
+
+OUTPUT = """import time: self [us] | cumulative | imported package
+import time:        20 |         20 |   zlib
+import time:       100 |        300 |   pybraingym
+import time:       400 |        720 | pybraingym.transfer
+"""
+
+
+class ImportTimeTest(unittest.TestCase):
+
+    def test_parse(self):
+        rows = parseImportTime( OUTPUT )
+        self.assertEqual(rows, [ (20, 20, 1, "zlib"), (100, 300, 1, "pybraingym"), (400, 720, 0, "pybraingym.transfer") ])
+
+    def test_listModules(self):
+        modules = listModules()
+        self.assertIn( "pybraingym.parallelexperiment", modules )
+        self.assertIn( "pybraingym.importtime", modules )
+
+    def test_measure(self):
+        result = measureModule( "pybraingym.experiment", 1 )
+        self.assertIsNone( result["error"] )
+        self.assertGreater( result["time"], 0.0 )
+        names = [ item[0] for item in result["imports"] ]
+        self.assertNotIn( "pybraingym", names )
+
+    def test_missingModule(self):
+        result = measureModule( "pybraingym.notexistingmodule", 1 )
+        self.assertIsNone( result["time"] )
+        self.assertIn( "ModuleNotFoundError", result["error"] )
+
+    @unittest.skipIf( shutil.which( "false" ) is None, "'false' command is not available" )
+    def test_failureWithoutOutput(self):
+        result = measureModule( "pybraingym.experiment", 1, python=shutil.which( "false" ) )
+        self.assertIsNone( result["time"] )
+        self.assertIn( "return code 1", result["error"] )
+
+    def test_lazyWorkers(self):
+        ## workers and NumPy are loaded by first use of worker class
+        code = ("import sys, pybraingym.parallelexperiment as pe; "
+                "assert 'numpy' not in sys.modules; "
+                "assert 'pybraingym.parallelexperimentworker' not in sys.modules; "
+                "assert pe.ProcessExperiment.__name__ == 'ProcessExperimentWorker'")
+        proc = subprocess.run( [sys.executable, "-c", code], stderr=subprocess.PIPE, universal_newlines=True )
+        self.assertEqual(proc.returncode, 0, proc.stderr)
+
+    def test_lazyDependencies(self):
+        ## heavy dependencies are loaded only when used
+        for name in ["pybraingym.model", "pybraingym.interface", "pybraingym.parallelexperiment",
+                     "pybraingym.halving", "pybraingym.launcher", "pybraingym.sweep", "pybraingym.remote"]:
+            result = measureModule( name, 1 )
+            self.assertIsNone( result["error"] )
+            self.assertEqual(result["heavy"], [], name)
@@ -0,0 +1,135 @@
+# MIT License
+#
+# Copyright (c) 2019 Arkadiusz Netczuk <dev.arnet@gmail.com>
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+
+
+
+import unittest
+
+import warnings
+import threading
+from multiprocessing import forkserver
+from concurrent.futures import ThreadPoolExecutor
+
+from pybraingym import launcher as launchermodule
+from pybraingym.launcher import WorkerLauncher, LauncherContext, checkForkServerInternals, makeEnv, _preparedEnvs
+from pybraingym.parallelexperiment import MultiExperiment
+from pybraingym.parallelexperimentworker import ManagedExperimentWorker
+from testpybraingym.dummyexperiment import createDummyWorker
+
+
+class DummyEnv:
+
+    def __init__(self, envId):
+        self.envId = envId
+
+
+class WorkerLauncherTest(unittest.TestCase):
+
+    def tearDown(self):
+        ## Called after testfunction was executed
+        _preparedEnvs.clear()
+
+    def test_badMethod(self):
+        self.assertRaises( AssertionError, WorkerLauncher, method="spawn" )
+
+    def check_launcher(self, launcher):
+        experiment = MultiExperiment( 2, createDummyWorker, workerFactory=launcher )
+        try:
+            experiment.doExperiment( 2 )
+            self.assertEqual(experiment.getStepsCount(), 20)
+        finally:
+            experiment.close()
+        stats = launcher.getStartupStats()
+        self.assertEqual(stats["workers"], 2)
+        self.assertEqual(len(launcher.startupTimes), 2)
+        self.assertGreaterEqual(stats["max"], stats["mean"])
+        self.assertIsNotNone( stats["warmUp"] )
+
+    def test_forkserver(self):
+        launcher = WorkerLauncher( ["testpybraingym.dummyexperiment", "notexistingmodule"] )
+        self.check_launcher( launcher )
+
+    def test_fork(self):
+        launcher = WorkerLauncher( ["testpybraingym.dummyexperiment"], method="fork" )
+        self.check_launcher( launcher )
+
+    def test_privateForkServer(self):
+        ## preload of process-wide fork server is not changed
+        preload = list( forkserver._forkserver._preload_modules )
+        launcher = WorkerLauncher( ["testpybraingym.dummyexperiment"] )
+        self.check_launcher( launcher )
+        self.assertEqual(forkserver._forkserver._preload_modules, preload)
+        self.assertEqual(launcher.context.server._preload_modules, ["testpybraingym.dummyexperiment"])
+
+    def test_forkServerInternals(self):
+        ## LauncherPopen copies private internals of CPython -- update it if this fails
+        self.assertEqual(checkForkServerInternals(), [])
+
+    def test_unsupportedPython(self):
+        supported = launchermodule.SUPPORTED_PYTHON
+        launchermodule.SUPPORTED_PYTHON = ( (2, 0), (2, 7) )
+        try:
+            self.assertRaises( RuntimeError, LauncherContext )
+            self.assertRaises( RuntimeError, WorkerLauncher )
+        finally:
+            launchermodule.SUPPORTED_PYTHON = supported
+
+    def test_forkFromThread(self):
+        launcher = WorkerLauncher( ["testpybraingym.dummyexperiment"], method="fork" )
+        launcher.warmUp()
+        with ThreadPoolExecutor( max_workers=1 ) as pool:
+            future = pool.submit( launcher, createDummyWorker )
+            self.assertRaises( RuntimeError, future.result )
+
+    def test_forkWithThreads(self):
+        launcher = WorkerLauncher( ["testpybraingym.dummyexperiment"], method="fork" )
+        stopped = threading.Event()
+        thread = threading.Thread( target=stopped.wait )
+        thread.start()
+        try:
+            with warnings.catch_warnings( record=True ) as caught:
+                warnings.simplefilter( "always" )
+                worker = launcher( createDummyWorker )
+                worker.close()
+            self.assertTrue( any( issubclass( item.category, RuntimeWarning ) for item in caught ) )
+        finally:
+            stopped.set()
+            thread.join()
+
+    def test_managed(self):
+        launcher = WorkerLauncher( ["testpybraingym.dummyexperiment"], workerClass=ManagedExperimentWorker )
+        self.check_launcher( launcher )
+
+    def test_stats(self):
+        launcher = WorkerLauncher()
+        stats = launcher.getStartupStats()
+        self.assertEqual(stats["workers"], 0)
+        self.assertIsNone( stats["mean"] )
+
+    def test_prepareEnvs(self):
+        launcher = WorkerLauncher( [], method="fork", envs=["Dummy-v0"], envFactory=DummyEnv )
+        launcher.warmUp()
+        env = makeEnv( "Dummy-v0" )
+        self.assertIsInstance( env, DummyEnv )
+        self.assertEqual(env.envId, "Dummy-v0")
+        self.assertEqual(_preparedEnvs["Dummy-v0"], [])
@@ -0,0 +1,92 @@
+# MIT License
+#
+# Copyright (c) 2019 Arkadiusz Netczuk <dev.arnet@gmail.com>
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+
+
+import unittest
+import numpy.testing as npt
+
+import numpy as np
+
+from pybraingym.merge import mergeTables, VisitWeightedMerge
+from pybraingym.interface import ActionValueTableWrapper
+from pybraingym.parallelexperiment import MultiExperiment
+from testpybraingym.dummyexperiment import WorkerFactory, createLocalWorker
+
+
+class MergeTablesTest(unittest.TestCase):
+
+    def test_weighted(self):
+        first = np.array( [1.0, 1.0, 2.0, 2.0] )
+        second = np.array( [3.0, 3.0, 4.0, 4.0] )
+        merged = mergeTables( [first, second], [np.array([1, 0]), np.array([3, 2])], 2 )
+        npt.assert_almost_equal(merged, [2.5, 2.5, 4.0, 4.0])
+
+    def test_notVisited(self):
+        first = np.array( [1.0, 2.0] )
+        second = np.array( [3.0, 6.0] )
+        merged = mergeTables( [first, second], [np.array([0]), np.array([0])], 1 )
+        npt.assert_almost_equal(merged, [2.0, 4.0])
+
+
+class VisitWeightedMergeTest(unittest.TestCase):
+
+    def test_noVisits(self):
+        merge = VisitWeightedMerge()
+        merged = merge( [np.array([1.0, 2.0]), np.array([3.0, 4.0])], [None, None] )
+        npt.assert_almost_equal(merged, [2.0, 3.0])
+
+    def test_visitsSinceLastMerge(self):
+        merge = VisitWeightedMerge()
+        merge( [np.zeros(2), np.zeros(2)], [np.array([5, 0]), np.array([1, 0])] )
+        ## only visits of last round count
+        merged = merge( [np.array([1.0, 0.0]), np.array([3.0, 0.0])], [np.array([5, 0]), np.array([2, 0])] )
+        npt.assert_almost_equal(merged, [3.0, 0.0])
+
+
+    def test_counterReset(self):
+        merge = VisitWeightedMerge()
+        merge( [np.zeros(2), np.zeros(2)], [np.array([5, 0]), np.array([4, 0])] )
+        ## second worker was respawned and counts visits from zero
+        merged = merge( [np.array([1.0, 0.0]), np.array([3.0, 0.0])], [np.array([6, 0]), np.array([3, 0])] )
+        npt.assert_almost_equal(merged, [2.5, 0.0])
+        ## next merge counts visits since reset
+        merged = merge( [np.array([1.0, 0.0]), np.array([3.0, 0.0])], [np.array([7, 0]), np.array([6, 0])] )
+        npt.assert_almost_equal(merged, [2.5, 0.0])
+
+
+class MergeMultiExperimentTest(unittest.TestCase):
+
+    def test_merge(self):
+        ## first worker visits only row 1, second worker visits only row 2
+        factory = WorkerFactory( [(5, 1.0), (2, 2.0)], ActionValueTableWrapper )
+        experiment = MultiExperiment( 2, factory, workerFactory=createLocalWorker, mergeParameters=VisitWeightedMerge() )
+        try:
+            experiment.doExperiment( 1 )
+            expected = np.zeros( (4, 2) )
+            expected[1, 0] = 1.0
+            expected[2, 0] = 2.0
+            for exp in experiment.experiments:
+                npt.assert_almost_equal(exp.getParameters(), expected.reshape(-1))
+                npt.assert_equal(exp.getVisitCounts().sum(), 1)
+        finally:
+            experiment.close()
@@ -0,0 +1,121 @@
+# MIT License
+#
+# Copyright (c) 2019 Arkadiusz Netczuk <dev.arnet@gmail.com>
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+
+
+import unittest
+import numpy.testing as npt
+
+import pickle
+import numpy as np
+
+from pybraingym.model import DiscreteModel, ModelQuality, greedyPolicy, evaluateTable
+from pybraingym.model import valueIteration, policyIteration, loadTable
+from testpybraingym.dummyexperiment import DummyTable, DummyExperiment
+
+
+## chain of states: 0 -> 1 -> 2 (terminal), action 1 moves right, action 0 stays
+## reaching terminal state gives reward 1, slippery move from state 1 stays with probability 0.5
+CHAIN = {
+    0: { 0: [(1.0, 0, 0.0, False)], 1: [(1.0, 1, 0.0, False)] },
+    1: { 0: [(1.0, 1, 0.0, False)], 1: [(0.5, 2, 1.0, True), (0.5, 1, 0.0, False)] },
+    2: { 0: [(1.0, 2, 0.0, True)], 1: [(1.0, 2, 0.0, True)] }
+}
+
+
+class DummyEnv:
+
+    def __init__(self):
+        self.P = CHAIN
+        self.isd = np.array( [1.0, 0.0, 0.0] )
+
+
+class DiscreteModelTest(unittest.TestCase):
+
+    def test_fromEnv(self):
+        model = DiscreteModel.fromEnv( DummyEnv() )
+        self.assertEqual(model.numStates, 3)
+        self.assertEqual(model.numActions, 2)
+        self.assertEqual(model.transitions.shape, (6, 3))
+        npt.assert_almost_equal(model.rewards, [0, 0, 0, 0.5, 0, 0])
+        self.assertEqual(model.transitions[5].nnz, 0)
+
+    def test_evaluatePolicy(self):
+        model = DiscreteModel.fromTransitions( CHAIN )
+        values = model.evaluatePolicy( [1, 1, 0], 0.9 )
+        v1 = 0.5 / (1 - 0.45)
+        npt.assert_almost_equal(values, [0.9 * v1, v1, 0.0])
+
+    def test_evaluatePolicy_undiscounted(self):
+        model = DiscreteModel.fromTransitions( CHAIN )
+        values = model.evaluatePolicy( [1, 1, 0], 1.0 )
+        npt.assert_almost_equal(values, [1.0, 1.0, 0.0])
+
+    def test_greedyPolicy(self):
+        npt.assert_equal(greedyPolicy( np.array([[0, 1], [2, 1]]) ), [1, 0])
+
+    def test_evaluateTable(self):
+        model = DiscreteModel.fromEnv( DummyEnv() )
+        table = DummyTable( 3, 2 )
+        table.params[:] = [0, 1, 0, 1, 0, 0]
+        npt.assert_almost_equal(evaluateTable( model, table, 1.0 ), 1.0)
+        table.params[:] = [1, 0, 0, 1, 0, 0]
+        npt.assert_almost_equal(evaluateTable( model, table, 0.9 ), 0.0)
+
+    def test_quality(self):
+        model = DiscreteModel.fromEnv( DummyEnv() )
+        experiment = DummyExperiment()
+        experiment.agent.module = DummyTable( 3, 2 )
+        experiment.agent.module.params[:] = [0, 1, 0, 1, 0, 0]
+        quality = ModelQuality( model, experiment, 0.9, period=2 )
+        expected = 0.9 * 0.5 / (1 - 0.45)
+        npt.assert_almost_equal(quality(1, 0.0), expected)
+        experiment.agent.module.params[:] = [1, 0, 0, 1, 0, 0]
+        npt.assert_almost_equal(quality(2, 0.0), expected)       ## not evaluated
+        npt.assert_almost_equal(quality(3, 0.0), 0.0)
+
+        restored = pickle.loads( pickle.dumps(quality) )
+        self.assertEqual(restored.experiment, None)
+        self.assertEqual(restored.getRate(), 0.0)
+
+
+class SolverTest(unittest.TestCase):
+
+    def test_valueIteration(self):
+        model = DiscreteModel.fromTransitions( CHAIN )
+        qvalues = valueIteration( model, 0.9 )
+        v1 = 0.5 / (1 - 0.45)
+        npt.assert_array_almost_equal(qvalues, [[0.81 * v1, 0.9 * v1], [0.9 * v1, v1], [0.0, 0.0]])
+        npt.assert_equal(greedyPolicy( qvalues )[:2], [1, 1])
+
+    def test_policyIteration(self):
+        model = DiscreteModel.fromTransitions( CHAIN )
+        qvalues = policyIteration( model, 0.9 )
+        npt.assert_array_almost_equal(qvalues, valueIteration( model, 0.9 ))
+
+    def test_loadTable(self):
+        table = DummyTable( 3, 2 )
+        loadTable( table, np.arange(6).reshape(3, 2) )
+        npt.assert_equal(table.params, [0, 1, 2, 3, 4, 5])
+
+    def test_loadTable_badSize(self):
+        self.assertRaises( AssertionError, loadTable, DummyTable( 3, 2 ), np.zeros( (2, 2) ) )
@@ -0,0 +1,141 @@
+# MIT License
+#
+# Copyright (c) 2019 Arkadiusz Netczuk <dev.arnet@gmail.com>
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+
+
+import unittest
+import numpy.testing as npt
+
+import numpy as np
+
+from pybraingym.offline import replayEpisodes, batchUpdate, episodeTransitions
+
+
+def createEpisode(states, actions, rewards, finished=True):
+    observations = list(states)
+    acts = list(actions)
+    rews = list(rewards)
+    done = [False] * len(rews)
+    if finished:
+        acts.append( np.nan )
+        rews.append( 0.0 )
+        done.append( True )
+    return { "observation": np.array( observations, dtype=float ).reshape(-1, 1),
+             "action": np.array( acts, dtype=float ).reshape(-1, 1),
+             "reward": np.array( rews, dtype=float ),
+             "done": np.array( done ) }
+
+
+def referenceLearn(values, samples, alpha, gamma, sarsa=False):
+    """Same loop as in PyBrain's Q/SARSA learners."""
+    laststate = None
+    for state, action, reward in samples:
+        if laststate is None:
+            laststate, lastaction, lastreward = state, action, reward
+            continue
+        qvalue = values[laststate, lastaction]
+        if sarsa:
+            nextValue = values[state, action]
+        else:
+            nextValue = values[state].max()
+        values[laststate, lastaction] = qvalue + alpha * (lastreward + gamma * nextValue - qvalue)
+        laststate, lastaction, lastreward = state, action, reward
+    return values
+
+
+class OfflineTest(unittest.TestCase):
+
+    def test_transitions(self):
+        episode = createEpisode( [0, 1, 2, 3], [1, 0, 1], [0, 0, 1] )
+        states, actions, rewards, nextStates, nextActions = episodeTransitions( episode )
+        npt.assert_equal(states, [0, 1, 2])
+        npt.assert_equal(actions, [1, 0, 1])
+        npt.assert_equal(rewards, [0, 0, 1])
+        npt.assert_equal(nextStates, [1, 2, 3])
+        npt.assert_equal(nextActions, [0, 1, -1])
+
+    def test_transitions_noLastReward(self):
+        episode = createEpisode( [0, 1, 2, 3], [1, 0, 1], [0, 0, 1] )
+        states, actions, rewards, nextStates, nextActions = episodeTransitions( episode, False )
+        npt.assert_equal(states, [0, 1])
+        npt.assert_equal(nextStates, [1, 2])
+        npt.assert_equal(nextActions, [0, 1])
+
+    def test_transitions_unfinished(self):
+        episode = createEpisode( [0, 1, 2], [1, 0, 1], [0, 0, 1], False )
+        states, actions, rewards, nextStates, nextActions = episodeTransitions( episode )
+        npt.assert_equal(states, [0, 1])
+        npt.assert_equal(nextActions, [0, 1])
+
+    def test_replay_q(self):
+        rand = np.random.RandomState(2)
+        states = rand.randint(0, 5, 20)
+        actions = rand.randint(0, 3, 19)
+        rewards = rand.rand(19)
+        episode = createEpisode( states, actions, rewards )
+
+        values = replayEpisodes( np.zeros((5, 3)), [episode, episode], 0.3, 0.9, "q" )
+
+        samples = list( zip(states[:-1], actions, rewards) )
+        samples.append( (states[-1], 0, rewards[-1]) )
+        expected = np.zeros((5, 3))
+        referenceLearn( expected, samples, 0.3, 0.9 )
+        referenceLearn( expected, samples, 0.3, 0.9 )
+        npt.assert_array_almost_equal(values, expected)
+
+    def test_replay_sarsa(self):
+        rand = np.random.RandomState(3)
+        states = rand.randint(0, 5, 20)
+        actions = rand.randint(0, 3, 19)
+        rewards = rand.rand(19)
+        episode = createEpisode( states, actions, rewards )
+
+        values = replayEpisodes( np.zeros((5, 3)), [episode], 0.5, 0.99, "sarsa", False )
+
+        samples = list( zip(states[:-1], actions, rewards) )
+        expected = referenceLearn( np.zeros((5, 3)), samples, 0.5, 0.99, True )
+        npt.assert_array_almost_equal(values, expected)
+
+    def test_replay_badMethod(self):
+        self.assertRaises( ValueError, replayEpisodes, np.zeros((2, 2)), [], 0.1, 0.9, "td" )
+
+    def test_batchUpdate(self):
+        values = np.zeros( (3, 2) )
+        values[2] = [1.0, 2.0]
+        states = np.array( [0, 0, 1] )
+        actions = np.array( [1, 1, 0] )
+        rewards = np.array( [1.0, 3.0, 0.0] )
+        nextStates = np.array( [2, 2, 2] )
+        batchUpdate( values, states, actions, rewards, nextStates, 0.5, 0.5 )
+        npt.assert_array_almost_equal(values, [[0.0, 1.5], [0.5, 0.0], [1.0, 2.0]])
+
+    def test_batchUpdate_view(self):
+        ## table is not contiguous view (e.g. transposed), it has to be updated in place
+        transposed = np.zeros( (2, 3) ).T
+        transposed[2] = [1.0, 2.0]
+        states = np.array( [0, 0, 1] )
+        actions = np.array( [1, 1, 0] )
+        rewards = np.array( [1.0, 3.0, 0.0] )
+        nextStates = np.array( [2, 2, 2] )
+        batchUpdate( transposed, states, actions, rewards, nextStates, 0.5, 0.5 )
+        self.assertFalse( transposed.flags.c_contiguous )
+        npt.assert_array_almost_equal(transposed, [[0.0, 1.5], [0.5, 0.0], [1.0, 2.0]])
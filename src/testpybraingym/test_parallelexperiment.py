@@ -0,0 +1,335 @@
+# MIT License
+#
+# Copyright (c) 2019 Arkadiusz Netczuk <dev.arnet@gmail.com>
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+
+
+import unittest
+import numpy.testing as npt
+
+import os
+import time
+import shutil
+import tempfile
+import functools
+import numpy as np
+
+from pybraingym.parallelexperiment import MultiExperiment, executeBalancedExperiments
+from pybraingym.parallelexperimentworker import ManagedExperimentWorker, PipeExperimentWorker
+from pybraingym.parallelexperimentworker import ProcessExperimentWorker
+from testpybraingym.dummyexperiment import createDummyWorker, DummyExperiment, dummyIteration
+from testpybraingym.dummyexperiment import createDifferentWorker, createLocalWorker
+
+
+class DyingExperiment(DummyExperiment):
+
+    def __init__(self, killPath):
+        DummyExperiment.__init__( self )
+        self.killPath = killPath
+
+    def doEpisode(self):
+        try:
+            ## only one worker takes the file
+            os.rename( self.killPath, self.killPath + ".taken" )
+        except OSError:
+            DummyExperiment.doEpisode( self )
+            return
+        with open( self.killPath + ".taken" ) as killFile:
+            if killFile.read() == "error":
+                raise ValueError( "experiment error" )
+        os._exit( 1 )
+
+
+def createDyingWorker(killPath):
+    return ProcessExperimentWorker( DyingExperiment( killPath ), dummyIteration )
+
+
+class MultiExperimentTest(unittest.TestCase):
+
+    def setUp(self):
+        ## Called before testfunction is executed
+        self.experiment = MultiExperiment( 2, createDummyWorker )
+
+    def tearDown(self):
+        ## Called after testfunction was executed
+        self.experiment.close()
+
+    def test_doExperiment(self):
+        self.experiment.doExperiment( 3 )
+        self.assertEqual(self.experiment.getStepsCount(), 30)
+        self.assertEqual(self.experiment.getCumulativeReward(), 3)
+
+    def test_pool_reused(self):
+        pool = self.experiment.pool
+        for _ in range(0, 3):
+            self.experiment.doExperiment( 1 )
+        self.assertIs(self.experiment.pool, pool)
+
+    def test_close(self):
+        self.experiment.close()
+        self.assertRaises( RuntimeError, self.experiment.pool.submit, int )
+
+
+class SharedParametersMultiExperimentTest(unittest.TestCase):
+
+    def check_propagate(self, workerFactory):
+        experiment = MultiExperiment( 3, createDifferentWorker, workerFactory=workerFactory, sharedParameters=True )
+        try:
+            experiment.doExperiment( 2 )
+            best = experiment.bestExperiment
+            bestParams = experiment.experiments[ best ].getParameters()
+            for exp in experiment.experiments:
+                npt.assert_equal(exp.getParameters(), bestParams)
+            ## module works on shared memory
+            npt.assert_equal(experiment.sharedBlocks[0].array, bestParams)
+        finally:
+            experiment.close()
+
+    def test_propagate_managed(self):
+        self.check_propagate( ManagedExperimentWorker )
+
+    def test_propagate_pipe(self):
+        self.check_propagate( PipeExperimentWorker )
+
+
+class SharedMetricsMultiExperimentTest(unittest.TestCase):
+
+    def check_metrics(self, workerFactory):
+        experiment = MultiExperiment( 3, createDifferentWorker, workerFactory=workerFactory, sharedMetrics=True )
+        try:
+            startTime = time.time()
+            experiment.doExperiment( 2 )
+            metrics = experiment.getMetrics()
+            npt.assert_equal(metrics["episodes"], [2, 2, 2])
+            npt.assert_equal(metrics["steps"], [10, 10, 10])
+            npt.assert_equal(metrics["roundSteps"], [10, 10, 10])
+            rates = [ exp.getQualityRate() for exp in experiment.experiments ]
+            npt.assert_equal(metrics["quality"], rates)
+            rewards = [ exp.getReward() for exp in experiment.experiments ]
+            npt.assert_equal(metrics["reward"], rewards)
+            self.assertTrue( (metrics["startTime"] >= startTime).all() )
+            self.assertTrue( (metrics["updateTime"] >= metrics["startTime"]).all() )
+            self.assertEqual(experiment.bestExperiment, rates.index( max(rates) ))
+            self.assertEqual(experiment.getStepsCount(), 30)
+        finally:
+            experiment.close()
+        self.assertIsNone( experiment.getMetrics() )
+
+    def test_metrics_managed(self):
+        self.check_metrics( ManagedExperimentWorker )
+
+    def test_metrics_pipe(self):
+        self.check_metrics( PipeExperimentWorker )
+
+    def test_replaceWorker(self):
+        experiment = MultiExperiment( 2, createDummyWorker, workerFactory=PipeExperimentWorker, sharedMetrics=True )
+        try:
+            experiment.doExperiment( 2 )
+            experiment.replaceWorker( 1, functools.partial( createDummyWorker, reward=3.0 ) )
+            npt.assert_equal(experiment.getMetrics()["episodes"], [2, 0])
+            experiment.doExperiment( 1 )
+            self.assertEqual(experiment.bestExperiment, 1)
+            npt.assert_equal(experiment.getMetrics()["episodes"], [3, 1])
+        finally:
+            experiment.close()
+
+
+class AsyncMultiExperimentTest(unittest.TestCase):
+
+    def test_doAsyncExperiment(self):
+        experiment = MultiExperiment( 3, createDifferentWorker, workerFactory=PipeExperimentWorker )
+        try:
+            experiment.doAsyncExperiment( 6, 2 )
+            rates = [ exp.getQualityRate() for exp in experiment.experiments ]
+            self.assertEqual(experiment.bestExperiment, rates.index( max(rates) ))
+            for exp in experiment.experiments:
+                self.assertEqual(exp.getState()["episodes"], 6)
+            bestRate, bestParams = experiment.asyncBest
+            self.assertEqual(bestRate, max(rates))
+        finally:
+            experiment.close()
+
+    def test_propagate(self):
+        experiment = MultiExperiment( 2, createDifferentWorker, workerFactory=PipeExperimentWorker )
+        try:
+            experiment.doAsyncExperiment( 1, 1 )
+            ## worker finishing second is either better or receives parameters of the first one
+            bestRate, bestParams = experiment.asyncBest
+            bestExp = experiment.experiments[ experiment.bestExperiment ]
+            npt.assert_equal(bestExp.getParameters(), bestParams)
+        finally:
+            experiment.close()
+
+
+class HogwildMultiExperimentTest(unittest.TestCase):
+
+    def check_hogwild(self, workerFactory):
+        experiment = MultiExperiment( 3, createDummyWorker, workerFactory=workerFactory, hogwild=True )
+        try:
+            experiment.doExperiment( 2 )
+            self.assertEqual(len(experiment.sharedBlocks), 1)
+            table = experiment.sharedBlocks[0].array
+            for exp in experiment.experiments:
+                npt.assert_equal(exp.getParameters(), table)
+            ## each worker adds 2 to the table, updates are not locked, so some could be lost
+            self.assertGreater(table.sum(), 2.0)
+            self.assertLessEqual(table.sum(), 6.0)
+        finally:
+            experiment.close()
+
+    def test_hogwild_managed(self):
+        self.check_hogwild( ManagedExperimentWorker )
+
+    def test_hogwild_pipe(self):
+        self.check_hogwild( PipeExperimentWorker )
+
+    def test_doAsyncExperiment(self):
+        experiment = MultiExperiment( 2, createDummyWorker, workerFactory=PipeExperimentWorker, hogwild=True )
+        try:
+            experiment.doAsyncExperiment( 2, 1 )
+            self.assertIsNone(experiment.asyncBest)
+            npt.assert_equal(experiment.experiments[0].getParameters(), experiment.experiments[1].getParameters())
+        finally:
+            experiment.close()
+
+
+class RespawnMultiExperimentTest(unittest.TestCase):
+
+    def setUp(self):
+        ## Called before testfunction is executed
+        self.directory = tempfile.mkdtemp()
+        self.killPath = os.path.join( self.directory, "kill" )
+        factory = functools.partial( createDyingWorker, self.killPath )
+        self.experiment = MultiExperiment( 3, factory, workerFactory=PipeExperimentWorker, respawnWorkers=True )
+
+    def tearDown(self):
+        ## Called after testfunction was executed
+        self.experiment.close()
+        shutil.rmtree( self.directory )
+
+    def test_killedBetweenRounds(self):
+        self.experiment.doExperiment( 2 )
+        bestParams = self.experiment.bestParameters
+        dead = self.experiment.experiments[1]
+        dead.process.terminate()
+        dead.process.join()
+        self.assertFalse( dead.isAlive() )
+
+        self.assertEqual(self.experiment.checkWorkers(), [1])
+        self.assertEqual(self.experiment.respawnCounter, 1)
+        npt.assert_equal(self.experiment.experiments[1].getParameters(), bestParams)
+
+    def test_diedBeforeMerge(self):
+        self.experiment.doExperiment( 2 )
+        self.experiment.mergeParameters = lambda paramsList, visitsList: np.mean( paramsList, axis=0 )
+        dead = self.experiment.experiments[1]
+        dead.process.terminate()
+        dead.process.join()
+
+        self.experiment._mergeWorkersParameters()
+        self.assertEqual(self.experiment.respawnCounter, 1)
+        params = self.experiment.experiments[0].getParameters()
+        for exp in self.experiment.experiments:
+            npt.assert_equal(exp.getParameters(), params)
+
+    def test_diedDuringRound(self):
+        self.experiment.doExperiment( 2 )
+        bestParams = self.experiment.bestParameters
+        open( self.killPath, "w" ).close()
+        self.experiment.doExperiment( 2 )
+        self.assertEqual(self.experiment.respawnCounter, 1)
+        for exp in self.experiment.experiments:
+            self.assertTrue( exp.isAlive() )
+        ## two workers finished round, respawned one received parameters of previous round
+        steps = [ exp.getStepsCount() for exp in self.experiment.experiments ]
+        self.assertEqual(sorted(steps), [0, 10, 10])
+        respawned = steps.index( 0 )
+        npt.assert_equal(self.experiment.experiments[ respawned ].getParameters(), bestParams)
+
+    def test_diedDuringAsyncRound(self):
+        open( self.killPath, "w" ).close()
+        self.experiment.doAsyncExperiment( 4, 2 )
+        self.assertEqual(self.experiment.respawnCounter, 1)
+        for exp in self.experiment.experiments:
+            self.assertTrue( exp.isAlive() )
+
+    def test_errorNotRespawned(self):
+        with open( self.killPath, "w" ) as killFile:
+            killFile.write( "error" )
+        ## worker is alive, so error is passed to caller
+        self.assertRaises( ValueError, self.experiment.doExperiment, 1 )
+        self.assertEqual(self.experiment.respawnCounter, 0)
+
+
+class SlowExperiment(DummyExperiment):
+
+    def doEpisode(self):
+        ## each step takes the same time
+        time.sleep( 0.001 * self.episodeLength )
+        DummyExperiment.doEpisode( self )
+
+
+class SlowWorkerFactory:
+
+    def __init__(self, episodeLengths):
+        self.episodeLengths = list( episodeLengths )
+
+    def __call__(self):
+        experiment = SlowExperiment( self.episodeLengths.pop( 0 ) )
+        return ProcessExperimentWorker( experiment, dummyIteration )
+
+
+class BalancedMultiExperimentTest(unittest.TestCase):
+
+    def test_doBalancedExperiment(self):
+        factory = SlowWorkerFactory( [1, 4] )
+        experiment = MultiExperiment( 2, factory, workerFactory=createLocalWorker )
+        try:
+            experiment.doBalancedExperiment( 80 )
+            steps = experiment.getStepsCount()
+            self.assertGreaterEqual(steps, 80)
+            self.assertLessEqual(steps, 80 + 1 + 4)
+            ## worker with short episodes executes more of them
+            self.assertGreater(experiment.roundEpisodes[0], 2 * experiment.roundEpisodes[1])
+            self.assertEqual(experiment.roundSteps[1], 4 * experiment.roundEpisodes[1])
+
+            experiment.doExperiment( 1 )
+            self.assertEqual(experiment.getStepsCount(), 5)
+        finally:
+            experiment.close()
+
+    def test_pipe(self):
+        experiment = MultiExperiment( 2, createDummyWorker, workerFactory=PipeExperimentWorker )
+        try:
+            experiment.doBalancedExperiment( 50, 2 )
+            self.assertEqual(experiment.getStepsCount(), sum( experiment.roundSteps ))
+            self.assertGreaterEqual(experiment.getStepsCount(), 50)
+            self.assertIsNotNone(experiment.bestExperiment)
+        finally:
+            experiment.close()
+
+    def test_execute(self):
+        experiment = MultiExperiment( 2, createDummyWorker, workerFactory=PipeExperimentWorker )
+        try:
+            executeBalancedExperiments( experiment, 2, 20, 1 )
+            self.assertGreaterEqual(experiment.getStepsCount(), 20)
+        finally:
+            experiment.close()
@@ -0,0 +1,173 @@
+# MIT License
+#
+# Copyright (c) 2019 Arkadiusz Netczuk <dev.arnet@gmail.com>
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+
+
+import unittest
+import numpy.testing as npt
+
+import functools
+import numpy as np
+from concurrent.futures import ThreadPoolExecutor
+
+from pybraingym.parallelexperimentworker import AbstractExperimentWorker, PipeExperimentWorker, ManagedExperimentWorker
+from pybraingym.transfer import decodeRows
+from pybraingym.parallelexperiment import MultiExperiment
+from pybraingym.stats import EpisodeStatistics
+from testpybraingym.dummyexperiment import DummyExperiment, createDummyWorker
+
+
+def createStatsWorker():
+    return createDummyWorker( qualityFunctor=EpisodeStatistics(2) )
+
+
+def createBrokenWorker():
+    raise ValueError("broken")
+
+
+
+class LegacyWorker(AbstractExperimentWorker):
+    ## implements only methods of first version of interface
+
+    def __init__(self):
+        self.exp = DummyExperiment()
+
+    def getAgent(self):
+        return self.exp.agent
+
+    def setAgent(self, newAgent):
+        self.exp.agent = newAgent
+
+    def doExperiment(self, number=1, render_steps=False):
+        for _ in range(0, number):
+            self.exp.doEpisode()
+
+    def getReward(self):
+        return self.exp.task.getCumulativeReward()
+
+    def getCumulativeReward(self):
+        return self.getReward()
+
+    def getQualityRate(self):
+        return self.getReward()
+
+    def evaluate(self, number=1):
+        return []
+
+    def demonstrate(self):
+        return self.getReward()
+
+    def close(self):
+        pass
+
+
+class LegacyWorkerTest(unittest.TestCase):
+
+    def test_defaults(self):
+        worker = LegacyWorker()
+        self.assertTrue( worker.isAlive() )
+        self.assertIsNone( worker.getVisitCounts() )
+        self.assertIsNone( worker.getDirtyRows() )
+        worker.setParameters( np.arange( 8.0 ) )
+        npt.assert_equal(worker.getParameters(), np.arange( 8.0 ))
+        rows, values = decodeRows( worker.getRows( [1] ) )
+        npt.assert_equal(values, [[2.0, 3.0]])
+        self.assertRaises( NotImplementedError, worker.shareParameters, "block" )
+
+class PipeExperimentWorkerTest(unittest.TestCase):
+
+    def setUp(self):
+        ## Called before testfunction is executed
+        self.worker = PipeExperimentWorker( createStatsWorker )
+
+    def tearDown(self):
+        ## Called after testfunction was executed
+        self.worker.close()
+
+    def test_doExperiment(self):
+        steps = self.worker.doExperiment( 3 )
+        self.assertEqual(steps, 15)
+        self.assertEqual(self.worker.getQualityRate(), 2)
+        self.assertEqual(self.worker.getCumulativeReward(), 3)
+        self.assertEqual(self.worker.getReward(), 1)
+        self.assertEqual(self.worker.getStepsCount(), 15)
+
+    def test_proxy(self):
+        self.worker.doExperiment( 3 )
+        quality = self.worker.exp.getQuality()
+        self.assertEqual(quality.getCount(), 3)
+
+    def test_state(self):
+        self.worker.doExperiment( 2 )
+        state = self.worker.getState()
+        self.assertEqual(state["episodes"], 2)
+        state["qualityRate"] = 10
+        self.worker.setState( state )
+        self.assertEqual(self.worker.getQualityRate(), 10)
+
+    def test_agent(self):
+        self.worker.doExperiment( 1 )
+        agent = self.worker.getAgent()
+        agent.module.params[:] = 7
+        self.worker.setAgent( agent )
+        npt.assert_equal(self.worker.getAgent().module.params, 7)
+
+    def test_error(self):
+        self.assertRaises( AttributeError, self.worker.call, "missingMethod" )
+        self.worker.doExperiment( 1 )
+        self.assertEqual(self.worker.getStepsCount(), 5)
+
+    def test_create_error(self):
+        self.assertRaises( ValueError, PipeExperimentWorker, createBrokenWorker )
+
+    def test_close(self):
+        self.worker.close()
+        self.assertFalse( self.worker.process.is_alive() )
+
+
+class PipeMultiExperimentTest(unittest.TestCase):
+
+    def test_doExperiment(self):
+        experiment = MultiExperiment( 3, createDummyWorker, workerFactory=PipeExperimentWorker )
+        try:
+            experiment.doExperiment( 2 )
+            self.assertEqual(experiment.getStepsCount(), 30)
+            self.assertEqual(experiment.getBestExperiment().getQualityRate(), 1)
+        finally:
+            experiment.close()
+
+
+class ManagedExperimentWorkerTest(unittest.TestCase):
+
+    def test_concurrentCreation(self):
+        ## each worker has to be created by its own factory
+        factories = [ functools.partial( createDummyWorker, reward=float(i) ) for i in range(0, 6) ]
+        with ThreadPoolExecutor( max_workers=6 ) as pool:
+            workers = list( pool.map( ManagedExperimentWorker, factories ) )
+        try:
+            for i in range(0, len(workers)):
+                steps = workers[i].doExperiment( 1 )
+                self.assertEqual(steps, 5)
+                self.assertEqual(workers[i].getReward(), float(i))
+        finally:
+            for worker in workers:
+                worker.close()
@@ -0,0 +1,75 @@
+# MIT License
+#
+# Copyright (c) 2019 Arkadiusz Netczuk <dev.arnet@gmail.com>
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+
+
+import unittest
+import numpy.testing as npt
+
+from pybraingym.parallelexperiment import MultiExperiment
+from pybraingym.pbt import PopulationBasedTraining
+from testpybraingym.dummyexperiment import createDifferentWorker, createLocalWorker
+
+
+class PopulationBasedTrainingTest(unittest.TestCase):
+
+    def setUp(self):
+        ## Called before testfunction is executed
+        self.experiment = MultiExperiment( 4, createDifferentWorker, workerFactory=createLocalWorker )
+
+    def tearDown(self):
+        ## Called after testfunction was executed
+        self.experiment.close()
+
+    def test_explore(self):
+        pbt = PopulationBasedTraining( self.experiment, perturbations=(2.0,) )
+        ret = pbt.explore( {"alpha": 0.3, "gamma": 0.9, "epsilon": 0.7} )
+        self.assertEqual(ret, {"alpha": 0.6, "gamma": 0.9, "epsilon": 1.0})
+
+    def test_step(self):
+        pbt = PopulationBasedTraining( self.experiment, fraction=0.25, perturbations=(0.5,), seed=1 )
+        self.experiment.doExperiment( 2 )
+        rates = [ exp.getQualityRate() for exp in self.experiment.experiments ]
+        worst = rates.index( min(rates) )
+        best = rates.index( max(rates) )
+        bestHyper = self.experiment.experiments[ best ].getHyperParameters()
+        pbt.step()
+
+        self.assertEqual(len(pbt.lineage), 1)
+        event = pbt.lineage[0]
+        self.assertEqual(event["worker"], worst)
+        self.assertEqual(event["parent"], best)
+        experiments = self.experiment.experiments
+        npt.assert_equal(experiments[worst].getParameters(), experiments[best].getParameters())
+        hyper = experiments[worst].getHyperParameters()
+        self.assertAlmostEqual(hyper["alpha"], bestHyper["alpha"] * 0.5)
+        self.assertAlmostEqual(hyper["epsilon"], bestHyper["epsilon"] * 0.5)
+        self.assertEqual(hyper["gamma"], bestHyper["gamma"])
+        self.assertEqual(pbt.getLineage( worst ), [best])
+        self.assertEqual(len(pbt.trajectories), 1)
+
+    def test_execute(self):
+        pbt = PopulationBasedTraining( self.experiment, fraction=0.5, seed=2 )
+        pbt.randomize()
+        pbt.execute( 3, 1 )
+        self.assertEqual(len(pbt.trajectories), 3)
+        self.assertEqual(len(pbt.lineage), 6)
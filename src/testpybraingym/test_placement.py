@@ -0,0 +1,109 @@
+# MIT License
+#
+# Copyright (c) 2019 Arkadiusz Netczuk <dev.arnet@gmail.com>
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+
+
+import unittest
+
+import os
+import warnings
+from multiprocessing import Process, Queue
+
+from pybraingym.placement import planPlacement, availableCpus, PlacedFactory, hasThreadsControl, THREADS_VARIABLES
+from pybraingym.parallelexperiment import MultiExperiment
+from pybraingym.parallelexperimentworker import PipeExperimentWorker
+from testpybraingym.dummyexperiment import createDummyWorker
+
+
+def readPlacement():
+    return ( sorted( os.sched_getaffinity(0) ), os.environ["OPENBLAS_NUM_THREADS"] )
+
+
+def checkPlacement(queue, cpus):
+    factory = PlacedFactory( readPlacement, cpus, 1 )
+    queue.put( factory() )
+
+
+class PlanPlacementTest(unittest.TestCase):
+
+    def test_split(self):
+        placement = planPlacement( 3, range(0, 8) )
+        self.assertEqual(placement, [[0, 1, 2], [3, 4, 5], [6, 7]])
+
+    def test_roundRobin(self):
+        placement = planPlacement( 5, [2, 3] )
+        self.assertEqual(placement, [[2], [3], [2], [3], [2]])
+
+    def test_default(self):
+        placement = planPlacement( 1 )
+        self.assertEqual(placement, [ availableCpus() ])
+
+
+class PlacedFactoryTest(unittest.TestCase):
+
+    @unittest.skipUnless( hasattr(os, "sched_setaffinity"), "affinity not supported" )
+    def test_call(self):
+        cpus = availableCpus()[:1]
+        queue = Queue()
+        proc = Process( target=checkPlacement, args=(queue, cpus) )
+        proc.start()
+        affinity, threads = queue.get( timeout=10 )
+        proc.join()
+        self.assertEqual(affinity, cpus)
+        self.assertEqual(threads, "1")
+
+
+class PlacementMultiExperimentTest(unittest.TestCase):
+
+    def setUp(self):
+        ## Called before testfunction is executed
+        self.environ = dict( os.environ )
+
+    def tearDown(self):
+        ## Called after testfunction was executed
+        os.environ.clear()
+        os.environ.update( self.environ )
+
+    def test_auto(self):
+        with warnings.catch_warnings():
+            ## threadpoolctl may be missing
+            warnings.simplefilter( "ignore" )
+            experiment = MultiExperiment( 2, createDummyWorker, workerFactory=PipeExperimentWorker,
+                                          placement="auto", threadsNumber=3 )
+        try:
+            ## variables are set before workers are started
+            for name in THREADS_VARIABLES:
+                self.assertEqual(os.environ[ name ], "3")
+            self.assertEqual(experiment.placement, planPlacement( 2 ))
+            experiment.doExperiment( 2 )
+            self.assertEqual(experiment.getStepsCount(), 20)
+        finally:
+            experiment.close()
+
+    @unittest.skipIf( hasThreadsControl(), "threadpoolctl is installed" )
+    def test_missingThreadsControl(self):
+        with self.assertWarns( RuntimeWarning ):
+            experiment = MultiExperiment( 1, createDummyWorker, workerFactory=PipeExperimentWorker, threadsNumber=1 )
+        experiment.close()
+
+    def test_invalid(self):
+        self.assertRaises( AssertionError, MultiExperiment, 2, createDummyWorker, placement=[[0]] )
@@ -0,0 +1,154 @@
+# MIT License
+#
+# Copyright (c) 2019 Arkadiusz Netczuk <dev.arnet@gmail.com>
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+
+
+import unittest
+
+import time
+import queue
+
+from pybraingym.progress import ProgressChannel, ProgressReporter, ProgressAggregator
+from pybraingym.parallelexperiment import MultiExperiment
+from pybraingym.parallelexperimentworker import PipeExperimentWorker
+from testpybraingym.dummyexperiment import createDummyWorker
+
+
+class ProgressChannelStub:
+
+    def __init__(self, channelQueue):
+        self.queue = channelQueue
+
+    def get(self, timeout=None):
+        try:
+            return self.queue.get( timeout=timeout )
+        except queue.Empty:
+            return None
+
+
+class ProgressReporterTest(unittest.TestCase):
+
+    def test_batch(self):
+        channelQueue = queue.Queue( 10 )
+        reporter = ProgressReporter( channelQueue, 3, 2 )
+        reporter.report( 1, 1.0, 5 )
+        self.assertTrue( channelQueue.empty() )
+        reporter.report( 2, 0.0, 10 )
+        dropped, batch = channelQueue.get_nowait()
+        self.assertEqual(dropped, 0)
+        self.assertEqual(len(batch), 2)
+        self.assertEqual(batch[1][:4], (3, 2, 0.0, 10))
+
+    def test_baseSteps(self):
+        channelQueue = queue.Queue( 10 )
+        reporter = ProgressReporter( channelQueue, 0, 1, 100 )
+        reporter.report( 1, 1.0, 105 )
+        _, batch = channelQueue.get_nowait()
+        self.assertEqual(batch[0][3], 5)
+
+    def test_dropped(self):
+        channelQueue = queue.Queue( 1 )
+        reporter = ProgressReporter( channelQueue, 0, 1 )
+        reporter.report( 1, 1.0, 5 )
+        reporter.report( 2, 1.0, 10 )
+        self.assertEqual(reporter.dropped, 1)
+        self.assertEqual(channelQueue.qsize(), 1)
+
+        ## number of dropped records is sent with next batch
+        channelQueue.get_nowait()
+        reporter.report( 3, 1.0, 15 )
+        dropped, batch = channelQueue.get_nowait()
+        self.assertEqual(dropped, 1)
+        self.assertEqual(len(batch), 1)
+        self.assertEqual(reporter.unreported, 0)
+
+
+class ProgressAggregatorTest(unittest.TestCase):
+
+    def test_add(self):
+        records = []
+        aggregator = ProgressAggregator( None, window=2, curvePeriod=2 )
+        aggregator.addCallback( lambda aggr, record: records.append( record ) )
+        aggregator.add( [ (0, 1, 1.0, 5, 0.0), (0, 2, 3.0, 10, 0.0), (1, 1, 4.0, 7, 0.0) ] )
+        self.assertEqual(len(records), 3)
+        self.assertEqual(aggregator.getEpisodesCount(), 3)
+        self.assertEqual(aggregator.getStepsCount(), 17)
+        self.assertEqual(aggregator.getCurve( 0 ), [ (2, 2.0) ])
+        self.assertEqual(aggregator.getCurve( 1 ), [])
+        self.assertEqual(aggregator.getMeanReward(), 3.0)
+
+    def test_addBatch(self):
+        aggregator = ProgressAggregator( None )
+        aggregator.addBatch( (2, [ (0, 1, 1.0, 5, 0.0) ]) )
+        aggregator.addBatch( (3, []) )
+        self.assertEqual(aggregator.getDroppedCount(), 5)
+        self.assertEqual(aggregator.getEpisodesCount(), 1)
+
+    def test_counterReset(self):
+        aggregator = ProgressAggregator( None )
+        aggregator.add( [ (0, 1, 1.0, 5, 0.0), (0, 2, 1.0, 10, 0.0) ] )
+        ## respawned worker starts counting from zero
+        aggregator.add( [ (0, 1, 1.0, 5, 0.0) ] )
+        self.assertEqual(aggregator.getStepsCount(), 15)
+
+    def test_throughputBaseline(self):
+        channel = queue.Queue()
+        aggregator = ProgressAggregator( ProgressChannelStub( channel ) )
+        aggregator.add( [ (0, 1, 1.0, 1000, 0.0) ] )
+        aggregator.start()
+        aggregator.add( [ (0, 2, 1.0, 1010, 0.0) ] )
+        aggregator.stop()
+        aggregator.startTime = time.time() - 2.0
+        episodesRate, stepsRate = aggregator.getThroughput()
+        self.assertAlmostEqual(episodesRate, 0.5, places=2)
+        self.assertAlmostEqual(stepsRate, 5.0, places=2)
+
+    def test_stopDrains(self):
+        channel = queue.Queue()
+        aggregator = ProgressAggregator( ProgressChannelStub( channel ) )
+        aggregator.stopped.set()
+        channel.put( (1, [ (0, 1, 1.0, 5, 0.0) ]) )
+        channel.put( (0, [ (1, 1, 1.0, 5, 0.0) ]) )
+        aggregator.stop()
+        self.assertEqual(aggregator.getEpisodesCount(), 2)
+        self.assertEqual(aggregator.getDroppedCount(), 1)
+
+
+class ProgressMultiExperimentTest(unittest.TestCase):
+
+    def test_stream(self):
+        channel = ProgressChannel( 100, 2 )
+        aggregator = ProgressAggregator( channel )
+        aggregator.start()
+        experiment = MultiExperiment( 2, createDummyWorker, workerFactory=PipeExperimentWorker, progress=channel )
+        try:
+            experiment.doExperiment( 3 )
+            endTime = time.time() + 10
+            while aggregator.getEpisodesCount() < 6 and time.time() < endTime:
+                time.sleep( 0.01 )
+            self.assertEqual(aggregator.getEpisodesCount(), 6)
+            self.assertEqual(aggregator.getStepsCount(), 30)
+            self.assertEqual(aggregator.getMeanReward(), 1.0)
+        finally:
+            experiment.close()
+            aggregator.stop()
+            channel.close()
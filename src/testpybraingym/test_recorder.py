@@ -0,0 +1,148 @@
+# MIT License
+#
+# Copyright (c) 2019 Arkadiusz Netczuk <dev.arnet@gmail.com>
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+
+
+import unittest
+import numpy.testing as npt
+
+import os
+import tempfile
+import shutil
+import numpy as np
+
+from pybraingym.recorder import TrajectoryRecorder, TrajectoryReader, columnPath
+
+
+class TrajectoryRecorderTest(unittest.TestCase):
+
+    def setUp(self):
+        ## Called before testfunction is executed
+        self.directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        ## Called after testfunction was executed
+        shutil.rmtree( self.directory )
+
+    def recordEpisode(self, recorder, length, observation=0):
+        recorder.newEpisode()
+        for i in range(0, length):
+            recorder.record( [observation + i], [i % 2], 1.0 )
+        recorder.recordTerminal( [observation + length] )
+
+    def test_badChunkSize(self):
+        self.assertRaises( AssertionError, TrajectoryRecorder, self.directory, 0 )
+
+    def test_record(self):
+        recorder = TrajectoryRecorder( self.directory, 100 )
+        self.recordEpisode( recorder, 3 )
+        recorder.close()
+
+        reader = TrajectoryReader( self.directory )
+        self.assertEqual(reader.numRows(), 4)
+        self.assertEqual(reader.numEpisodes(), 1)
+        episode = reader.getEpisode( 0 )
+        npt.assert_equal(episode["observation"], [[0], [1], [2], [3]])
+        npt.assert_equal(episode["action"][:3], [[0], [1], [0]])
+        self.assertTrue( np.isnan( episode["action"][3][0] ) )
+        npt.assert_equal(episode["reward"], [1, 1, 1, 0])
+        npt.assert_equal(episode["done"], [False, False, False, True])
+        npt.assert_equal(episode["episode"], [0, 0, 0, 0])
+
+    def test_memmap(self):
+        recorder = TrajectoryRecorder( self.directory, 100 )
+        self.recordEpisode( recorder, 3 )
+        recorder.close()
+
+        reader = TrajectoryReader( self.directory )
+        chunk = reader.getChunk( 0 )
+        self.assertIsInstance( chunk["reward"], np.memmap )
+
+    def test_rotation(self):
+        recorder = TrajectoryRecorder( self.directory, 4 )
+        self.recordEpisode( recorder, 5, 0 )
+        self.recordEpisode( recorder, 2, 10 )
+        recorder.close()
+
+        reader = TrajectoryReader( self.directory )
+        npt.assert_equal(reader.chunkRows, [4, 4, 1])
+        npt.assert_equal(reader.episodeOffsets, [0, 6])
+        first = reader.getEpisode( 0 )
+        npt.assert_equal(first["observation"].ravel(), [0, 1, 2, 3, 4, 5])
+        second = reader.getEpisode( 1 )
+        npt.assert_equal(second["observation"].ravel(), [10, 11, 12])
+        npt.assert_equal(second["episode"], [1, 1, 1])
+        episodes = list( reader.episodes() )
+        self.assertEqual(len(episodes), 2)
+
+    def test_emptyEpisode(self):
+        recorder = TrajectoryRecorder( self.directory, 4 )
+        self.recordEpisode( recorder, 3 )
+        recorder.newEpisode()
+        recorder.close()
+
+        reader = TrajectoryReader( self.directory )
+        episode = reader.getEpisode( 1 )
+        self.assertEqual(len(episode["reward"]), 0)
+
+    def test_chunkOffsets(self):
+        recorder = TrajectoryRecorder( self.directory, 4 )
+        self.recordEpisode( recorder, 1, 0 )
+        self.recordEpisode( recorder, 1, 10 )
+        self.recordEpisode( recorder, 5, 20 )
+        recorder.flush()
+        recorder.close()
+
+        ## offsets are stored in file of chunk where episode started
+        npt.assert_equal(np.load( columnPath( self.directory, "offsets", 0 ) ), [0, 2, 4])
+        npt.assert_equal(np.load( columnPath( self.directory, "offsets", 1 ) ), [])
+        npt.assert_equal(np.load( columnPath( self.directory, "offsets", 2 ) ), [])
+        reader = TrajectoryReader( self.directory )
+        npt.assert_equal(reader.episodeOffsets, [0, 2, 4])
+        third = reader.getEpisode( 2 )
+        npt.assert_equal(third["observation"].ravel(), [20, 21, 22, 23, 24, 25])
+
+    def test_existingRecording(self):
+        recorder = TrajectoryRecorder( self.directory, 4 )
+        self.recordEpisode( recorder, 9 )
+        recorder.close()
+
+        self.assertRaises( FileExistsError, TrajectoryRecorder, self.directory, 4 )
+
+        recorder = TrajectoryRecorder( self.directory, 4, overwrite=True )
+        self.recordEpisode( recorder, 2, 10 )
+        recorder.close()
+        self.assertFalse( os.path.exists( columnPath( self.directory, "reward", 1 ) ) )
+        reader = TrajectoryReader( self.directory )
+        self.assertEqual(reader.numRows(), 3)
+        self.assertEqual(reader.numEpisodes(), 1)
+        npt.assert_equal(reader.getEpisode( 0 )["observation"].ravel(), [10, 11, 12])
+
+    def test_otherFiles(self):
+        ## files not belonging to recording are kept
+        path = os.path.join( self.directory, "notes.txt" )
+        with open( path, "w" ) as notes:
+            notes.write( "notes" )
+        recorder = TrajectoryRecorder( self.directory, 4 )
+        self.recordEpisode( recorder, 2 )
+        recorder.close()
+        self.assertTrue( os.path.exists( path ) )
@@ -0,0 +1,131 @@
+# MIT License
+#
+# Copyright (c) 2019 Arkadiusz Netczuk <dev.arnet@gmail.com>
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+
+
+import unittest
+
+import os
+import time
+import signal
+import socket
+from multiprocessing import AuthenticationError
+from multiprocessing.connection import Client
+
+from pybraingym.remote import RemoteCoordinator, startAgents, importFactory
+from pybraingym.parallelexperiment import MultiExperiment
+from testpybraingym.dummyexperiment import createDummyWorker
+
+
+AUTHKEY = b"test-authkey"
+FACTORY = "testpybraingym.dummyexperiment:createDummyWorker"
+
+
+class ImportFactoryTest(unittest.TestCase):
+
+    def test_colon(self):
+        self.assertIs(importFactory( FACTORY ), createDummyWorker)
+
+    def test_dot(self):
+        self.assertIs(importFactory( "testpybraingym.dummyexperiment.createDummyWorker" ), createDummyWorker)
+
+
+class RemoteCoordinatorTest(unittest.TestCase):
+
+    def setUp(self):
+        ## Called before testfunction is executed
+        self.coordinator = RemoteCoordinator( ("localhost", 0), AUTHKEY, heartbeatTimeout=5.0, acceptTimeout=10.0 )
+        self.processes = []
+
+    def tearDown(self):
+        ## Called after testfunction was executed
+        self.coordinator.close()
+        for proc in self.processes:
+            proc.join( 10 )
+            if proc.is_alive():
+                proc.terminate()
+
+    def startAgents(self, number):
+        self.processes = startAgents( self.coordinator.address, AUTHKEY, number, 0.1 )
+
+    def test_multiExperiment(self):
+        self.startAgents( 3 )
+        experiment = MultiExperiment( 3, FACTORY, workerFactory=self.coordinator.createWorker )
+        try:
+            experiment.doExperiment( 3 )
+            self.assertEqual(experiment.getStepsCount(), 45)
+            self.assertEqual(experiment.getCumulativeReward(), 3)
+            for exp in experiment.experiments:
+                self.assertTrue( exp.isAlive() )
+        finally:
+            experiment.close()
+
+    def test_wrappedFactory(self):
+        ## import path can not be wrapped by placement or progress factories
+        self.assertRaises( AssertionError, MultiExperiment, 1, FACTORY, workerFactory=self.coordinator.createWorker,
+                           placement=[ {0} ] )
+
+    def test_silentClient(self):
+        ## client which does not authenticate does not block other agents
+        silent = socket.create_connection( self.coordinator.address )
+        try:
+            self.startAgents( 1 )
+            worker = self.coordinator.createWorker( FACTORY )
+            self.assertTrue( worker.isAlive() )
+            worker.close()
+        finally:
+            silent.close()
+
+    def test_factoryError(self):
+        self.startAgents( 1 )
+        self.assertRaises( AttributeError, self.coordinator.createWorker, "testpybraingym.dummyexperiment:missing" )
+
+    def test_heartbeat(self):
+        self.startAgents( 1 )
+        worker = self.coordinator.createWorker( FACTORY )
+        self.assertTrue( worker.isAlive() )
+        self.processes[0].terminate()
+        self.processes[0].join()
+        time.sleep( 0.2 )
+        self.assertFalse( worker.isAlive() )
+        self.assertRaises( (EOFError, OSError), worker.getParameters )
+
+    def test_hungAgent(self):
+        ## agent which stops responding without closing socket does not block call forever
+        self.coordinator.heartbeatTimeout = 0.5
+        self.startAgents( 1 )
+        worker = self.coordinator.createWorker( FACTORY )
+        os.kill( self.processes[0].pid, signal.SIGSTOP )
+        try:
+            startTime = time.time()
+            self.assertRaises( ConnectionError, worker.doExperiment, 1 )
+            self.assertLess(time.time() - startTime, 5.0)
+            self.assertFalse( worker.isAlive() )
+        finally:
+            os.kill( self.processes[0].pid, signal.SIGKILL )
+
+    def test_badAuthkey(self):
+        self.assertRaises( AuthenticationError, Client, self.coordinator.address, authkey=b"invalid" )
+
+    def test_noAgents(self):
+        self.coordinator.acceptTimeout = 0.1
+        self.assertRaises( TimeoutError, self.coordinator.createWorker, FACTORY )
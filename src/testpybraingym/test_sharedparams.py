@@ -0,0 +1,92 @@
+# MIT License
+#
+# Copyright (c) 2019 Arkadiusz Netczuk <dev.arnet@gmail.com>
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+
+
+import unittest
+import numpy.testing as npt
+
+from pybraingym.sharedparams import SharedParameters, SharedMetrics
+from testpybraingym.dummyexperiment import DummyTable
+
+
+class SharedParametersTest(unittest.TestCase):
+
+    def setUp(self):
+        ## Called before testfunction is executed
+        self.block = SharedParameters( 8 )
+
+    def tearDown(self):
+        ## Called after testfunction was executed
+        self.block.close()
+        self.block.unlink()
+
+    def test_attach(self):
+        attached = SharedParameters( 8, self.block.name )
+        attached.array[:] = 3.0
+        npt.assert_equal(self.block.array, 3.0)
+        self.assertFalse( attached.owner )
+        attached.close()
+
+    def test_bind(self):
+        table = DummyTable( 4, 2 )
+        table.params[:] = 5.0
+        self.block.bind( table )
+        npt.assert_equal(self.block.array, 5.0)
+        table.updateValue( 1, 1, 9.0 )
+        self.assertEqual(self.block.array[3], 9.0)
+
+    def test_copyTo(self):
+        table = DummyTable( 4, 2 )
+        self.block.array[:] = 2.0
+        self.block.copyTo( table )
+        npt.assert_equal(table.params, 2.0)
+        self.assertIsNot(table.params, self.block.array)
+
+
+class SharedMetricsTest(unittest.TestCase):
+
+    def setUp(self):
+        ## Called before testfunction is executed
+        self.metrics = SharedMetrics( 3 )
+
+    def tearDown(self):
+        ## Called after testfunction was executed
+        self.metrics.close()
+        self.metrics.unlink()
+
+    def test_empty(self):
+        npt.assert_equal(self.metrics.array["episodes"], [0, 0, 0])
+        npt.assert_equal(self.metrics.array["quality"], [0.0, 0.0, 0.0])
+
+    def test_row(self):
+        attached = SharedMetrics( 3, self.metrics.name )
+        row = attached.getRow( 1 )
+        row["episodes"] = 5
+        row["quality"] = 2.5
+        npt.assert_equal(self.metrics.array["episodes"], [0, 5, 0])
+        self.assertEqual(self.metrics.getBestIndex(), 1)
+        snapshot = self.metrics.snapshot()
+        row["episodes"] = 6
+        self.assertEqual(snapshot["episodes"][1], 5)
+        del row
+        attached.close()
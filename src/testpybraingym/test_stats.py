@@ -0,0 +1,114 @@
+# MIT License
+#
+# Copyright (c) 2019 Arkadiusz Netczuk <dev.arnet@gmail.com>
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+
+
+import unittest
+import numpy.testing as npt
+
+import numpy as np
+
+from pybraingym.stats import RunningStats, RollingSum, PercentileSketch, EpisodeStatistics
+
+
+class RunningStatsTest(unittest.TestCase):
+
+    def test_empty(self):
+        stats = RunningStats()
+        self.assertEqual(stats.count, 0)
+        self.assertEqual(stats.variance(), 0.0)
+
+    def test_meanVariance(self):
+        data = [2.0, 4.0, 4.0, 4.0, 5.0, 5.0, 7.0, 9.0]
+        stats = RunningStats()
+        for val in data:
+            stats.add( val )
+        self.assertEqual(stats.count, 8)
+        npt.assert_almost_equal(stats.mean, np.mean(data))
+        npt.assert_almost_equal(stats.variance(), np.var(data, ddof=1))
+
+
+class RollingSumTest(unittest.TestCase):
+
+    def test_badSize(self):
+        self.assertRaises( AssertionError, RollingSum, 0 )
+
+    def test_partial(self):
+        rolling = RollingSum( 3 )
+        self.assertEqual(rolling.add(1.0), 1.0)
+        self.assertEqual(rolling.add(2.0), 3.0)
+        self.assertEqual(len(rolling), 2)
+        self.assertFalse(rolling.isFull())
+
+    def test_window(self):
+        rolling = RollingSum( 3 )
+        for val in range(1, 11):
+            ret = rolling.add( val )
+        self.assertEqual(ret, 8 + 9 + 10)
+        self.assertTrue(rolling.isFull())
+
+    def test_deque(self):
+        data = np.random.RandomState(1).rand( 1000 )
+        rolling = RollingSum( 100 )
+        for i in range(len(data)):
+            ret = rolling.add( data[i] )
+            npt.assert_almost_equal(ret, np.sum(data[max(0, i - 99):i + 1]))
+
+
+class PercentileSketchTest(unittest.TestCase):
+
+    def test_empty(self):
+        sketch = PercentileSketch( 10 )
+        self.assertTrue( np.isnan( sketch.percentile(50) ) )
+
+    def test_exact(self):
+        sketch = PercentileSketch( 100 )
+        for val in range(0, 11):
+            sketch.add( val )
+        self.assertEqual(sketch.percentile(50), 5.0)
+        self.assertEqual(sketch.percentile(100), 10.0)
+
+    def test_approx(self):
+        sketch = PercentileSketch( 500, seed=1 )
+        for val in range(0, 10000):
+            sketch.add( val )
+        self.assertEqual(sketch.count, 10000)
+        npt.assert_allclose(sketch.percentile(50), 5000, rtol=0.1)
+
+
+class EpisodeStatisticsTest(unittest.TestCase):
+
+    def test_call(self):
+        stats = EpisodeStatistics( 2 )
+        self.assertEqual(stats(1, 1.0), 1.0)
+        self.assertEqual(stats(2, 3.0), 4.0)
+        self.assertEqual(stats(3, 0.0), 3.0)
+        self.assertEqual(stats.getRate(), 3.0)
+        self.assertEqual(stats.getBestPeriodReward(), 4.0)
+        self.assertEqual(stats.getCount(), 3)
+        npt.assert_almost_equal(stats.getMean(), 4.0 / 3)
+
+    def test_successRate(self):
+        stats = EpisodeStatistics( 4 )
+        for reward in [1, 0, 1, 0, 0]:
+            stats(0, reward)
+        self.assertEqual(stats.getSuccessRate(), 50.0)
@@ -0,0 +1,97 @@
+# MIT License
+#
+# Copyright (c) 2019 Arkadiusz Netczuk <dev.arnet@gmail.com>
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+
+
+import unittest
+
+import os
+import csv
+import shutil
+import tempfile
+
+from pybraingym.sweep import gridSearch, randomSearch, runConfiguration, Sweep
+from testpybraingym.dummyexperiment import createDummyWorker
+
+
+def createFailingWorker(reward=1.0):
+    raise ValueError("invalid reward")
+
+
+class SearchSpaceTest(unittest.TestCase):
+
+    def test_gridSearch(self):
+        configs = gridSearch( {"episodeLength": [1, 2], "reward": [1.0, 2.0, 3.0]} )
+        self.assertEqual(len(configs), 6)
+        self.assertEqual(configs[0], {"episodeLength": 1, "reward": 1.0})
+        self.assertEqual(configs[5], {"episodeLength": 2, "reward": 3.0})
+
+    def test_randomSearch(self):
+        space = {"episodeLength": [1, 2], "reward": (0.0, 5.0), "qualityFunctor": lambda rand: None}
+        configs = randomSearch( space, 10, 3 )
+        self.assertEqual(len(configs), 10)
+        for config in configs:
+            self.assertIn(config["episodeLength"], [1, 2])
+            self.assertTrue( 0.0 <= config["reward"] <= 5.0 )
+            self.assertIsNone(config["qualityFunctor"])
+        self.assertEqual(configs, randomSearch( space, 10, 3 ))
+
+
+class SweepTest(unittest.TestCase):
+
+    def setUp(self):
+        ## Called before testfunction is executed
+        self.directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        ## Called after testfunction was executed
+        shutil.rmtree( self.directory )
+
+    def test_runConfiguration(self):
+        row = runConfiguration( createDummyWorker, {"episodeLength": 3, "reward": 2.0}, 4, 2, 2.0 )
+        self.assertEqual(row["quality"], 2.0)
+        self.assertEqual(row["episodes"], 8)
+        self.assertEqual(row["steps"], 24)
+        self.assertEqual(row["thresholdEpisodes"], 2)
+        self.assertIsNotNone(row["thresholdTime"])
+        self.assertIsNone(row["error"])
+
+    def test_runConfiguration_error(self):
+        row = runConfiguration( createFailingWorker, {"reward": 2.0}, 4, 2 )
+        self.assertIn("invalid reward", row["error"])
+        self.assertIsNone(row["quality"])
+
+    def test_execute(self):
+        path = os.path.join( self.directory, "results.csv" )
+        sweep = Sweep( createDummyWorker, 2, rounds=2, episodes=3, threshold=2.0 )
+        configs = gridSearch( {"reward": [1.0, 2.0, 3.0]} )
+        rows = sweep.execute( configs, path )
+
+        self.assertEqual([ row["quality"] for row in rows ], [1.0, 2.0, 3.0])
+        self.assertIsNone(rows[0]["thresholdEpisodes"])
+        self.assertEqual(rows[1]["thresholdEpisodes"], 3)
+        self.assertEqual(sweep.getBestResult()["reward"], 3.0)
+
+        with open(path, newline="") as resultsFile:
+            fileRows = list( csv.DictReader( resultsFile ) )
+        self.assertEqual(len(fileRows), 3)
+        self.assertEqual(sorted( float(row["quality"]) for row in fileRows ), [1.0, 2.0, 3.0])
@@ -0,0 +1,99 @@
+# MIT License
+#
+# Copyright (c) 2019 Arkadiusz Netczuk <dev.arnet@gmail.com>
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+
+
+import unittest
+import numpy.testing as npt
+
+import numpy as np
+
+from pybraingym.transfer import encodeRows, decodeRows, applyRows, DeltaTransfer
+from pybraingym.interface import DirtyRowsTableWrapper
+from pybraingym.parallelexperiment import MultiExperiment
+from pybraingym.parallelexperimentworker import ProcessExperimentWorker
+from testpybraingym.dummyexperiment import DummyExperiment, DummyTable, dummyIteration, WorkerFactory, createLocalWorker
+
+
+class EncodeRowsTest(unittest.TestCase):
+
+    def test_roundTrip(self):
+        values = np.arange( 12, dtype=np.float64 ).reshape( 4, 3 )
+        delta = encodeRows( values, [1, 3] )
+        rows, rowsValues = decodeRows( delta )
+        npt.assert_equal(rows, [1, 3])
+        npt.assert_equal(rowsValues, values[ [1, 3] ])
+
+    def test_downcast(self):
+        values = np.full( (1000, 4), 1.0 / 3.0 )
+        full = encodeRows( values, None, None, False )
+        delta = encodeRows( values, None, np.float16, True )
+        self.assertLess(len(delta["data"]), len(full["data"]) / 4)
+        rows, rowsValues = decodeRows( delta )
+        self.assertEqual(rowsValues.dtype, np.float64)
+        npt.assert_allclose(rowsValues, values, rtol=1e-3)
+
+    def test_applyRows(self):
+        values = np.zeros( (3, 2) )
+        source = np.ones( (3, 2) )
+        applyRows( values, encodeRows( source, [2] ) )
+        npt.assert_equal(values, [[0, 0], [0, 0], [1, 1]])
+
+
+class DirtyRowsTableWrapperTest(unittest.TestCase):
+
+    def test_updateValue(self):
+        table = DirtyRowsTableWrapper( DummyTable( 4, 2 ) )
+        table.updateValue( 2, 1, 5.0 )
+        npt.assert_equal(table.dirtyRows, [False, False, True, False])
+        self.assertEqual(table.getValue( 2, 1 ), 5.0)
+        table.clearDirtyRows()
+        self.assertFalse( table.dirtyRows.any() )
+
+
+class DeltaTransferMultiExperimentTest(unittest.TestCase):
+
+    def check_propagate(self, dtype):
+        factory = WorkerFactory( [(5, 1.0), (3, 2.0), (7, 3.0)], DirtyRowsTableWrapper, (10000, 4) )
+        transfer = DeltaTransfer( dtype )
+        experiment = MultiExperiment( 3, factory, workerFactory=createLocalWorker, deltaTransfer=transfer )
+        try:
+            for _ in range(0, 3):
+                experiment.doExperiment( 2 )
+                bestParams = experiment.experiments[ experiment.bestExperiment ].getParameters()
+                for exp in experiment.experiments:
+                    npt.assert_equal(exp.getParameters(), bestParams)
+                    self.assertEqual(len(exp.getDirtyRows()), 0)
+            self.assertLess(transfer.getRatio(), 0.01)
+        finally:
+            experiment.close()
+
+    def test_propagate(self):
+        self.check_propagate( None )
+
+    def test_propagate_float32(self):
+        self.check_propagate( np.float32 )
+
+    def test_untracked(self):
+        experiment = DummyExperiment()
+        worker = ProcessExperimentWorker( experiment, dummyIteration )
+        self.assertIsNone(worker.getDirtyRows())